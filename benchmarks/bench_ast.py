@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+bench_ast.py - Benchmark de memoria y acceso a atributos del AST
+Retiene varios ASTs de LeviScript a la vez (como en los builds por lote)
+y mide los bytes por nodo con tracemalloc y el tiempo de recorrer todos
+los atributos de todos los nodos.
+
+Uso:
+    python benchmarks/bench_ast.py [--asts 200] [--size 0.05] [--repeat 5]
+"""
+
+import sys
+import time
+import argparse
+import tracemalloc
+from dataclasses import fields
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from leviathan_ui.Script import LeviScript, ASTNode
+from bench_lexer import make_source
+
+
+def walk(node, names_cache={}):
+    """Recorre el AST leyendo cada campo de cada nodo; devuelve nº de nodos"""
+    if isinstance(node, list):
+        return sum(walk(item) for item in node)
+    if isinstance(node, dict):
+        return sum(walk(item) for item in node.values())
+    if not isinstance(node, ASTNode):
+        return 0
+    cls = type(node)
+    names = names_cache.get(cls)
+    if names is None:
+        names = names_cache[cls] = tuple(f.name for f in fields(cls))
+    count = 1
+    for name in names:
+        count += walk(getattr(node, name))
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de memoria del AST de LeviScript')
+    parser.add_argument('--asts', type=int, default=200, help='ASTs retenidos simultáneamente')
+    parser.add_argument('--size', type=float, default=0.05, help='Tamaño de cada fuente en MB')
+    parser.add_argument('--repeat', type=int, default=5, help='Repeticiones del recorrido')
+    args = parser.parse_args()
+
+    # Licencias cortas: que domine el coste por nodo y no el de los strings
+    source = make_source(int(args.size * 1024 * 1024), license_lines=1)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    asts = [LeviScript.compile(source) for _ in range(args.asts)]
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    nodes = sum(walk(ast) for ast in asts)
+    best = float('inf')
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        for ast in asts:
+            walk(ast)
+        best = min(best, time.perf_counter() - start)
+
+    print(f"ASTs retenidos:   {args.asts}")
+    print(f"Nodos totales:    {nodes}")
+    print(f"Memoria retenida: {retained / 1048576:.2f} MB ({retained / nodes:.1f} bytes/nodo)")
+    print(f"Recorrido:        {best:.4f} s ({best * 1e9 / nodes:.1f} ns/nodo)")
+
+
+if __name__ == '__main__':
+    main()
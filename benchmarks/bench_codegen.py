@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+bench_codegen.py - Benchmark de la ruta AST -> bytecode
+Compara LeviScript.to_python + compile(texto) frente a LeviScript.to_code
+(nodos ast de Python compilados directamente), y el coste de cargar el
+bytecode cacheado con LeviScript.load_code.
+
+Uso:
+    python benchmarks/bench_codegen.py [--sizes 0.25 1 4] [--repeat 3]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from leviathan_ui.Script import LeviScript
+from bench_lexer import make_source
+
+
+def best_of(repeat: int, func):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de to_python+compile frente a to_code')
+    parser.add_argument('--sizes', type=float, nargs='+', default=[0.25, 1, 4], help='Tamaños de fuente en MB')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones por tamaño (mejor tiempo)')
+    args = parser.parse_args()
+
+    print(f"{'Fuente':>8} {'texto+compile':>14} {'to_code':>9} {'Mejora':>7} {'load_code':>10} {'.pyc (KB)':>10}")
+    for mb in args.sizes:
+        ast = LeviScript.compile(make_source(int(mb * 1024 * 1024), license_lines=1))
+        via_text = best_of(args.repeat, lambda: compile(LeviScript.to_python(ast), 'installer.py', 'exec'))
+        direct = best_of(args.repeat, lambda: LeviScript.to_code(ast, 'installer.py'))
+        data = LeviScript.dump_code(LeviScript.to_code(ast, 'installer.py'))
+        load = best_of(args.repeat, lambda: LeviScript.load_code(data))
+        print(f"{mb:>6.2f}MB {via_text:>13.4f}s {direct:>8.4f}s {via_text / direct:>6.2f}x "
+              f"{load:>9.4f}s {len(data) / 1024:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
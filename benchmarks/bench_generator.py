@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+bench_generator.py - Benchmark de PythonGenerator
+Genera Python a partir de ASTs grandes y mide el tiempo por nodo y el
+volumen de salida, para vigilar el coste del búfer indentado y del
+despacho de visitantes en caché.
+
+Uso:
+    python benchmarks/bench_generator.py [--sizes 0.25 1 4] [--repeat 3]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from leviathan_ui.Script import LeviScript, PythonGenerator
+from bench_lexer import make_source
+from bench_ast import walk
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de PythonGenerator.generate')
+    parser.add_argument('--sizes', type=float, nargs='+', default=[0.25, 1, 4], help='Tamaños de fuente en MB')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones por tamaño (mejor tiempo)')
+    args = parser.parse_args()
+
+    print(f"{'Fuente':>8} {'Nodos':>9} {'Salida (KB)':>12} {'Tiempo (s)':>11} {'ns/nodo':>8}")
+    for mb in args.sizes:
+        ast = LeviScript.compile(make_source(int(mb * 1024 * 1024), license_lines=1))
+        nodes = walk(ast)
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            code = PythonGenerator().generate(ast)
+            best = min(best, time.perf_counter() - start)
+        print(f"{mb:>6.2f}MB {nodes:>9} {len(code) / 1024:>12.1f} {best:>11.4f} {best * 1e9 / nodes:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+bench_import.py - Tiempo de importación de leviathan_ui (-X importtime)
+Lanza un intérprete nuevo por caso con `python -X importtime` y suma el
+tiempo acumulado de las importaciones de primer nivel, el número de módulos
+cargados y si entraron PyQt6 o Pillow. Lo que ya importa el arranque del
+intérprete (`python -c pass`: site, .pth...) no cuenta. El caso "todo" fuerza la carga de
+todos los nombres de __all__, equivalente a la importación ansiosa anterior
+a la carga perezosa del paquete.
+
+Uso:
+    python benchmarks/bench_import.py [--repeat 5] [--top 10]
+"""
+
+import os
+import re
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+CASES = {
+    'import leviathan_ui': 'import leviathan_ui',
+    'LeviScript': 'from leviathan_ui import LeviScript',
+    'CustomTitleBar': 'from leviathan_ui import CustomTitleBar',
+    'cli': 'import leviathan_ui.cli',
+    'todo': 'import leviathan_ui\nfor n in leviathan_ui.__all__: getattr(leviathan_ui, n)',
+}
+HEAVY = ('PyQt6', 'PIL')
+
+LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$')
+
+
+def importtime(code: str, startup=frozenset()):
+    """(µs acumulados de primer nivel, módulos, {módulo: µs acumulados}) o None si falla
+
+    Los módulos de startup (ya cargados al arrancar el intérprete) se descartan.
+    """
+    env = dict(os.environ, PYTHONPATH=str(ROOT) + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          capture_output=True, text=True, env=env, cwd=str(ROOT))
+    if proc.returncode != 0:
+        return None
+    total = 0
+    modules = {}
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        if name in startup:
+            continue
+        modules[name] = cumulative
+        if indent == 1:
+            total += cumulative
+    return total, len(modules), modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tiempo de importación de leviathan_ui con -X importtime')
+    parser.add_argument('--repeat', type=int, default=5, help='Intérpretes por caso (mejor tiempo)')
+    parser.add_argument('--top', type=int, default=0, help='Mostrar los N módulos más lentos de cada caso')
+    args = parser.parse_args()
+
+    startup = frozenset(importtime('pass')[2])
+    print(f"{'Caso':<20} {'Total (ms)':>11} {'Módulos':>8}  {'Pesados':<12}")
+    for name, code in CASES.items():
+        best = None
+        for _ in range(args.repeat):
+            result = importtime(code, startup)
+            if result is None:
+                break
+            if best is None or result[0] < best[0]:
+                best = result
+        if best is None:
+            print(f"{name:<20} {'no disponible (falta una dependencia)':>40}")
+            continue
+        total, count, modules = best
+        heavy = [h for h in HEAVY if any(m == h or m.startswith(h + '.') for m in modules)]
+        print(f"{name:<20} {total / 1000:>11.1f} {count:>8}  {', '.join(heavy) or '-':<12}")
+        for module, cumulative in sorted(modules.items(), key=lambda m: -m[1])[:args.top]:
+            print(f"    {module:<40} {cumulative / 1000:>8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+bench_incremental.py - Benchmark del re-parseo incremental (IncrementalDocument)
+Simula la escritura de una sentencia carácter a carácter, la inserción y el
+borrado de líneas en un .ls de ~10k líneas y compara la latencia por edición
+con un LeviScript.check completo del mismo texto.
+
+Uso:
+    python benchmarks/bench_incremental.py [--lines 10000] [--repeat 3] [--verify]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from leviathan_ui.Script import LeviScript
+from leviathan_ui.language_server import IncrementalDocument
+from bench_lexer import make_source
+
+
+TYPED = 'log("Copiando " + target)\n        '
+INSERTED = '        let retries = 3\n'
+PAIRS = {'"': '"', '(': ')'}
+
+
+def make_lines(lines: int) -> str:
+    """Script .ls válido con al menos lines líneas"""
+    source = make_source(lines * 40, license_lines=1)
+    while source.count('\n') < lines:
+        source = make_source(len(source) * 2, license_lines=1)
+    return ''.join(source.splitlines(keepends=True)[:lines]).rsplit('\nsetup ', 1)[0] + '\n'
+
+
+def edits(source: str):
+    """(nombre, start, end, texto) de cada edición, sobre el texto ya editado
+
+    Como en un editor, escribir '"' o '(' inserta también el cierre y teclear
+    el cierre sólo avanza el cursor.
+    """
+    pos = source.index('log("Instalando', len(source) // 2)
+    for char in TYPED:
+        if char in PAIRS.values() and source[pos] == char:
+            pos += 1
+            continue
+        text = char + PAIRS.get(char, '')
+        yield 'escribir', pos, pos, text
+        source = source[:pos] + text + source[pos:]
+        pos += 1
+    line = source.index('\n', pos) + 1
+    yield 'insertar línea', line, line, INSERTED
+    yield 'borrar línea', line, line + len(INSERTED), ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Latencia del re-parseo incremental frente a LeviScript.check')
+    parser.add_argument('--lines', type=int, default=10000, help='Líneas del documento')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones (mejor tiempo)')
+    parser.add_argument('--verify', action='store_true',
+                        help='Comprobar tras cada edición que el resultado coincide con un check completo')
+    args = parser.parse_args()
+
+    source = make_lines(args.lines)
+    full = float('inf')
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        LeviScript.check(source)
+        full = min(full, time.perf_counter() - start)
+    print(f"Documento: {source.count(chr(10))} líneas, {len(source) / 1024:.0f} KB")
+    print(f"LeviScript.check completo: {full * 1000:.1f} ms")
+
+    results = {}
+    for _ in range(args.repeat):
+        document = IncrementalDocument(source)
+        for name, start_pos, end_pos, text in edits(source):
+            start = time.perf_counter()
+            incremental = document.edit(start_pos, end_pos, text)
+            elapsed = time.perf_counter() - start
+            diagnostics = document.diagnostics
+            times = results.setdefault(name, [])
+            times.append((elapsed, incremental))
+            if args.verify:
+                ast, expected = LeviScript.check(document.text)
+                assert document.program == ast and diagnostics == expected, f'Divergencia en {name!r}'
+
+    print(f"\n{'Edición':<16} {'Ediciones':>9} {'Parciales':>9} {'Media (ms)':>11} {'Máx (ms)':>9} {'Mejora':>7}")
+    for name, times in results.items():
+        elapsed = [t for t, _ in times]
+        mean = sum(elapsed) / len(elapsed)
+        partial = sum(1 for _, incremental in times if incremental)
+        print(f"{name:<16} {len(times) // args.repeat:>9} {partial // args.repeat:>9} "
+              f"{mean * 1000:>11.2f} {max(elapsed) * 1000:>9.2f} {full / mean:>6.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+bench_install_log.py - Log de instalación: una señal por línea frente a LogBridge
+Un subproceso falso escupe N líneas (como un pip install muy hablador). Se
+compara el camino anterior (una señal por línea con las 5 últimas unidas y
+QTextEdit.setText en la GUI) con InstallWorker._run_command + LogBridge +
+QPlainTextEdit.appendPlainText con maximumBlockCount: tiempo total, llamadas
+a la GUI, el mayor bloqueo del bucle de eventos (latencia de un latido de
+5 ms) y el pico de memoria (tracemalloc): la lista completa de antes frente al
+deque acotado de CommandOutput, con el log completo rotando en disco.
+
+Uso:
+    python benchmarks/bench_install_log.py [--lines 100000] [--hz 30]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import QThread, QTimer, QEventLoop, QElapsedTimer, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QTextEdit, QPlainTextEdit
+
+from installer_classes.install_worker import InstallWorker
+from installer_classes.log_bridge import LogBridge
+
+
+def fake_command(lines: int):
+    code = (f"import sys\n"
+            f"for i in range({lines}):\n"
+            f"    sys.stdout.write(f'Collecting paquete-{{i}} (from -r requirements.txt) ... 12.{{i % 10}} kB\\n')\n")
+    return [sys.executable, '-u', '-c', code]
+
+
+class LegacyWorker(QThread):
+    """Camino anterior de InstallWorker._run_command"""
+    log = pyqtSignal(str, str)
+    done = pyqtSignal()
+
+    def __init__(self, cmd):
+        super().__init__()
+        self.cmd = cmd
+
+    def run(self):
+        process = subprocess.Popen(self.cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        output = []
+        while True:
+            line = process.stdout.readline()
+            if not line and process.poll() is not None:
+                break
+            if line:
+                output.append(line.strip())
+                self.log.emit('\n'.join(output[-5:]), 'bench')
+        self.done.emit()
+
+
+class FakeInstall(InstallWorker):
+    """InstallWorker real con un único comando: el subproceso falso"""
+
+    def __init__(self, cmd, hz, log_file):
+        super().__init__({'log_file': log_file})
+        self.cmd = cmd
+        self.bridge = LogBridge(hz=hz)
+
+    def _install(self):
+        self._run_command(self.cmd, 'bench', 100)
+        return True
+
+
+class Heartbeat:
+    """Mide el mayor hueco entre ticks de un QTimer de 5 ms (bloqueo de la GUI)"""
+
+    def __init__(self):
+        self.clock = QElapsedTimer()
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.tick)
+        self.worst = 0
+        self.last = 0
+
+    def start(self):
+        self.clock.start()
+        self.last = 0
+        self.timer.start(5)
+
+    def tick(self):
+        now = self.clock.elapsed()
+        self.worst = max(self.worst, now - self.last)
+        self.last = now
+
+    def stop(self):
+        self.timer.stop()
+
+
+def run_legacy(cmd):
+    view = QTextEdit()
+    view.setReadOnly(True)
+    calls = [0]
+
+    def on_log(log, desc):
+        calls[0] += 1
+        view.setText(log)
+        view.verticalScrollBar().setValue(view.verticalScrollBar().maximum())
+
+    worker = LegacyWorker(cmd)
+    worker.log.connect(on_log)
+    return worker, worker.done, calls, view
+
+
+def run_bridge(cmd, hz, log_file):
+    view = QPlainTextEdit()
+    view.setReadOnly(True)
+    view.setMaximumBlockCount(500)
+    calls = [0]
+
+    def on_lines(lines):
+        calls[0] += 1
+        view.appendPlainText(lines)
+        view.verticalScrollBar().setValue(view.verticalScrollBar().maximum())
+
+    worker = FakeInstall(cmd, hz, log_file)
+    worker.bridge.lines.connect(on_lines)
+    worker.finished.connect(lambda ok, error: worker.bridge.stop())
+    worker.bridge.start()
+    return worker, worker.finished, calls, view
+
+
+def measure(setup):
+    worker, done, calls, view = setup()
+    view.resize(740, 120)
+    view.show()
+    loop = QEventLoop()
+    done.connect(lambda *args: loop.quit())
+    heartbeat = Heartbeat()
+    heartbeat.start()
+    tracemalloc.start()
+    start = time.perf_counter()
+    worker.start()
+    loop.exec()
+    elapsed = time.perf_counter() - start
+    heartbeat.stop()
+    worker.wait()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    last = view.toPlainText().rsplit('\n', 1)[-1]
+    return elapsed, calls[0], heartbeat.worst, peak, last
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Log de instalación con una señal por línea frente a LogBridge')
+    parser.add_argument('--lines', type=int, default=100000, help='Líneas que escribe el subproceso falso')
+    parser.add_argument('--hz', type=int, default=LogBridge.DEFAULT_HZ, help='Frecuencia del tick de LogBridge')
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    cmd = fake_command(args.lines)
+    print(f"Subproceso falso: {args.lines} líneas\n")
+    print(f"{'Camino':<28} {'Total (s)':>9} {'Llamadas GUI':>13} {'Bloqueo máx (ms)':>17} "
+          f"{'Pico (MB)':>10}  Última línea")
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / 'install.log'
+        for name, setup in (('señal por línea + setText', lambda: run_legacy(cmd)),
+                            (f'LogBridge {args.hz} Hz', lambda: run_bridge(cmd, args.hz, log_file))):
+            elapsed, calls, worst, peak, last = measure(setup)
+            print(f"{name:<28} {elapsed:>9.2f} {calls:>13} {worst:>17} {peak / 1e6:>10.1f}  {last[:40]}")
+        print(f"\nLog completo en disco: {sum(f.stat().st_size for f in Path(tmp).iterdir()) / 1e6:.1f} MB")
+    del app
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+bench_intern.py - Memoria ahorrada por el pool de nombres de LeviLexer
+Compara un AST cuyos identificadores comparten str (pool de LeviLexer) con
+el mismo AST con una copia de cada nombre por aparición, como producía el
+lexer sin pool: objetos str distintos, bytes que ocupan y tamaño del pickle.
+
+Uso:
+    python benchmarks/bench_intern.py [--sizes 0.25 1 4]
+"""
+
+import sys
+import pickle
+import argparse
+from dataclasses import fields
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from leviathan_ui.Script import LeviScript, ASTNode
+from bench_lexer import make_source
+
+
+def unshare(value):
+    """Copia del AST con un str nuevo por aparición (sin pool)"""
+    if isinstance(value, str):
+        return value[:1] + value[1:]
+    if isinstance(value, list):
+        return [unshare(v) for v in value]
+    if isinstance(value, dict):
+        return {unshare(k): unshare(v) for k, v in value.items()}
+    if isinstance(value, ASTNode):
+        return type(value)(*(unshare(getattr(value, f.name)) for f in fields(value)))
+    return value
+
+
+def string_stats(root):
+    """(apariciones, objetos str distintos, bytes de esos objetos)"""
+    seen = {}
+    count = 0
+    stack = [root]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str):
+            count += 1
+            seen[id(value)] = value
+        elif isinstance(value, list):
+            stack.extend(value)
+        elif isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, ASTNode):
+            stack.extend(getattr(value, f.name) for f in fields(value))
+    return count, len(seen), sum(sys.getsizeof(s) for s in seen.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Memoria de strings del AST con y sin pool de nombres')
+    parser.add_argument('--sizes', type=float, nargs='+', default=[0.25, 1, 4], help='Tamaños de fuente en MB')
+    args = parser.parse_args()
+
+    print(f"{'Fuente':>8} {'Strings':>9} {'Objetos':>17} {'Memoria (KB)':>19} {'Pickle (KB)':>19}")
+    print(f"{'':>8} {'':>9} {'sin pool':>8} {'pool':>8} {'sin pool':>9} {'pool':>9} {'sin pool':>9} {'pool':>9}")
+    for mb in args.sizes:
+        pooled = LeviScript.compile(make_source(int(mb * 1024 * 1024), license_lines=1))
+        plain = unshare(pooled)
+        assert plain == pooled
+
+        count, pooled_objects, pooled_bytes = string_stats(pooled)
+        _, plain_objects, plain_bytes = string_stats(plain)
+        pooled_pickle = len(pickle.dumps(pooled, protocol=pickle.HIGHEST_PROTOCOL))
+        plain_pickle = len(pickle.dumps(plain, protocol=pickle.HIGHEST_PROTOCOL))
+        print(f"{mb:>6.2f}MB {count:>9} {plain_objects:>8} {pooled_objects:>8} "
+              f"{plain_bytes / 1024:>9.0f} {pooled_bytes / 1024:>9.0f} "
+              f"{plain_pickle / 1024:>9.0f} {pooled_pickle / 1024:>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
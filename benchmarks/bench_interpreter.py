@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+bench_interpreter.py - Microbenchmarks de LeviInterpreter
+Mide el rendimiento de evaluación de expresiones (evaluaciones por segundo)
+llamando a funciones LeviScript de una sola expresión, y lo compara con la
+misma expresión en el Python que generaría PythonGenerator.
+
+Uso:
+    python benchmarks/bench_interpreter.py [--number 200000] [--repeat 3]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from leviathan_ui.Script import LeviScript, LeviInterpreter, PythonGenerator
+
+
+CASES = [
+    ('literal', '1'),
+    ('variable', 'a'),
+    ('aritmética', 'a + b * 2 - c % 3'),
+    ('comparación/lógica', '(a < b && b != c) || !(c >= a)'),
+    ('plantilla', '${"a=" a " b=" b}'),
+    ('llamada', 'add(a, b)'),
+    ('array/objeto', '[a, b, {k: c}]'),
+    ('miembro', 'a.real + b.imag'),
+]
+
+PRELUDE = 'function add(x, y) { return x + y }\n'
+
+
+def best_of(repeat: int, number: int, func, args) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Microbenchmarks de evaluación de LeviInterpreter')
+    parser.add_argument('--number', type=int, default=200000, help='Evaluaciones por medición')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones (mejor tiempo)')
+    args = parser.parse_args()
+
+    values = (3, 5, 7)
+    print(f"{'Caso':<20} {'Mevals/s':>9} {'ns/eval':>8} {'Python (ns)':>12} {'Factor':>7}")
+    for name, expr in CASES:
+        program = LeviScript.compile(f'{PRELUDE}function f(a, b, c) {{ return {expr} }}\n')
+        interpreter = LeviInterpreter(program)
+        levi = best_of(args.repeat, args.number, interpreter.function('f'), values)
+
+        # Referencia: la misma expresión como función Python nativa
+        py_expr = PythonGenerator().expr_to_python(program.body[-1].body[-1].value)
+        namespace = {'add': lambda x, y: x + y}
+        exec(f'def f(a, b, c):\n    return {py_expr}\n', namespace)
+        native = best_of(args.repeat, args.number, namespace['f'], values)
+
+        ns = levi * 1e9 / args.number
+        print(f"{name:<20} {args.number / levi / 1e6:>9.2f} {ns:>8.1f} "
+              f"{native * 1e9 / args.number:>12.1f} {levi / native:>6.1f}x")
+
+    # Bucle: coste por iteración de un for con cuerpo vacío y con una llamada
+    program = LeviScript.compile(PRELUDE + 'function loop(n) { for (i in range(n)) { add(i, 1) } }\n')
+    loop = LeviInterpreter(program).function('loop')
+    elapsed = best_of(args.repeat, 1, loop, (args.number,))
+    print(f"{'for + llamada':<20} {args.number / elapsed / 1e6:>9.2f} {elapsed * 1e9 / args.number:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
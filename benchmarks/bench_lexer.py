@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+bench_lexer.py - Benchmark del tokenizador de LeviScript
+Mide LeviLexer.tokenize sobre fuentes de 256 KB a 4 MB y muestra que el
+coste por carácter se mantiene constante (escalado lineal), incluso con
+literales de licencia y changelog muy largos.
+
+Uso:
+    python benchmarks/bench_lexer.py [--sizes 0.25 1 2 4] [--repeat 3]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from leviathan_ui.Script import LeviLexer
+
+
+LICENSE_LINE = "Permission is hereby granted, free of charge, to any person obtaining a copy \\n"
+
+
+def make_source(target_bytes: int, license_lines: int = 200) -> str:
+    """Genera un script .ls válido de aproximadamente target_bytes caracteres"""
+    chunks = []
+    size = 0
+    i = 0
+    while size < target_bytes:
+        license_text = LICENSE_LINE * license_lines
+        chunk = f'''setup App{i} {{
+    meta {{
+        name: "App {i}",
+        version: "1.0.{i}"
+    }}
+    requires ["leviathan-ui", "PyQt6"]
+    pages [
+        Welcome {{ title: "Bienvenido a App {i}", subtitle: "Asistente" }},
+        License {{ text: "{license_text}" }},
+        Finish {{ launchApp: false }}
+    ]
+    // Hook generado
+    beforeInstall {{
+        let target = "C:/Apps/App{i}"
+        log("Instalando en " + target)
+        if (target != null && {i} >= 0) {{ copy(source, target) }}
+    }}
+}}
+'''
+        chunks.append(chunk)
+        size += len(chunk)
+        i += 1
+    return ''.join(chunks)
+
+
+def bench(source: str, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        LeviLexer(source).tokenize()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de LeviLexer.tokenize')
+    parser.add_argument('--sizes', type=float, nargs='+', default=[0.25, 1, 2, 4],
+                        help='Tamaños de fuente en MB')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones por tamaño (mejor tiempo)')
+    args = parser.parse_args()
+
+    print(f"{'Tamaño':>10} {'Tokens':>10} {'Tiempo (s)':>11} {'MB/s':>8} {'ns/char':>8}")
+    baseline = None
+    for mb in args.sizes:
+        source = make_source(int(mb * 1024 * 1024))
+        tokens = len(LeviLexer(source).tokenize())
+        elapsed = bench(source, args.repeat)
+        ns_per_char = elapsed * 1e9 / len(source)
+        baseline = baseline or ns_per_char
+        print(f"{len(source) / 1048576:>8.2f}MB {tokens:>10} {elapsed:>11.4f} "
+              f"{len(source) / 1048576 / elapsed:>8.1f} {ns_per_char:>8.1f}"
+              f"  (x{ns_per_char / baseline:.2f} vs primer tamaño)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+bench_lsx.py - Formato .lsx binario frente al antiguo payload pickle
+Compara tamaño en disco, tiempo de serialización y tiempo de carga de
+ASTSerializer contra pickle (protocolo más alto) sobre el mismo AST, y el
+coste de leer sólo la sección meta de un .lsx mapeado con LSXReader.
+
+Uso:
+    python benchmarks/bench_lsx.py [--sizes 0.1 1] [--repeat 5]
+"""
+
+import sys
+import time
+import pickle
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from leviathan_ui.Script import LeviScript, ASTSerializer, LSXReader
+from bench_lexer import make_source
+
+
+def best_of(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del formato .lsx frente a pickle')
+    parser.add_argument('--sizes', type=float, nargs='+', default=[0.1, 1], help='Tamaños de fuente en MB')
+    parser.add_argument('--repeat', type=int, default=5, help='Repeticiones (mejor tiempo)')
+    args = parser.parse_args()
+
+    print(f"{'Fuente':>8} {'Formato':>8} {'Bytes':>10} {'Guardar (ms)':>13} {'Cargar (ms)':>12}")
+    for mb in args.sizes:
+        # Licencias cortas para que pese la estructura del árbol, no el texto
+        ast = LeviScript.compile(make_source(int(mb * 1024 * 1024), license_lines=1))
+        lsx = ASTSerializer.serialize(ast)
+        pkl = pickle.dumps(ast, protocol=pickle.HIGHEST_PROTOCOL)
+        assert ASTSerializer.deserialize(lsx) == ast
+
+        rows = [
+            ('lsx', len(lsx),
+             best_of(lambda: ASTSerializer.serialize(ast), args.repeat),
+             best_of(lambda: ASTSerializer.deserialize(lsx), args.repeat)),
+            ('pickle', len(pkl),
+             best_of(lambda: pickle.dumps(ast, protocol=pickle.HIGHEST_PROTOCOL), args.repeat),
+             best_of(lambda: pickle.loads(pkl), args.repeat)),
+        ]
+        for name, size, save, load in rows:
+            print(f"{mb:>6.2f}MB {name:>8} {size:>10} {save * 1000:>13.2f} {load * 1000:>12.2f}")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / 'bench.lsx')
+            Path(path).write_bytes(lsx)
+
+            def read_meta():
+                with LSXReader.open(path) as reader:
+                    reader.meta
+
+            meta = best_of(read_meta, args.repeat)
+            print(f"{mb:>6.2f}MB {'lsx meta':>8} {len(lsx):>10} {'-':>13} {meta * 1000:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
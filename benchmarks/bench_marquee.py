@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+bench_marquee.py - CPU de las barras marquee de LeviathanProgressBar
+Abre varias ventanas tipo instalador (QStackedWidget con la barra en una
+página) y deja correr el bucle de eventos con la barra visible, en una
+página inactiva y con la ventana oculta. Compara el reloj compartido actual
+con un QTimer de 20 ms por barra (el comportamiento anterior): tiempo de CPU
+del proceso, paints y frames del marquee.
+
+Uso:
+    python benchmarks/bench_marquee.py [--windows 4] [--seconds 2]
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import QTimer, QEventLoop
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QStackedWidget, QLabel
+
+from leviathan_ui.progress_bar import LeviathanProgressBar, MARQUEE_WIDTH
+
+
+class CountingBar(LeviathanProgressBar):
+    paints = 0
+    frames = 0
+
+    def paintEvent(self, event):
+        CountingBar.paints += 1
+        super().paintEvent(event)
+
+    def _advance_marquee(self, now):
+        CountingBar.frames += 1
+        super()._advance_marquee(now)
+
+
+class TimerBar(CountingBar):
+    """Marquee anterior: un QTimer de 20 ms por barra, visible o no"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._step)
+
+    def setMarquee(self, enabled):
+        self._is_marquee = enabled
+        if enabled:
+            self._timer.start(20)
+        else:
+            self._timer.stop()
+        self.update()
+
+    def _step(self):
+        CountingBar.frames += 1
+        self._marquee_pos += 5
+        if self._marquee_pos > self.width():
+            self._marquee_pos = -MARQUEE_WIDTH
+        self.update()
+
+
+def make_window(bar_class):
+    window = QWidget()
+    window.resize(600, 400)
+    stack = QStackedWidget(window)
+    page = QWidget()
+    bar = bar_class()
+    layout = QVBoxLayout(page)
+    layout.addWidget(bar)
+    stack.addWidget(page)
+    stack.addWidget(QLabel('Otra página'))
+    QVBoxLayout(window).addWidget(stack)
+    window.show()
+    bar.setMarquee(True)
+    return window, stack, bar
+
+
+def run_loop(seconds: float):
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def measure(bar_class, count: int, scenario: str, seconds: float):
+    """(ms de CPU por segundo, paints por segundo, frames por segundo)"""
+    windows = [make_window(bar_class) for _ in range(count)]
+    for window, stack, _ in windows:
+        if scenario == 'página inactiva':
+            stack.setCurrentIndex(1)
+        elif scenario == 'ventana oculta':
+            window.hide()
+    run_loop(0.2)
+    CountingBar.paints = CountingBar.frames = 0
+    cpu = time.process_time()
+    run_loop(seconds)
+    cpu = time.process_time() - cpu
+    result = (cpu * 1000 / seconds, CountingBar.paints / seconds, CountingBar.frames / seconds)
+    for window, _, _ in windows:
+        window.close()
+        window.deleteLater()
+    run_loop(0.1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CPU del marquee: reloj compartido frente a un QTimer por barra')
+    parser.add_argument('--windows', type=int, default=4, help='Ventanas abiertas a la vez')
+    parser.add_argument('--seconds', type=float, default=2.0, help='Duración de cada medición')
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    print(f"{args.windows} ventanas, {args.seconds:g} s por caso\n")
+    print(f"{'Escenario':<18} {'Marquee':<16} {'CPU (ms/s)':>10} {'Paints/s':>9} {'Frames/s':>9}")
+    for scenario in ('visible', 'página inactiva', 'ventana oculta'):
+        for name, bar_class in (('QTimer por barra', TimerBar), ('reloj compartido', CountingBar)):
+            cpu, paints, frames = measure(bar_class, args.windows, scenario, args.seconds)
+            print(f"{scenario:<18} {name:<16} {cpu:>10.1f} {paints:>9.0f} {frames:>9.0f}")
+    del app
+
+
+if __name__ == '__main__':
+    main()
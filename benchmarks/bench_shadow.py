@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+bench_shadow.py - Benchmark de la sombra del modo polished de WipeWindow
+Pinta la sombra sobre un QImage offscreen con los trazos de siempre
+(paint_shadow: blur // 2 rectángulos redondeados con antialiasing) y con la
+plantilla nine-slice cacheada (draw_shadow), y compara tiempo por paint
+(QImage nuevo incluido), diferencia de píxeles entre ambas y lo que cuesta
+construir la plantilla una vez.
+
+Uso:
+    python benchmarks/bench_shadow.py [--sizes 400x300 1280x800] [--blur 35] [--radius 15] [--dpr 1 2]
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import Qt, QRect
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtWidgets import QApplication
+
+from leviathan_ui.wipeWindow import paint_shadow, draw_shadow, _shadow_template, _device_aligned
+
+
+def render(func, width: int, height: int, dpr: float, margin: int, radius: int, blur: int) -> QImage:
+    """Sombra de un rect width x height pintada por func en un QImage con margen para la sombra"""
+    image = QImage(round((width + 2 * margin) * dpr), round((height + 2 * margin) * dpr),
+                   QImage.Format.Format_ARGB32_Premultiplied)
+    image.setDevicePixelRatio(dpr)
+    image.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    rect = QRect(margin, margin, width, height)
+    if func is draw_shadow:
+        draw_shadow(painter, rect, radius, blur, dpr=dpr)
+    else:
+        paint_shadow(painter, rect, radius, blur)
+    painter.end()
+    return image
+
+
+def best_per_paint(repeat: int, number: int, func, *args) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            render(func, *args)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def pixel_diff(a: QImage, b: QImage):
+    """(máxima diferencia por canal, % de píxeles distintos)"""
+    data_a = a.constBits().asstring(a.sizeInBytes())
+    data_b = b.constBits().asstring(b.sizeInBytes())
+    worst = 0
+    differing = 0
+    for i in range(0, len(data_a), 4):
+        pa, pb = data_a[i:i + 4], data_b[i:i + 4]
+        if pa != pb:
+            differing += 1
+            worst = max(worst, max(abs(x - y) for x, y in zip(pa, pb)))
+    return worst, differing * 100 / (len(data_a) // 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sombra por trazos frente a plantilla nine-slice cacheada')
+    parser.add_argument('--sizes', nargs='+', default=['400x300', '800x600', '1600x1000'],
+                        help='Tamaños de ventana (ANCHOxALTO)')
+    parser.add_argument('--blur', type=int, default=35, help='Tamaño de la sombra (shadow_blur)')
+    parser.add_argument('--radius', type=int, default=15, help='Radio de las esquinas')
+    parser.add_argument('--dpr', type=float, nargs='+', default=[1.0, 2.0], help='Device pixel ratios')
+    parser.add_argument('--number', type=int, default=50, help='Paints por medición')
+    parser.add_argument('--repeat', type=int, default=5, help='Mediciones (mejor tiempo)')
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    print(f"{'Ventana':>10} {'dpr':>4} {'Trazos (ms)':>12} {'Nine-slice (ms)':>16} {'Mejora':>7} "
+          f"{'Δ máx':>6} {'Píxeles ≠':>10} {'Plantilla (ms)':>15}")
+    for size in args.sizes:
+        width, height = (int(v) for v in size.lower().split('x'))
+        for dpr in args.dpr:
+            # Como en una ventana real, el rect empieza en un píxel entero del dispositivo
+            margin = _device_aligned(args.blur // 2 + 1, dpr)
+            _shadow_template.cache_clear()
+            start = time.perf_counter()
+            _shadow_template(args.radius, args.blur, 0xff000000, dpr)
+            build = time.perf_counter() - start
+            reference = render(paint_shadow, width, height, dpr, margin, args.radius, args.blur)
+            cached = render(draw_shadow, width, height, dpr, margin, args.radius, args.blur)
+            worst, differing = pixel_diff(reference, cached)
+
+            common = (width, height, dpr, margin, args.radius, args.blur)
+            strokes = best_per_paint(args.repeat, args.number, paint_shadow, *common)
+            sliced = best_per_paint(args.repeat, args.number, draw_shadow, *common)
+            print(f"{size:>10} {dpr:>4g} {strokes * 1000:>12.3f} {sliced * 1000:>16.3f} "
+                  f"{strokes / sliced:>6.1f}x {worst:>6} {differing:>9.2f}% {build * 1000:>15.3f}")
+    del app
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+check_optimizer.py - Regresión de ASTOptimizer: mismo resultado antes y después
+Cada caso es un programa corto con una función de entrada; se ejecuta en
+LeviInterpreter con el AST original y con el optimizado y se comparan el
+valor devuelto y los logs. Los casos marcan también cuántos const deben
+sustituirse, para que un optimizador que no hace nada no pase por correcto.
+Si algún caso difiere, el script termina con código 1.
+
+Uso:
+    python benchmarks/check_optimizer.py [--verbose]
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from leviathan_ui.Script import LeviScript, LeviInterpreter, ASTOptimizer, MockInstaller
+
+
+# (nombre, fuente, función, argumentos, const sustituidos esperados)
+CASES = [
+    ('const global', 'const x = 1\nfunction f(a){ return x + a }', 'f', (5,), 1),
+    ('parámetro oculta const', 'const x = 1\nfunction f(x){ return x }', 'f', (5,), 0),
+    ('local oculta const', 'const x = 1\nfunction f(){ let x = 7\n return x }', 'f', (), 0),
+    ('parámetro de la función externa oculta const en la anidada',
+     'const x = 1\nfunction f(x){ function g(){ return x } return g() }', 'f', (5,), 0),
+    ('local de la función externa oculta const en la anidada',
+     'const x = 1\nfunction f(){ let x = 7\n function g(){ return x } return g() }', 'f', (), 0),
+    ('tres niveles de anidamiento',
+     'const x = 1\nfunction f(x){ function g(){ function h(){ return x } return h() } return g() }',
+     'f', (5,), 0),
+    ('anidada sin ocultar ve el const',
+     'const x = 1\nfunction f(a){ function g(){ return x + a } return g() }', 'f', (5,), 1),
+    ('la anidada oculta sólo en su cuerpo',
+     'const x = 1\nfunction f(){ function g(x){ return x } return g(9) + x }', 'f', (), 1),
+    ('plegado y poda',
+     'const n = 2 * 3\nfunction f(){ if (n > 5) { return "si" } return "no" }', 'f', (), 1),
+]
+
+
+def run(ast, function, args):
+    """(valor devuelto, logs) de function(*args), o la excepción como texto"""
+    context = MockInstaller()
+    try:
+        interpreter = LeviInterpreter(ast, context)
+        interpreter.run()
+        return repr(interpreter.function(function)(*args)), context.logs
+    except Exception as e:
+        return f'{type(e).__name__}: {e}', context.logs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Comprueba que ASTOptimizer conserva la semántica')
+    parser.add_argument('--verbose', action='store_true', help='Muestra también los casos correctos')
+    args = parser.parse_args()
+
+    failures = 0
+    for name, source, function, call_args, inlined in CASES:
+        ast = LeviScript.compile(source)
+        optimizer = ASTOptimizer()
+        expected = run(ast, function, call_args)
+        got = run(optimizer.optimize(ast), function, call_args)
+        problems = []
+        if got != expected:
+            problems.append(f'antes {expected[0]}, después {got[0]}')
+        if optimizer.stats['inline'] != inlined:
+            problems.append(f"{optimizer.stats['inline']} const sustituidos, se esperaban {inlined}")
+        failures += bool(problems)
+        if problems or args.verbose:
+            print(f"{'✗' if problems else '✓'} {name}: {'; '.join(problems) or expected[0]}")
+
+    print(f"\n{len(CASES)} casos, {failures} fallos")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
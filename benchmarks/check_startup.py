@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+check_startup.py - Regresión de arranque de la CLI sin Qt ni Pillow
+Ejecuta --version, status y precompile (con leviathan-ui.py y con
+`python -m leviathan_ui.cli`) en intérpretes nuevos, dentro de un proyecto
+temporal con leviathan.json y src/index.ls. Un finder en sys.meta_path
+registra cualquier intento de importar PyQt6 o PIL, aunque no estén
+instalados; si alguno lo intenta, si un comando falla o si el arranque supera
+--max-ms, el script termina con código 1.
+
+Uso:
+    python benchmarks/check_startup.py [--repeat 5] [--max-ms 1000]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from synthetic import generate_script
+
+
+FORBIDDEN = ('PyQt6', 'PIL')
+
+# Se ejecuta en el intérprete hijo antes del comando. La trampa devuelve una
+# spec para los paquetes prohibidos cuyo loader registra el import y falla,
+# de modo que importlib.util.find_spec (status) no cuenta como importación.
+BOOTSTRAP = '''
+import sys, json, atexit, runpy
+from importlib.machinery import ModuleSpec
+
+FORBIDDEN = {forbidden!r}
+imported = []
+
+class Tripwire:
+    @classmethod
+    def find_spec(cls, name, path=None, target=None):
+        if name.partition('.')[0] in FORBIDDEN:
+            return ModuleSpec(name, cls)
+        return None
+
+    @staticmethod
+    def create_module(spec):
+        return None
+
+    @staticmethod
+    def exec_module(module):
+        imported.append(module.__name__)
+        raise ImportError(f'{{module.__name__}} importado durante el arranque de la CLI')
+
+sys.meta_path.insert(0, Tripwire)
+
+@atexit.register
+def report():
+    loaded = sorted(m for m in sys.modules if m.partition('.')[0] in FORBIDDEN)
+    with open({report!r}, 'w', encoding='utf-8') as f:
+        json.dump({{'imported': imported, 'loaded': loaded}}, f)
+
+sys.argv = {argv!r}
+if {module!r}:
+    runpy.run_module({module!r}, run_name='__main__', alter_sys=True)
+else:
+    runpy.run_path(sys.argv[0], run_name='__main__')
+'''
+
+
+def cases():
+    """(nombre, módulo o None, argv) de cada comando a comprobar"""
+    entry = str(ROOT / 'leviathan-ui.py')
+    source = 'src/index.ls'
+    return [
+        ('leviathan-ui.py --version', None, [entry, '--version']),
+        ('leviathan-ui.py showStatus', None, [entry, 'showStatus']),
+        ('leviathan-ui.py precompile', None, [entry, 'precompile', f'file={source}']),
+        ('cli --help', 'leviathan_ui.cli', ['leviathan-ui', '--help']),
+        ('cli status', 'leviathan_ui.cli', ['leviathan-ui', 'status']),
+        ('cli precompile', 'leviathan_ui.cli', ['leviathan-ui', 'precompile', source, '--no-cache']),
+    ]
+
+
+def run_case(module, argv, workdir: Path):
+    """(segundos, código de salida, informe de imports) de una ejecución"""
+    report = workdir / 'startup-report.json'
+    code = BOOTSTRAP.format(forbidden=FORBIDDEN, report=str(report), argv=argv, module=module)
+    env = dict(os.environ, PYTHONPATH=str(ROOT) + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-c', code], cwd=str(workdir), env=env,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - start
+    if not report.exists():
+        return elapsed, proc.returncode, {'imported': [], 'loaded': [], 'error': proc.stderr.strip()}
+    result = json.loads(report.read_text(encoding='utf-8'))
+    report.unlink()
+    return elapsed, proc.returncode, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Comprueba que la CLI arranca sin importar Qt ni Pillow')
+    parser.add_argument('--repeat', type=int, default=5, help='Ejecuciones por comando (mejor tiempo)')
+    parser.add_argument('--max-ms', type=float, default=None, help='Presupuesto de arranque por comando en ms')
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        (workdir / 'src').mkdir()
+        (workdir / 'src' / 'index.ls').write_text(generate_script(), encoding='utf-8')
+        (workdir / 'leviathan.json').write_text(json.dumps({'name': 'startup-check', 'version': '1.0.0'}),
+                                               encoding='utf-8')
+        print(f"{'Comando':<30} {'Mejor (ms)':>10} {'Salida':>7}  Qt/Pillow")
+        for name, module, argv in cases():
+            best = float('inf')
+            imported = set()
+            returncode = 0
+            for _ in range(args.repeat):
+                elapsed, returncode, result = run_case(module, argv, workdir)
+                best = min(best, elapsed)
+                imported.update(result['imported'], result['loaded'])
+                if 'error' in result:
+                    print(f"  ⚠ {name}: el comando no terminó normalmente\n{result['error']}")
+                    failures += 1
+                    break
+            slow = args.max_ms is not None and best * 1000 > args.max_ms
+            failures += bool(imported) + slow + (returncode != 0)
+            status = ', '.join(sorted(imported)) or '-'
+            mark = '  LENTO' if slow else ''
+            print(f"{name:<30} {best * 1000:>10.1f} {returncode:>7}  {status}{mark}")
+
+    print(f"\n{failures} fallos")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+suite.py - Suite de benchmarks de la cadena de LeviScript
+Genera scripts sintéticos (synthetic.PRESETS) y mide LeviLexer.tokenize,
+LeviParser.parse, ASTSerializer.serialize/deserialize y
+PythonGenerator.generate con calentamiento y repeticiones. Los resultados
+(mínimo, mediana, media y desviación en ms por caso) se pueden guardar como JSON
+y comparar con una línea base: cualquier caso cuyo mínimo empeore más del
+umbral cuenta como regresión y el script termina con código 1.
+
+Uso:
+    python benchmarks/suite.py [--presets small medium] [--warmup 2] [--repeat 7]
+    python benchmarks/suite.py --save benchmarks/baseline.json
+    python benchmarks/suite.py --baseline benchmarks/baseline.json [--threshold 0.15]
+"""
+
+import gc
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from leviathan_ui.Script import LeviScript, LeviLexer, LeviParser, ASTSerializer, PythonGenerator
+from synthetic import PRESETS, generate_script
+
+
+SCHEMA = 1
+PHASES = ('tokenize', 'parse', 'serialize', 'deserialize', 'generate')
+
+
+def measure(func, warmup: int, repeat: int, min_time: float = 0.02) -> dict:
+    """Estadísticas en ms por llamada; como timeit, sin GC durante cada medición
+
+    Cada muestra repite func las veces necesarias para durar al menos
+    min_time, de modo que los casos pequeños no quedan dominados por el ruido.
+    """
+    for _ in range(warmup):
+        func()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= min_time:
+            break
+        number *= 2
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            times.append((time.perf_counter() - start) / number * 1000)
+        finally:
+            gc.enable()
+    return {
+        'min': round(min(times), 4),
+        'median': round(statistics.median(times), 4),
+        'mean': round(statistics.fmean(times), 4),
+        'stdev': round(statistics.stdev(times), 4) if len(times) > 1 else 0.0,
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def run_suite(presets, warmup: int, repeat: int, report=print) -> dict:
+    results = {}
+    sizes = {}
+    for preset in presets:
+        source = generate_script(PRESETS[preset])
+        tokens = LeviLexer(source).tokenize()
+        ast = LeviParser(tokens).parse()
+        data = ASTSerializer.serialize(ast)
+        sizes[preset] = {'source_bytes': len(source.encode('utf-8')), 'tokens': len(tokens),
+                         'lsx_bytes': len(data)}
+        cases = {
+            'tokenize': lambda: LeviLexer(source).tokenize(),
+            'parse': lambda: LeviParser(tokens).parse(),
+            'serialize': lambda: ASTSerializer.serialize(ast),
+            'deserialize': lambda: ASTSerializer.deserialize(data),
+            'generate': lambda: PythonGenerator().generate(ast),
+        }
+        for phase in PHASES:
+            stats = measure(cases[phase], warmup, repeat)
+            results[f'{preset}/{phase}'] = stats
+            report(f"  {preset + '/' + phase:<22} {stats['min']:>10.2f} ms "
+                   f"(mediana {stats['median']:.2f} ±{stats['stdev']:.2f})")
+    return {
+        'schema': SCHEMA,
+        'meta': {
+            'compiler_version': LeviScript.VERSION,
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'warmup': warmup,
+            'repeat': repeat,
+        },
+        'sizes': sizes,
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Filas (caso, base, actual, cambio, regresión) de los casos presentes en ambos
+
+    Se compara el mínimo de las muestras: es la estimación menos sensible a
+    la carga de la máquina (el ruido sólo puede sumar tiempo).
+    """
+    rows = []
+    for case, stats in current['results'].items():
+        base = baseline.get('results', {}).get(case)
+        if base is None:
+            continue
+        change = stats['min'] / base['min'] - 1
+        rows.append((case, base['min'], stats['min'], change, change > threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Suite de benchmarks del compilador LeviScript')
+    parser.add_argument('--presets', nargs='+', choices=sorted(PRESETS), default=['small', 'medium'],
+                        help='Tamaños de script sintético')
+    parser.add_argument('--warmup', type=int, default=2, help='Ejecuciones de calentamiento por caso')
+    parser.add_argument('--repeat', type=int, default=7, help='Repeticiones medidas por caso')
+    parser.add_argument('--save', type=str, help='Guardar los resultados como JSON (sirve de línea base)')
+    parser.add_argument('--baseline', type=str, help='JSON de línea base con el que comparar')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='Empeoramiento del mínimo que cuenta como regresión (0.15 = 15%%)')
+    args = parser.parse_args()
+
+    print(f"LeviScript {LeviScript.VERSION} · Python {platform.python_version()} · "
+          f"calentamiento {args.warmup} · repeticiones {args.repeat}")
+    current = run_suite(args.presets, args.warmup, args.repeat)
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(current, indent=2) + '\n', encoding='utf-8')
+        print(f"\nResultados guardados en {args.save}")
+
+    if not args.baseline:
+        return 0
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+    if baseline.get('sizes') and any(baseline['sizes'].get(p, size) != size
+                                     for p, size in current['sizes'].items()):
+        print("\n⚠ Los scripts sintéticos no coinciden con los de la línea base; "
+              "la comparación puede no ser válida")
+    rows = compare(current, baseline, args.threshold)
+    print(f"\n{'Caso':<24} {'Base (ms)':>10} {'Actual (ms)':>12} {'Cambio':>8}")
+    for case, base, now, change, regressed in rows:
+        mark = '  REGRESIÓN' if regressed else ''
+        print(f"{case:<24} {base:>10.2f} {now:>12.2f} {change:>+7.1%}{mark}")
+    regressions = sum(1 for row in rows if row[4])
+    print(f"\n{regressions} regresiones de {len(rows)} casos (umbral {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+synthetic.py - Generador de scripts LeviScript sintéticos para benchmarks
+Produce programas .ls válidos y deterministas (misma semilla, mismo texto)
+con el número de setups, páginas, hooks, funciones, objetos anidados y
+longitud de strings que se pida. PRESETS fija los tamaños del suite.
+Los programas también se ejecutan (LeviInterpreter, `leviathan-ui start`):
+las variables son siempre números o booleanos no negativos, los textos se
+construyen sólo con plantillas y los while nunca entran.
+
+Uso:
+    python benchmarks/synthetic.py --preset medium -o medium.ls
+    python benchmarks/synthetic.py --setups 2 --pages 3 --nesting 5
+"""
+
+import random
+import argparse
+from dataclasses import dataclass, replace, asdict
+
+
+HOOKS = ['beforeDisplay', 'afterDisplay', 'beforeInstall', 'onInstall',
+         'afterInstall', 'onError', 'onCancel']
+PAGES = ['Welcome', 'License', 'Options', 'Install', 'Finish']
+WORDS = ['instalar', 'copiar', 'ruta', 'destino', 'versión', 'licencia', 'archivo',
+         'usuario', 'registro', 'acceso', 'directo', 'componente', 'opcional']
+
+
+@dataclass(frozen=True)
+class ScriptShape:
+    """Forma del script generado"""
+    setups: int = 2
+    pages: int = 5            # por setup
+    hooks: int = 4            # por setup (como mucho los 7 tipos)
+    functions: int = 8        # de primer nivel
+    statements: int = 6       # sentencias por hook y por función
+    nesting: int = 3          # profundidad de los objetos en la config de páginas
+    string_length: int = 1000  # caracteres del texto de licencia
+    seed: int = 0
+
+
+PRESETS = {
+    'small': ScriptShape(),
+    'medium': ScriptShape(setups=10, pages=8, hooks=7, functions=40, statements=8,
+                          nesting=4, string_length=4000),
+    'large': ScriptShape(setups=60, pages=10, hooks=7, functions=250, statements=10,
+                         nesting=5, string_length=16000),
+}
+
+
+class _Writer:
+    def __init__(self, shape: ScriptShape):
+        self.shape = shape
+        self.rng = random.Random(shape.seed)
+        self.lines = []
+        self.indent = 0
+
+    def emit(self, line: str):
+        self.lines.append('    ' * self.indent + line)
+
+    def words(self, count: int) -> str:
+        return ' '.join(self.rng.choice(WORDS) for _ in range(count))
+
+    def long_string(self) -> str:
+        text = []
+        size = 0
+        while size < self.shape.string_length:
+            sentence = self.words(self.rng.randint(6, 14)).capitalize() + '. '
+            if self.rng.random() < 0.2:
+                sentence += '\\n'
+            text.append(sentence)
+            size += len(sentence)
+        return '"' + ''.join(text) + '"'
+
+    def obj(self, depth: int) -> str:
+        """Objeto literal anidado depth niveles"""
+        pairs = [f'key{i}: {self.rng.choice([str(self.rng.randint(0, 999)), "true", "null"])}'
+                 for i in range(self.rng.randint(1, 3))]
+        pairs.append(f'label: "{self.words(3)}"')
+        if depth > 1:
+            pairs.append(f'child: {self.obj(depth - 1)}')
+        return '{ ' + ', '.join(pairs) + ' }'
+
+    def expression(self, names) -> str:
+        """Expresión numérica (o booleana) no negativa sobre names"""
+        a, b = self.rng.choice(names), self.rng.choice(names)
+        return self.rng.choice([
+            f'{a} + {self.rng.randint(1, 99)} * {b}',
+            f'({a} - {b}) % {self.rng.randint(2, 9)}',
+            f'{a} > {b} && {b} != null',
+            f'({a} + {b}) * {self.rng.randint(2, 9)}',
+        ])
+
+    def statements(self, names, count: int, depth: int = 0):
+        for i in range(count):
+            kind = self.rng.randrange(6 if depth < 2 else 3)
+            name = f'v{depth}_{i}'
+            if kind == 0:
+                self.emit(f'let {name} = {self.expression(names)}')
+                names = names + [name]
+            elif kind == 1:
+                self.emit(f'log(${{"{self.words(4)}: " {self.rng.choice(names)}}})')
+            elif kind == 2:
+                self.emit(f'log(${{"{self.words(2)} " {self.rng.choice(names)}}})')
+            elif kind == 3:
+                self.emit(f'if ({self.expression(names)}) {{')
+                self.block(names, depth)
+                self.emit('} else {')
+                self.block(names, depth)
+                self.emit('}')
+            elif kind == 4:
+                self.emit(f'for (item in [{", ".join(str(n) for n in range(self.rng.randint(1, 5)))}]) {{')
+                self.block(names + ['item'], depth)
+                self.emit('}')
+            else:
+                # Las asignaciones no cambian la condición: el bucle no debe entrar
+                self.emit(f'while ({self.rng.choice(names)} < -{self.rng.randint(1, 9)}) {{')
+                self.block(names, depth)
+                self.emit('}')
+
+    def block(self, names, depth: int):
+        self.indent += 1
+        self.statements(names, max(1, self.shape.statements // 3), depth + 1)
+        self.indent -= 1
+
+    def page(self, kind: str):
+        if kind == 'License':
+            self.emit(f'License {{ text: {self.long_string()}, accept: true }},')
+            return
+        self.emit(f'{kind} {{')
+        self.indent += 1
+        self.emit(f'title: "{self.words(3)}",')
+        self.emit(f'subtitle: "{self.words(6)}",')
+        self.emit(f'options: {self.obj(self.shape.nesting)},')
+        self.emit(f'items: [{", ".join(f"{chr(34)}{w}{chr(34)}" for w in self.words(4).split())}]')
+        self.indent -= 1
+        self.emit('},')
+
+    def setup(self, index: int):
+        shape = self.shape
+        self.emit(f'setup App{index} {{')
+        self.indent += 1
+        self.emit('meta {')
+        self.emit(f'    name: "App {index}",')
+        self.emit(f'    version: "1.{index}.{self.rng.randint(0, 20)}",')
+        self.emit(f'    publisher: "{self.words(2)}"')
+        self.emit('}')
+        self.emit('requires ["leviathan-ui", "PyQt6"]')
+        self.emit(f'const TIMEOUT = {self.rng.randint(10, 120)}')
+        self.emit(f'let retries = {self.rng.randint(1, 5)}')
+        self.emit('pages [')
+        self.indent += 1
+        for i in range(shape.pages):
+            self.page(PAGES[i % len(PAGES)])
+        self.indent -= 1
+        self.emit(']')
+        for hook in HOOKS[:shape.hooks]:
+            self.emit(f'{hook} {{')
+            self.indent += 1
+            self.statements(['TIMEOUT', 'retries'], shape.statements)
+            self.indent -= 1
+            self.emit('}')
+        self.indent -= 1
+        self.emit('}')
+        self.emit('')
+
+    def function(self, index: int):
+        self.emit(f'function helper{index}(a, b) {{')
+        self.indent += 1
+        self.statements(['a', 'b'], self.shape.statements)
+        self.emit('return a + b')
+        self.indent -= 1
+        self.emit('}')
+        self.emit('')
+
+
+def generate_script(shape: ScriptShape = ScriptShape()) -> str:
+    """Script .ls válido con la forma pedida"""
+    writer = _Writer(shape)
+    writer.emit('// Script sintético generado por benchmarks/synthetic.py')
+    writer.emit('import { path, environ } from "os"')
+    writer.emit('')
+    for i in range(shape.functions):
+        writer.function(i)
+    for i in range(shape.setups):
+        writer.setup(i)
+    return '\n'.join(writer.lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Genera un script LeviScript sintético')
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='small', help='Tamaño base')
+    for name, value in asdict(ScriptShape()).items():
+        parser.add_argument(f'--{name.replace("_", "-")}', type=int, dest=name, default=None,
+                            help=f'Sobrescribe el valor del preset (por defecto {value})')
+    parser.add_argument('-o', '--output', type=str, help='Archivo de salida (por defecto, stdout)')
+    args = parser.parse_args()
+
+    overrides = {name: getattr(args, name) for name in asdict(ScriptShape())
+                 if getattr(args, name) is not None}
+    source = generate_script(replace(PRESETS[args.preset], **overrides))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(source)
+    else:
+        print(source, end='')
+
+
+if __name__ == '__main__':
+    main()
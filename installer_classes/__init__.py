@@ -5,6 +5,7 @@ class - Clases del instalador Leviathan-UI
 
 from .i18n_manager import I18nManager
 from .single_instance_checker import SingleInstanceChecker
+from .log_bridge import LogBridge
 from .install_worker import InstallWorker
 from .welcome_page import WelcomePage
 from .options_page import OptionsPage
@@ -16,6 +17,7 @@ from .utils import check_internet_connection
 __all__ = [
     'I18nManager',
     'SingleInstanceChecker', 
+    'LogBridge',
     'InstallWorker',
     'WelcomePage',
     'OptionsPage',
@@ -3,7 +3,7 @@
 install_page.py - Página de progreso de instalación
 """
 
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTextEdit
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPlainTextEdit
 from PyQt6.QtGui import QFont, QPixmap
 from PyQt6.QtCore import Qt, pyqtSignal
 
@@ -18,6 +18,8 @@ class InstallPage(QWidget):
     """Página de instalación con progreso y log de salida"""
 
     finished = pyqtSignal(bool, str)  # success, error_msg
+    
+    LOG_MAX_LINES = 500
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -81,12 +83,14 @@ class InstallPage(QWidget):
         
         content_layout.addSpacing(15)
         
-        # Área de log
-        self.log_area = QTextEdit()
+        # Área de log: se añaden líneas (appendPlainText) con un tope de bloques,
+        # en vez de reemplazar y volver a maquetar todo el documento
+        self.log_area = QPlainTextEdit()
         self.log_area.setReadOnly(True)
+        self.log_area.setMaximumBlockCount(self.LOG_MAX_LINES)
         self.log_area.setFont(QFont("Consolas", 9))
         self.log_area.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background: rgba(0, 0, 0, 0.5);
                 color: #00ff00;
                 border: 1px solid rgba(255, 255, 255, 0.1);
@@ -102,9 +106,9 @@ class InstallPage(QWidget):
     def start_installation(self, options):
         """Inicia el worker de instalación con las opciones seleccionadas"""
         self.worker = InstallWorker(options)
-        self.worker.progress.connect(self.on_progress)
-        self.worker.status.connect(self.on_status)
-        self.worker.log.connect(self.on_log)
+        self.worker.bridge.progress.connect(self.on_progress)
+        self.worker.bridge.status.connect(self.on_status)
+        self.worker.bridge.lines.connect(self.on_log)
         self.worker.finished.connect(self.on_finished)
         self.worker.start()
     
@@ -116,21 +120,22 @@ class InstallPage(QWidget):
         """Actualiza el texto de estado"""
         self.status_label.setText(text)
     
-    def on_log(self, log, desc):
-        """Actualiza el área de log"""
-        self.log_area.setText(log)
+    def on_log(self, lines):
+        """Añade al área de log las líneas recibidas desde el último tick"""
+        self.log_area.appendPlainText(lines)
         self.log_area.verticalScrollBar().setValue(
             self.log_area.verticalScrollBar().maximum()
         )
     
     def on_finished(self, success, error_msg):
         """Maneja la finalización de la instalación"""
+        # El worker ya ha publicado lo que quedaba en el puente
         if success:
             self.status_label.setText("✓ Instalación completada")
             self.status_label.setStyleSheet("color: #4CAF50; background: transparent;")
         else:
             self.status_label.setText("✗ " + i18n.get("error_title"))
             self.status_label.setStyleSheet("color: #f44336; background: transparent;")
-            self.log_area.append(f"\n❌ ERROR:\n{error_msg}")
+            self.log_area.appendPlainText(f"\n❌ ERROR:\n{error_msg}")
         # Emitir señal para que el padre cambie a página final
         self.finished.emit(success, error_msg)
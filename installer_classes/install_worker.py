@@ -3,29 +3,133 @@
 install_worker.py - Worker thread para la instalación del paquete
 """
 
+import re
 import sys
+import json
+import logging
+import tempfile
 import subprocess
+from collections import deque
+from importlib import metadata
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtCore import QThread, pyqtSignal, pyqtSlot
 
 from installer_classes.i18n_manager import I18nManager
+from installer_classes.log_bridge import LogBridge
 from installer_classes.utils import check_internet_connection
 
 i18n = I18nManager()
 
+DEFAULT_LOG_FILE = Path(tempfile.gettempdir()) / "leviathan-ui-install.log"
+
+
+def wheel_project(whl):
+    """(nombre normalizado PEP 503, versión) a partir del nombre del .whl"""
+    name, version = Path(whl).name[:-len(".whl")].split("-")[:2]
+    return re.sub(r"[-_.]+", "-", name).lower(), version
+
+
+class CommandOutput:
+    """Salida de los comandos con memoria acotada
+    
+    En memoria sólo quedan las últimas `tail` líneas del comando en curso
+    (deque con maxlen). Si se da log_file, el log completo se vuelca además a
+    disco con rotación por tamaño (RotatingFileHandler) para post-mortems, en
+    bloques de WRITE_LINES líneas para no pagar la comprobación de rotación
+    por cada una.
+    """
+    
+    TAIL_LINES = 50
+    WRITE_LINES = 256
+    MAX_BYTES = 2 * 1024 * 1024
+    BACKUPS = 3
+    
+    def __init__(self, log_file=None, tail=TAIL_LINES, max_bytes=MAX_BYTES, backups=BACKUPS):
+        self.tail = deque(maxlen=tail)
+        self.log_file = Path(log_file) if log_file else None
+        self._handler = None
+        self._unwritten = []
+        if self.log_file:
+            self._handler = RotatingFileHandler(self.log_file, maxBytes=max_bytes, backupCount=backups,
+                                                encoding="utf-8", delay=True)
+    
+    def start_command(self, cmd):
+        """Nuevo comando: vacía las líneas en memoria y deja una cabecera en el log"""
+        self.tail.clear()
+        self._write(f"> {' '.join(cmd)}")
+    
+    def append(self, line):
+        self.tail.append(line)
+        self._write(line)
+    
+    def last(self, count):
+        return list(self.tail)[-count:]
+    
+    def _write(self, line):
+        if self._handler is not None:
+            self._unwritten.append(line)
+            if len(self._unwritten) >= self.WRITE_LINES:
+                self.flush()
+    
+    def flush(self):
+        if self._handler is not None and self._unwritten:
+            self._handler.handle(logging.makeLogRecord({"msg": "\n".join(self._unwritten)}))
+            self._unwritten.clear()
+    
+    def close(self):
+        if self._handler is not None:
+            self.flush()
+            self._handler.close()
+
 
 class InstallWorker(QThread):
-    """Worker thread que ejecuta la instalación sin bloquear la UI"""
+    """Worker thread que ejecuta la instalación sin bloquear la UI
+    
+    Progreso, estado y log pasan por self.bridge (LogBridge), que los agrupa
+    por tick en el hilo de la GUI. progress, status y log se emiten en ese
+    tick, no una vez por línea: log lleva las LOG_TAIL_LINES últimas líneas y
+    la descripción del paso actual. Para el log completo, bridge.lines.
+    """
     
     progress = pyqtSignal(int)
     status = pyqtSignal(str)
     log = pyqtSignal(str, str)
     finished = pyqtSignal(bool, str)
     
+    LOG_TAIL_LINES = 5
+    
     def __init__(self, options):
         super().__init__()
         self.options = options
         self.python_exe = sys.executable
+        self.bridge = LogBridge()
+        self._log_tail = deque(maxlen=self.LOG_TAIL_LINES)
+        self._log_desc = ""
+        self.bridge.progress.connect(self.progress)
+        self.bridge.status.connect(self._on_bridge_status)
+        self.bridge.lines.connect(self._on_bridge_lines)
+        # El puente vive en el hilo de la GUI: arranca con el hilo y publica lo
+        # pendiente antes que cualquier otro receptor de finished
+        self.started.connect(self.bridge.start)
+        self.finished.connect(self._stop_bridge)
+        # options['log_file']: ruta del log completo, o False para no escribirlo
+        log_file = self.options.get('log_file', DEFAULT_LOG_FILE)
+        self.output = CommandOutput(log_file or None)
+        
+    @pyqtSlot(str)
+    def _on_bridge_status(self, text):
+        self._log_desc = text
+        self.status.emit(text)
+    
+    @pyqtSlot(str)
+    def _on_bridge_lines(self, lines):
+        self._log_tail.extend(lines.split("\n"))
+        self.log.emit("\n".join(self._log_tail), self._log_desc)
+    
+    @pyqtSlot(bool, str)
+    def _stop_bridge(self, success, error):
+        self.bridge.stop()
         
     def run(self):
         """Ejecuta el proceso de instalación"""
@@ -34,33 +138,42 @@ class InstallWorker(QThread):
             self.finished.emit(success, "")
         except Exception as e:
             self.finished.emit(False, str(e))
+        finally:
+            self.output.close()
     
     def _run_command(self, cmd, desc, progress_val):
         """Ejecuta un comando de subprocess y reporta progreso"""
-        self.status.emit(desc)
-        self.log.emit(f"> {' '.join(cmd)}", desc)
+        self.bridge.set_status(desc)
+        self.bridge.append(f"> {' '.join(cmd)}")
+        self.output.start_command(cmd)
         
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        startupinfo = None
+        if sys.platform == "win32":
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
         
         process = subprocess.Popen(
             cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
             text=True, startupinfo=startupinfo
         )
         
-        output = []
         while True:
             line = process.stdout.readline()
             if not line and process.poll() is not None:
                 break
             if line:
-                output.append(line.strip())
-                self.log.emit('\n'.join(output[-5:]), desc)
+                line = line.strip()
+                self.output.append(line)
+                self.bridge.append(line)
         
         if process.returncode != 0:
-            raise Exception(f"\n".join(output[-10:]))
+            self.output.flush()
+            error = "\n".join(self.output.last(10))
+            if self.output.log_file:
+                error += f"\n\nLog completo: {self.output.log_file}"
+            raise Exception(error)
         
-        self.progress.emit(progress_val)
+        self.bridge.set_progress(progress_val)
     
     def _install(self):
         """Proceso completo de instalación"""
@@ -71,7 +184,7 @@ class InstallWorker(QThread):
                 i18n.get("install_deps"), 20
             )
         else:
-            self.progress.emit(20)
+            self.bridge.set_progress(20)
         
         # 2. Instalar leviathan-ui (20-80%)
         install_mode = self.options.get('install_mode', 'local')
@@ -83,13 +196,16 @@ class InstallWorker(QThread):
             if not whl_files:
                 raise Exception(i18n.get("error_no_whl"))
             
-            for idx, whl in enumerate(whl_files):
-                progress = 20 + int((idx + 1) / len(whl_files) * 60)
-                force = ["--force-reinstall"] if self.options.get('force', False) else []
-                self._run_command(
-                    [self.python_exe, "-m", "pip", "install", str(whl)] + force,
-                    f"Instalando {whl.name}...", progress
-                )
+            force = ["--force-reinstall"] if self.options.get('force', False) else []
+            if self.options.get('single_pip', True):
+                self._install_wheels(whl_files, force)
+            else:
+                for idx, whl in enumerate(whl_files):
+                    progress = 20 + int((idx + 1) / len(whl_files) * 60)
+                    self._run_command(
+                        [self.python_exe, "-m", "pip", "install", str(whl)] + force,
+                        f"Instalando {whl.name}...", progress
+                    )
         else:
             # Remoto desde PyPI
             if not check_internet_connection():
@@ -106,7 +222,7 @@ class InstallWorker(QThread):
         if self.options.get('startmenu_shortcut', False):
             self._create_shortcut("startmenu")
         
-        self.progress.emit(95)
+        self.bridge.set_progress(95)
         
         # 4. Verificación final (95-100%)
         self._run_command(
@@ -116,6 +232,64 @@ class InstallWorker(QThread):
         
         return True
     
+    def _install_wheels(self, whl_files, force):
+        """Instala todas las ruedas en una sola invocación de pip (un arranque y una resolución)
+        
+        Si hay varias ruedas del mismo proyecto se usa la más reciente. Con
+        options['skip_installed'] (por defecto) y sin force, se omiten las que ya
+        están instaladas en la misma versión; si no queda ninguna, pip no se ejecuta.
+        """
+        latest = {}
+        for whl in sorted(whl_files, key=lambda w: w.stat().st_mtime):
+            latest[wheel_project(whl)[0]] = whl
+        wheels = list(latest.values())
+        
+        if not force and self.options.get('skip_installed', True):
+            installed = self._installed_versions(list(latest))
+            pending = []
+            for whl in wheels:
+                name, version = wheel_project(whl)
+                if installed.get(name) == version:
+                    self.bridge.append(f"= {whl.name}: {name} {version} ya instalado")
+                else:
+                    pending.append(whl)
+            wheels = pending
+        
+        if not wheels:
+            self.bridge.set_progress(80)
+            return
+        self._run_command(
+            [self.python_exe, "-m", "pip", "install"] + [str(whl) for whl in wheels] + force,
+            f"Instalando {', '.join(whl.name for whl in wheels)}...", 80
+        )
+    
+    def _installed_versions(self, names):
+        """{nombre: versión instalada} en el intérprete de destino, para los proyectos dados"""
+        if self.python_exe == sys.executable:
+            versions = {}
+            for name in names:
+                try:
+                    versions[name] = metadata.version(name)
+                except metadata.PackageNotFoundError:
+                    pass
+            return versions
+        # Otro intérprete: una sola consulta para todos los proyectos
+        code = ("import json, sys\n"
+                "from importlib import metadata\n"
+                "found = {}\n"
+                "for name in json.loads(sys.argv[1]):\n"
+                "    try:\n"
+                "        found[name] = metadata.version(name)\n"
+                "    except metadata.PackageNotFoundError:\n"
+                "        pass\n"
+                "print(json.dumps(found))\n")
+        try:
+            result = subprocess.run([self.python_exe, "-c", code, json.dumps(names)],
+                                    capture_output=True, text=True, timeout=60)
+            return json.loads(result.stdout) if result.returncode == 0 else {}
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            return {}
+    
     def _create_shortcut(self, location):
         """Crear accesos directos de demostración"""
         try:
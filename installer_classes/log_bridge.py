@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+log_bridge.py - Puente de log y progreso entre el worker y la GUI
+El worker deja líneas, progreso y estado en un búfer protegido por un lock
+(sin una señal por línea) y un QTimer en el hilo de la GUI los publica a
+30-60 Hz: las líneas en un solo bloque y sólo el último valor de progreso y
+de estado.
+"""
+
+import threading
+from collections import deque
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+
+class LogBridge(QObject):
+    """Agrupa la salida del worker en un lote por tick del temporizador"""
+
+    lines = pyqtSignal(str)      # líneas nuevas desde el último tick, unidas con '\n'
+    progress = pyqtSignal(int)   # último progreso; los intermedios se descartan
+    status = pyqtSignal(str)     # último texto de estado
+
+    DEFAULT_HZ = 30
+    MAX_PENDING_LINES = 500      # como el maximumBlockCount del log: más no llegaría a verse
+
+    def __init__(self, hz=DEFAULT_HZ, max_pending_lines=MAX_PENDING_LINES, parent=None):
+        # Se crea en el hilo de la GUI: ahí viven el QTimer y las emisiones
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._lines = deque(maxlen=max_pending_lines)
+        self._progress = None
+        self._status = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, round(1000 / hz)))
+        self._timer.timeout.connect(self.flush)
+
+    # Llamables desde cualquier hilo
+
+    def append(self, line):
+        with self._lock:
+            self._lines.append(line)
+
+    def set_progress(self, value):
+        with self._lock:
+            self._progress = value
+
+    def set_status(self, text):
+        with self._lock:
+            self._status = text
+
+    # Hilo de la GUI
+
+    @pyqtSlot()
+    def start(self):
+        self._timer.start()
+
+    @pyqtSlot()
+    def stop(self):
+        """Detiene el tick y publica lo pendiente"""
+        self._timer.stop()
+        self.flush()
+
+    @pyqtSlot()
+    def flush(self):
+        with self._lock:
+            lines, self._lines = self._lines, deque(maxlen=self._lines.maxlen)
+            progress, self._progress = self._progress, None
+            status, self._status = self._status, None
+        if status is not None:
+            self.status.emit(status)
+        if lines:
+            self.lines.emit('\n'.join(lines))
+        if progress is not None:
+            self.progress.emit(progress)
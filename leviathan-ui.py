@@ -15,17 +15,10 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
-try:
-    from PyQt6.QtWidgets import QApplication
-    from PyQt6.QtCore import QTimer, Qt
-    
-    from leviathan_ui.splash import InmersiveSplash
-    from installer_classes.leviathan_setup import LeviathanSetup
-    from leviathan_ui import __version__
-except ImportError as e:
-    print(f"❌ Error: Dependencia faltante - {e}")
-    print("   Asegúrate de tener instalado: pip install PyQt6 Pillow")
-    sys.exit(1)
+from leviathan_ui import __version__
+
+# PyQt6, Pillow y los widgets se importan en launch_gui: --version y los
+# subcomandos de la CLI (precompile, status...) arrancan sin cargar Qt.
 
 def show_version():
     """Mostrar versión"""
@@ -36,6 +29,17 @@ def show_version():
 
 def launch_gui():
     """Lanzar instalador GUI de leviathan-ui con splash integrado"""
+    try:
+        from PyQt6.QtWidgets import QApplication
+        from PyQt6.QtCore import QTimer
+
+        from leviathan_ui.splash import InmersiveSplash
+        from installer_classes.leviathan_setup import LeviathanSetup
+    except ImportError as e:
+        print(f"❌ Error: Dependencia faltante - {e}")
+        print("   Asegúrate de tener instalado: pip install PyQt6 Pillow")
+        return 1
+
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     app.setStyleSheet("""
@@ -101,6 +105,9 @@ def parse_legacy_args(args):
 def show_error_dialog(title, message):
     """Muestra un error incluso si PyQt6 no está disponible"""
     try:
+        # Sólo si la GUI ya cargó Qt: un error de la CLI no debe importarlo
+        if 'PyQt6.QtWidgets' not in sys.modules:
+            raise ImportError('PyQt6 no cargado')
         from PyQt6.QtWidgets import QMessageBox
         msg = QMessageBox()
         msg.setWindowTitle(title)
@@ -4,14 +4,24 @@ Script.py - Motor de LeviScript
 Lexer + Parser + Interpreter para lenguaje JS-like de instaladores
 """
 
+import io
 import re
+import gc
+import sys
+import math
 import json
+import mmap
 import struct
-import pickle
+import marshal
+import operator
+import ast as py_ast
+import importlib.util
 from enum import Enum, auto
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Union
+from collections import deque
+from dataclasses import dataclass, asdict, fields
+from typing import List, Dict, Any, Optional, Union, Iterable, Iterator, Tuple
 from pathlib import Path
+from types import CodeType
 
 
 # ============================================================
@@ -138,6 +148,48 @@ KEYWORDS = {
 }
 
 
+# ============================================================
+# OPERATORS MAPPING
+# ============================================================
+OPERATORS = {
+    '=>': TokenType.ARROW,
+    '==': TokenType.EQ,
+    '!=': TokenType.NEQ,
+    '<=': TokenType.LTE,
+    '>=': TokenType.GTE,
+    '&&': TokenType.AND,
+    '||': TokenType.OR,
+    '+': TokenType.PLUS,
+    '-': TokenType.MINUS,
+    '*': TokenType.MULT,
+    '/': TokenType.DIV,
+    '%': TokenType.MOD,
+    '=': TokenType.ASSIGN,
+    '<': TokenType.LT,
+    '>': TokenType.GT,
+    '!': TokenType.NOT,
+    '{': TokenType.LBRACE,
+    '}': TokenType.RBRACE,
+    '[': TokenType.LBRACKET,
+    ']': TokenType.RBRACKET,
+    '(': TokenType.LPAREN,
+    ')': TokenType.RPAREN,
+    ':': TokenType.COLON,
+    ';': TokenType.SEMICOLON,
+    ',': TokenType.COMMA,
+    '.': TokenType.DOT,
+    '$': TokenType.DOLLAR,
+    '@': TokenType.AT,
+}
+
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '"': '"', "'": "'", '\\': '\\'}
+
+# Entradas (tipo, texto) ya resueltas: el texto es el propio str de la clave,
+# así todos los tokens de una misma palabra u operador comparten un objeto
+_KEYWORD_ENTRIES = {name: (token_type, name) for name, token_type in KEYWORDS.items()}
+_OPERATOR_ENTRIES = {op: (token_type, op) for op, token_type in OPERATORS.items()}
+
+
 # ============================================================
 # TOKEN CLASS
 # ============================================================
@@ -152,317 +204,287 @@ class Token:
         return f"Token({self.type.name}, {self.value!r}, L{self.line}:C{self.column})"
 
 
+@dataclass(slots=True, frozen=True)
+class Diagnostic:
+    """Error de sintaxis anotado en modo recuperación (lexer o parser)"""
+    line: int
+    column: int
+    message: str
+    
+    def __str__(self):
+        return f"[{self.line}:{self.column}] {self.message}"
+
+
 # ============================================================
 # LEXER
 # ============================================================
+# Expresión maestra: cada alternativa es un grupo con nombre y el orden
+# reproduce la prioridad del escáner carácter a carácter original.
+# Las formas OPEN_* sólo coinciden cuando la forma cerrada falla.
+_MASTER_RE = re.compile(r'''
+      (?P<WS>[ \t\r]+)
+    | (?P<NEWLINE>\n)
+    | (?P<COMMENT>//[^\n]*|/\*[\s\S]*?\*/)
+    | (?P<OPEN_COMMENT>/\*)
+    | (?P<STRING>"[^"\\]*(?:\\[\s\S][^"\\]*)*"|'[^'\\]*(?:\\[\s\S][^'\\]*)*')
+    | (?P<OPEN_STRING>["'])
+    | (?P<NUMBER>\d+(?:\.\d*)?)
+    | (?P<TEMPLATE_START>\$\{)
+    | (?P<IDENTIFIER>[^\W\d][\w$]*)
+    | (?P<OP>=>|==|!=|<=|>=|&&|\|\||[-+*/%=<>!{}\[\]():;,.$@])
+''', re.VERBOSE)
+
+_ESCAPE_RE = re.compile(r'\\([\s\S])')
+
+
+def _unescape(match) -> str:
+    char = match.group(1)
+    return ESCAPES.get(char, char)
+
+
 class LeviLexer:
-    """Tokenizador de LeviScript"""
+    """Tokenizador de LeviScript (una sola pasada sobre una regex maestra)
+    
+    Los identificadores pasan por un pool de nombres (names): cada nombre
+    distinto se crea e interna una sola vez y todos sus tokens, y por tanto
+    los nodos Identifier/VarDecl/... del AST, comparten el mismo str. La misma
+    búsqueda resuelve las palabras reservadas. Se puede pasar el pool de otro
+    lexer (lexer.names) para compartirlo entre varios análisis del mismo fuente.
+    """
     
-    def __init__(self, source: str):
+    def __init__(self, source: str, recover: bool = False,
+                 names: Optional[Dict[str, Tuple[TokenType, str]]] = None):
         self.source = source
         self.pos = 0
         self.line = 1
         self.column = 1
         self.tokens: List[Token] = []
+        # Con recover=True los errores se anotan en diagnostics y se sigue
+        self.recover = recover
+        self.diagnostics: List[Diagnostic] = []
+        # True si un string o comentario sin cerrar se comió el final del fuente
+        self.unterminated = False
+        # Pool de nombres: identificador -> (tipo, texto internado)
+        self.names = names if names is not None else dict(_KEYWORD_ENTRIES)
         
     def error(self, msg: str):
+        if self.recover:
+            self.diagnostics.append(Diagnostic(self.line, self.column, msg))
+            return
         raise SyntaxError(f"[{self.line}:{self.column}] {msg}")
     
-    def peek(self, offset: int = 0) -> str:
-        pos = self.pos + offset
-        if pos >= len(self.source):
-            return '\0'
-        return self.source[pos]
-    
-    def advance(self) -> str:
-        char = self.peek()
-        self.pos += 1
-        if char == '\n':
-            self.line += 1
-            self.column = 1
-        else:
-            self.column += 1
-        return char
-    
-    def skip_whitespace(self):
-        while self.peek() in ' \t\r':
-            self.advance()
-    
-    def skip_comment(self):
-        if self.peek() == '/' and self.peek(1) == '/':
-            while self.peek() != '\n' and self.peek() != '\0':
-                self.advance()
-        elif self.peek() == '/' and self.peek(1) == '*':
-            self.advance()  # /
-            self.advance()  # *
-            while not (self.peek() == '*' and self.peek(1) == '/'):
-                if self.peek() == '\0':
-                    self.error("Comentario multilinea no cerrado")
-                self.advance()
-            self.advance()  # *
-            self.advance()  # /
-    
-    def read_string(self, quote: str) -> str:
-        self.advance()  # opening quote
-        result = ""
-        while self.peek() != quote:
-            if self.peek() == '\0':
-                self.error("String no cerrado")
-            if self.peek() == '\\':
-                self.advance()
-                escape = self.advance()
-                result += {'n': '\n', 't': '\t', 'r': '\r', '"': '"', "'": "'", '\\': '\\'}.get(escape, escape)
-            else:
-                result += self.advance()
-        self.advance()  # closing quote
-        return result
-    
-    def read_number(self) -> Union[int, float]:
-        start = self.pos
-        has_dot = False
-        while self.peek().isdigit() or (self.peek() == '.' and not has_dot):
-            if self.peek() == '.':
-                has_dot = True
-            self.advance()
-        num_str = self.source[start:self.pos]
-        return float(num_str) if has_dot else int(num_str)
-    
-    def read_identifier(self) -> str:
-        start = self.pos
-        while self.peek().isalnum() or self.peek() in '_$':
-            self.advance()
-        return self.source[start:self.pos]
+    def _error_at_end(self, msg: str, line: int, line_start: int, overrun: int = 0):
+        """Los literales y comentarios sin cerrar se reportan al final del fuente"""
+        end = len(self.source)
+        self.pos = end
+        self.unterminated = True
+        self.line = line + self.source.count('\n', line_start, end)
+        self.column = end - self.source.rfind('\n', 0, end) + overrun
+        self.error(msg)
     
     def tokenize(self) -> List[Token]:
-        while self.peek() != '\0':
-            start_col = self.column
-            
-            # Whitespace
-            if self.peek() in ' \t\r':
-                self.skip_whitespace()
-                continue
-            
-            # Newlines
-            if self.peek() == '\n':
-                self.advance()
-                self.tokens.append(Token(TokenType.NEWLINE, '\n', self.line - 1, start_col))
-                continue
-            
-            # Comments
-            if self.peek() == '/' and self.peek(1) in '/*':
-                self.skip_comment()
-                continue
-            
-            # Strings
-            if self.peek() in '"\'':
-                quote = self.advance()
-                value = self.read_string(quote)
-                self.tokens.append(Token(TokenType.STRING, value, self.line, start_col))
-                continue
-            
-            # Numbers
-            if self.peek().isdigit():
-                value = self.read_number()
-                self.tokens.append(Token(TokenType.NUMBER, value, self.line, start_col))
-                continue
-            
-            # Template literals ${...}
-            if self.peek() == '$' and self.peek(1) == '{':
-                self.advance()  # $
-                self.advance()  # {
-                self.tokens.append(Token(TokenType.TEMPLATE_START, '${', self.line, start_col))
-                continue
-            
-            # Identifiers and keywords
-            if self.peek().isalpha() or self.peek() == '_':
-                name = self.read_identifier()
-                token_type = KEYWORDS.get(name, TokenType.IDENTIFIER)
-                self.tokens.append(Token(token_type, name, self.line, start_col))
-                continue
-            
-            # Multi-char operators
-            two_char = self.peek() + self.peek(1)
-            if two_char == '=>':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TokenType.ARROW, '=>', self.line, start_col))
-                continue
-            if two_char == '==':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TokenType.EQ, '==', self.line, start_col))
-                continue
-            if two_char == '!=':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TokenType.NEQ, '!=', self.line, start_col))
-                continue
-            if two_char == '<=':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TokenType.LTE, '<=', self.line, start_col))
-                continue
-            if two_char == '>=':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TokenType.GTE, '>=', self.line, start_col))
-                continue
-            if two_char == '&&':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TokenType.AND, '&&', self.line, start_col))
-                continue
-            if two_char == '||':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TokenType.OR, '||', self.line, start_col))
+        self.tokens.extend(self.iter_tokens())
+        return self.tokens
+    
+    def iter_tokens(self) -> Iterator[Token]:
+        """Genera los tokens uno a uno sin acumularlos (termina con EOF)"""
+        source = self.source
+        end = len(source)
+        match = _MASTER_RE.match
+        names = self.names
+        operators = _OPERATOR_ENTRIES
+        intern = sys.intern
+        identifier = TokenType.IDENTIFIER
+        
+        pos = self.pos
+        line = self.line
+        line_start = pos - (self.column - 1)
+        
+        while pos < end:
+            m = match(source, pos)
+            if m is None:
+                self.pos, self.line, self.column = pos, line, pos - line_start + 1
+                self.error(f"Carácter inesperado: '{source[pos]}'")
+                # Recuperación: se descarta el carácter y se sigue escaneando
+                pos += 1
                 continue
             
-            # Single-char operators and delimiters
-            single_char_ops = {
-                '+': TokenType.PLUS,
-                '-': TokenType.MINUS,
-                '*': TokenType.MULT,
-                '/': TokenType.DIV,
-                '%': TokenType.MOD,
-                '=': TokenType.ASSIGN,
-                '<': TokenType.LT,
-                '>': TokenType.GT,
-                '!': TokenType.NOT,
-                '{': TokenType.LBRACE,
-                '}': TokenType.RBRACE,
-                '[': TokenType.LBRACKET,
-                ']': TokenType.RBRACKET,
-                '(': TokenType.LPAREN,
-                ')': TokenType.RPAREN,
-                ':': TokenType.COLON,
-                ';': TokenType.SEMICOLON,
-                ',': TokenType.COMMA,
-                '.': TokenType.DOT,
-                '$': TokenType.DOLLAR,
-                '@': TokenType.AT,
-            }
+            kind = m.lastgroup
+            next_pos = m.end()
             
-            if self.peek() in single_char_ops:
-                char = self.advance()
-                self.tokens.append(Token(single_char_ops[char], char, self.line, start_col))
-                continue
+            if kind == 'WS':
+                pass
+            elif kind == 'IDENTIFIER':
+                name = m.group()
+                entry = names.get(name)
+                if entry is None:
+                    name = intern(name)
+                    entry = names[name] = (identifier, name)
+                yield Token(entry[0], entry[1], line, pos - line_start + 1)
+            elif kind == 'OP':
+                token_type, op = operators[m.group()]
+                yield Token(token_type, op, line, pos - line_start + 1)
+            elif kind == 'NEWLINE':
+                yield Token(TokenType.NEWLINE, '\n', line, pos - line_start + 1)
+                line += 1
+                line_start = next_pos
+            elif kind == 'STRING':
+                column = pos - line_start + 1
+                value = source[pos + 1:next_pos - 1]
+                newlines = value.count('\n')
+                if newlines:
+                    # El token lleva la línea donde termina el literal
+                    line += newlines
+                    line_start = source.rfind('\n', pos, next_pos) + 1
+                if '\\' in value:
+                    value = _ESCAPE_RE.sub(_unescape, value)
+                yield Token(TokenType.STRING, value, line, column)
+            elif kind == 'NUMBER':
+                num_str = m.group()
+                value = float(num_str) if '.' in num_str else int(num_str)
+                yield Token(TokenType.NUMBER, value, line, pos - line_start + 1)
+            elif kind == 'COMMENT':
+                newlines = source.count('\n', pos, next_pos)
+                if newlines:
+                    line += newlines
+                    line_start = source.rfind('\n', pos, next_pos) + 1
+            elif kind == 'TEMPLATE_START':
+                yield Token(TokenType.TEMPLATE_START, '${', line, pos - line_start + 1)
+            elif kind == 'OPEN_STRING':
+                # Un escape colgante al final consume una columna más
+                trailing = len(source) - len(source.rstrip('\\'))
+                self._error_at_end("String no cerrado", line, line_start, trailing % 2)
+                # Recuperación: el literal abierto se come el resto del fuente
+                yield Token(TokenType.EOF, None, self.line, self.column)
+                return
+            else:  # OPEN_COMMENT
+                self._error_at_end("Comentario multilinea no cerrado", line, line_start)
+                yield Token(TokenType.EOF, None, self.line, self.column)
+                return
             
-            # Unknown character
-            self.error(f"Carácter inesperado: '{self.peek()}'")
+            pos = next_pos
         
-        self.tokens.append(Token(TokenType.EOF, None, self.line, self.column))
-        return self.tokens
+        self.pos, self.line, self.column = pos, line, pos - line_start + 1
+        yield Token(TokenType.EOF, None, self.line, self.column)
 
 
 # ============================================================
 # AST NODES
 # ============================================================
-@dataclass
+# Nodos inmutables con __slots__: sin __dict__ por instancia, lo que reduce
+# la memoria de los ASTs retenidos en lote y acelera el acceso a atributos.
+@dataclass(slots=True, frozen=True)
 class ASTNode:
     pass
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Program(ASTNode):
     body: List[ASTNode]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SetupDecl(ASTNode):
     name: str
     body: List[ASTNode]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MetaBlock(ASTNode):
     fields: Dict[str, Any]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RequiresBlock(ASTNode):
     deps: List[str]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ImportStmt(ASTNode):
     items: List[str]
     source: str
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VarDecl(ASTNode):
     kind: str  # 'let' or 'const'
     name: str
     value: ASTNode
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FunctionDecl(ASTNode):
     name: str
     params: List[str]
     body: List[ASTNode]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class HookDecl(ASTNode):
     hook_type: str
     body: List[ASTNode]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PageDecl(ASTNode):
     page_type: str
     config: Dict[str, Any]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PagesBlock(ASTNode):
     pages: List[PageDecl]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BinaryOp(ASTNode):
     left: ASTNode
     op: str
     right: ASTNode
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UnaryOp(ASTNode):
     op: str
     operand: ASTNode
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Literal(ASTNode):
     value: Any
     literal_type: str
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Identifier(ASTNode):
     name: str
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MemberAccess(ASTNode):
     obj: ASTNode
     member: str
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ArrayLiteral(ASTNode):
     elements: List[ASTNode]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ObjectLiteral(ASTNode):
     pairs: Dict[str, ASTNode]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CallExpr(ASTNode):
     func: ASTNode
     args: List[ASTNode]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class IfStmt(ASTNode):
     condition: ASTNode
     then_body: List[ASTNode]
     else_body: Optional[List[ASTNode]]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ForStmt(ASTNode):
     var: str
     iterable: ASTNode
     body: List[ASTNode]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WhileStmt(ASTNode):
     condition: ASTNode
     body: List[ASTNode]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ReturnStmt(ASTNode):
     value: Optional[ASTNode]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TemplateExpr(ASTNode):
     parts: List[Union[str, ASTNode]]
 
@@ -470,33 +492,110 @@ class TemplateExpr(ASTNode):
 # ============================================================
 # PARSER
 # ============================================================
+class _Panic(SyntaxError):
+    """Error ya anotado en diagnostics: desenrolla hasta el punto de recuperación"""
+
+
 class LeviParser:
-    """Parser de LeviScript a AST"""
-    
-    def __init__(self, tokens: List[Token]):
-        self.tokens = tokens
-        self.pos = 0
+    """Parser de LeviScript a AST
+    
+    Acepta una lista de tokens o cualquier iterable (p. ej. LeviLexer.iter_tokens())
+    y sólo retiene una ventana de lookahead, no el fuente tokenizado completo.
+    
+    Con recover=True funciona en modo pánico: cada error se anota en
+    diagnostics, se descartan tokens hasta el siguiente NEWLINE o RBRACE y el
+    análisis continúa con la sentencia siguiente.
+    """
+    
+    def __init__(self, tokens: Iterable[Token], recover: bool = False):
+        self._stream = iter(tokens)
+        self._lookahead: deque = deque()
+        self._eof: Optional[Token] = None
+        self._last: Optional[Token] = None
+        self.pos = 0  # tokens consumidos
+        self.recover = recover
+        self.diagnostics: List[Diagnostic] = []
+        self._depth = 0  # llaves abiertas; sólo se lleva la cuenta al recuperar
+        if recover:
+            self.advance = self._advance_counting
         
     def error(self, msg: str):
         token = self.current()
+        if self.recover:
+            self.diagnostics.append(Diagnostic(token.line, token.column, msg))
+            raise _Panic(f"[{token.line}:{token.column}] {msg}")
         raise SyntaxError(f"[{token.line}:{token.column}] {msg}")
     
+    def synchronize(self, depth: int):
+        """Descarta tokens hasta un NEWLINE o RBRACE del nivel de llaves depth
+        
+        Los bloques abiertos por la sentencia rota se saltan enteros; un RBRACE
+        que cierra el bloque actual no se consume para que lo cierre su dueño.
+        """
+        while True:
+            token_type = self.current().type
+            if token_type == TokenType.EOF:
+                return
+            if self._depth == depth and token_type in (TokenType.NEWLINE, TokenType.RBRACE):
+                return
+            self.advance()
+            if token_type == TokenType.RBRACE and self._depth == depth:
+                return
+    
+    def parse_statement_recovering(self) -> Optional[ASTNode]:
+        """parse_statement; en modo recuperación un error descarta sólo esa sentencia"""
+        if not self.recover:
+            return self.parse_statement()
+        start, depth = self.pos, self._depth
+        try:
+            return self.parse_statement()
+        except _Panic:
+            self.synchronize(depth)
+            if self.pos == start and not self.match(TokenType.EOF):
+                # Sin avance (p. ej. un '}' suelto): se descarta el token culpable
+                self.advance()
+            return None
+    
+    def _fill(self, count: int):
+        """Asegura count tokens en el buffer; agotado el stream se repite el último"""
+        lookahead = self._lookahead
+        while len(lookahead) < count:
+            if self._eof is None:
+                token = next(self._stream, None)
+                if token is not None:
+                    self._last = token
+                    if token.type == TokenType.EOF:
+                        self._eof = token
+                    lookahead.append(token)
+                    continue
+                self._eof = self._last or Token(TokenType.EOF, None, 1, 1)
+            lookahead.append(self._eof)
+    
     def current(self) -> Token:
-        if self.pos >= len(self.tokens):
-            return self.tokens[-1]
-        return self.tokens[self.pos]
+        if not self._lookahead:
+            self._fill(1)
+        return self._lookahead[0]
     
     def peek(self, offset: int = 0) -> Token:
-        pos = self.pos + offset
-        if pos >= len(self.tokens):
-            return self.tokens[-1]
-        return self.tokens[pos]
+        self._fill(offset + 1)
+        return self._lookahead[offset]
     
     def advance(self) -> Token:
         token = self.current()
+        self._lookahead.popleft()
         self.pos += 1
         return token
     
+    def _advance_counting(self) -> Token:
+        """advance que además sigue la profundidad de llaves (modo recuperación)"""
+        token = LeviParser.advance(self)
+        # '${' se cierra con RBRACE: cuenta como una llave más
+        if token.type in (TokenType.LBRACE, TokenType.TEMPLATE_START):
+            self._depth += 1
+        elif token.type == TokenType.RBRACE:
+            self._depth -= 1
+        return token
+    
     def expect(self, token_type: TokenType, msg: str = None) -> Token:
         if self.current().type != token_type:
             self.error(msg or f"Se esperaba {token_type.name}, se encontró {self.current().type.name}")
@@ -513,7 +612,7 @@ class LeviParser:
         body = []
         self.skip_newlines()
         while not self.match(TokenType.EOF):
-            stmt = self.parse_statement()
+            stmt = self.parse_statement_recovering()
             if stmt:
                 body.append(stmt)
             self.skip_newlines()
@@ -558,8 +657,8 @@ class LeviParser:
         self.skip_newlines()
         
         body = []
-        while not self.match(TokenType.RBRACE):
-            stmt = self.parse_statement()
+        while not self.match(TokenType.RBRACE, TokenType.EOF):
+            stmt = self.parse_statement_recovering()
             if stmt:
                 body.append(stmt)
             self.skip_newlines()
@@ -716,7 +815,7 @@ class LeviParser:
         body = []
         self.skip_newlines()
         while not self.match(TokenType.RBRACE, TokenType.EOF):
-            stmt = self.parse_statement()
+            stmt = self.parse_statement_recovering()
             if stmt:
                 body.append(stmt)
             self.skip_newlines()
@@ -951,45 +1050,382 @@ class LeviParser:
 # ============================================================
 # AST SERIALIZER (for .lsx files)
 # ============================================================
+# Formato .lsx v3:
+#   'LSX' + versión (1 byte)
+#   índice: varint N, luego N x (varint id de sección + varint longitud)
+#   secciones, una tras otra en el orden del índice. Cada sección es
+#   autocontenida: tabla de strings (varint N + N x (varint longitud + UTF-8))
+#   seguida de un valor codificado con tags varint. Los nodos escriben sus
+#   campos en el orden de declaración y los strings como índice de la tabla.
+#   La sección 'program' guarda el esqueleto del árbol; los bloques de nivel
+#   superior (meta, requires, pages, hooks, functions) viven en su propia
+#   sección y el esqueleto los referencia con _T_REF.
+_T_NONE, _T_FALSE, _T_TRUE, _T_INT, _T_FLOAT, _T_STR, _T_LIST, _T_DICT, _T_REF = range(9)
+_NODE_TAG_BASE = 16
+_DOUBLE = struct.Struct('<d')
+
+
+def _write_varint(buf: bytearray, value: int):
+    while value > 0x7F:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def _read_varint(data, pos: int):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
 class ASTSerializer:
-    """Serializa AST a formato binario .lsx"""
-    
-    MAGIC = b'LSX\x01'  # Version 1.0
+    """Serializa AST a formato binario .lsx (sin pickle)"""
+    
+    MAGIC = b'LSX'
+    VERSION = 3
+    
+    # El índice de cada clase es su tag en disco: sólo se añaden al final
+    NODE_TYPES = (
+        Program, SetupDecl, MetaBlock, RequiresBlock, ImportStmt, VarDecl,
+        FunctionDecl, HookDecl, PageDecl, PagesBlock, BinaryOp, UnaryOp,
+        Literal, Identifier, MemberAccess, ArrayLiteral, ObjectLiteral,
+        CallExpr, IfStmt, ForStmt, WhileStmt, ReturnStmt, TemplateExpr,
+    )
+    _NODE_TAGS = {cls: _NODE_TAG_BASE + i for i, cls in enumerate(NODE_TYPES)}
+    _NODE_FIELDS = {cls: tuple(f.name for f in fields(cls)) for cls in NODE_TYPES}
+    
+    # El índice de cada sección es su id en disco
+    SECTIONS = ('program', 'meta', 'requires', 'pages', 'hooks', 'functions')
+    _SECTION_OF = {
+        MetaBlock: 'meta',
+        RequiresBlock: 'requires',
+        PagesBlock: 'pages',
+        HookDecl: 'hooks',
+        FunctionDecl: 'functions',
+    }
     
     @staticmethod
     def serialize(ast: Program) -> bytes:
         """Convierte AST a bytes para archivo .lsx"""
-        # Use pickle for now, can be replaced with custom binary format
-        data = pickle.dumps(ast, protocol=pickle.HIGHEST_PROTOCOL)
+        sections = {name: [] for name in ASTSerializer.SECTIONS[1:]}
+        refs: Dict[int, tuple] = {}
+        
+        def collect(body: List[ASTNode]):
+            for node in body:
+                name = ASTSerializer._SECTION_OF.get(type(node))
+                if name is not None:
+                    refs[id(node)] = (ASTSerializer.SECTIONS.index(name), len(sections[name]))
+                    sections[name].append(node)
+                elif type(node) is SetupDecl:
+                    collect(node.body)
+        
+        collect(ast.body)
+        
+        payloads = [(0, ASTSerializer._encode(ast, refs))]
+        for name, nodes in sections.items():
+            if nodes:
+                payloads.append((ASTSerializer.SECTIONS.index(name), ASTSerializer._encode(nodes, {})))
         
-        # Add header with magic and length
-        header = ASTSerializer.MAGIC + struct.pack('<I', len(data))
-        return header + data
+        out = bytearray(ASTSerializer.MAGIC)
+        out.append(ASTSerializer.VERSION)
+        _write_varint(out, len(payloads))
+        for section_id, payload in payloads:
+            _write_varint(out, section_id)
+            _write_varint(out, len(payload))
+        for _, payload in payloads:
+            out.extend(payload)
+        return bytes(out)
     
     @staticmethod
     def deserialize(data: bytes) -> Program:
         """Convierte bytes de .lsx a AST"""
-        if not data.startswith(ASTSerializer.MAGIC):
+        return LSXReader(data).program()
+    
+    @staticmethod
+    def _encode(root, refs: Dict[int, tuple]) -> bytes:
+        """Codifica una sección: tabla de strings + valor raíz"""
+        strings: Dict[str, int] = {}
+        body = bytearray()
+        append = body.append
+        node_tags = ASTSerializer._NODE_TAGS
+        node_fields = ASTSerializer._NODE_FIELDS
+        
+        def intern(text: str):
+            index = strings.get(text)
+            if index is None:
+                index = strings[text] = len(strings)
+            _write_varint(body, index)
+        
+        def encode(value):
+            if value is None:
+                append(_T_NONE)
+            elif value is True:
+                append(_T_TRUE)
+            elif value is False:
+                append(_T_FALSE)
+            elif isinstance(value, str):
+                append(_T_STR)
+                intern(value)
+            elif isinstance(value, int):
+                append(_T_INT)
+                _write_varint(body, value << 1 if value >= 0 else (~value << 1) | 1)
+            elif isinstance(value, float):
+                append(_T_FLOAT)
+                body.extend(_DOUBLE.pack(value))
+            elif isinstance(value, list):
+                append(_T_LIST)
+                _write_varint(body, len(value))
+                for item in value:
+                    encode(item)
+            elif isinstance(value, dict):
+                append(_T_DICT)
+                _write_varint(body, len(value))
+                for key, item in value.items():
+                    intern(key)
+                    encode(item)
+            elif id(value) in refs:
+                section_id, index = refs[id(value)]
+                append(_T_REF)
+                _write_varint(body, section_id)
+                _write_varint(body, index)
+            else:
+                cls = type(value)
+                tag = node_tags.get(cls)
+                if tag is None:
+                    raise TypeError(f"Valor no serializable en .lsx: {cls.__name__}")
+                _write_varint(body, tag)
+                for name in node_fields[cls]:
+                    encode(getattr(value, name))
+        
+        encode(root)
+        
+        out = bytearray()
+        _write_varint(out, len(strings))
+        for text in strings:
+            raw = text.encode('utf-8')
+            _write_varint(out, len(raw))
+            out.extend(raw)
+        out.extend(body)
+        return bytes(out)
+    
+    @staticmethod
+    def _decode(data, pos: int, end: int, resolve):
+        """Decodifica la sección data[pos:end]; resolve(id, índice) atiende las _T_REF"""
+        count, pos = _read_varint(data, pos)
+        strings = []
+        for _ in range(count):
+            length, pos = _read_varint(data, pos)
+            strings.append(str(data[pos:pos + length], 'utf-8'))
+            pos += length
+        
+        # (clase, nº de campos) indexado por tag; la mayoría de varints caben en un byte
+        node_specs = [(cls, range(len(ASTSerializer._NODE_FIELDS[cls])))
+                      for cls in ASTSerializer.NODE_TYPES]
+        
+        def decode():
+            nonlocal pos
+            tag = data[pos]
+            pos += 1
+            if tag >= 0x80:
+                tag, pos = _read_varint(data, pos - 1)
+            if tag >= _NODE_TAG_BASE:
+                cls, arity = node_specs[tag - _NODE_TAG_BASE]
+                return cls(*[decode() for _ in arity])
+            if tag == _T_STR:
+                index = data[pos]
+                pos += 1
+                if index >= 0x80:
+                    index, pos = _read_varint(data, pos - 1)
+                return strings[index]
+            if tag == _T_LIST:
+                length = data[pos]
+                pos += 1
+                if length >= 0x80:
+                    length, pos = _read_varint(data, pos - 1)
+                return [decode() for _ in range(length)]
+            if tag == _T_DICT:
+                length, pos = _read_varint(data, pos)
+                result = {}
+                for _ in range(length):
+                    index, pos = _read_varint(data, pos)
+                    result[strings[index]] = decode()
+                return result
+            if tag == _T_NONE:
+                return None
+            if tag == _T_TRUE:
+                return True
+            if tag == _T_FALSE:
+                return False
+            if tag == _T_INT:
+                raw, pos = _read_varint(data, pos)
+                return raw >> 1 if not raw & 1 else ~(raw >> 1)
+            if tag == _T_FLOAT:
+                value = _DOUBLE.unpack_from(data, pos)[0]
+                pos += 8
+                return value
+            if tag == _T_REF:
+                section_id, pos = _read_varint(data, pos)
+                index, pos = _read_varint(data, pos)
+                return resolve(section_id, index)
+            raise ValueError(f"Tag desconocido: {tag}")
+        
+        value = decode()
+        if pos != end:
+            raise ValueError("la sección no termina donde indica el índice")
+        return value
+
+
+# ============================================================
+# LAZY .LSX READER
+# ============================================================
+class LSXReader:
+    """Lector perezoso de .lsx: sólo lee el índice al abrir y decodifica
+    cada sección la primera vez que se pide.
+    
+    Uso:
+        with LSXReader.open('setup.lsx') as lsx:
+            meta = lsx.meta
+    """
+    
+    def __init__(self, data, _file=None):
+        self._data = data
+        self._file = _file
+        self._cache: Dict[str, Any] = {}
+        self._index: Dict[str, tuple] = {}
+        
+        if len(data) < 4 or data[:3] != ASTSerializer.MAGIC:
+            self.close()
             raise ValueError("Archivo .lsx inválido o corrupto")
+        version = data[3]
+        if version != ASTSerializer.VERSION:
+            self.close()
+            raise ValueError(f"Versión de .lsx no soportada: {version} "
+                             f"(se esperaba {ASTSerializer.VERSION}), vuelve a precompilar")
         
-        # Skip magic (4 bytes) and read length (4 bytes)
-        length = struct.unpack('<I', data[4:8])[0]
-        payload = data[8:8+length]
+        try:
+            count, pos = _read_varint(data, 4)
+            entries = []
+            for _ in range(count):
+                section_id, pos = _read_varint(data, pos)
+                length, pos = _read_varint(data, pos)
+                entries.append((ASTSerializer.SECTIONS[section_id], length))
+        except IndexError:
+            self.close()
+            raise ValueError("Archivo .lsx inválido o corrupto: índice truncado") from None
         
-        return pickle.loads(payload)
+        for name, length in entries:
+            self._index[name] = (pos, pos + length)
+            pos += length
+        if pos > len(data) or 'program' not in self._index:
+            self.close()
+            raise ValueError("Archivo .lsx inválido o corrupto: índice fuera de rango")
+    
+    @classmethod
+    def open(cls, path: str) -> 'LSXReader':
+        """Abre un .lsx mapeado en memoria (mmap de sólo lectura)"""
+        handle = open(path, 'rb')
+        try:
+            data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            handle.close()
+            raise ValueError("Archivo .lsx inválido o corrupto: archivo vacío") from None
+        return cls(data, _file=handle)
+    
+    def close(self):
+        if self._file is not None:
+            self._data.close()
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def section(self, name: str):
+        """Devuelve la sección decodificada (lista de nodos; Program para 'program')"""
+        if name in self._cache:
+            return self._cache[name]
+        if name not in ASTSerializer.SECTIONS:
+            raise KeyError(f"Sección .lsx desconocida: {name}")
+        if name not in self._index:
+            value = []
+        else:
+            start, end = self._index[name]
+            try:
+                value = ASTSerializer._decode(self._data, start, end, self._resolve)
+            except (IndexError, KeyError, UnicodeDecodeError, struct.error, TypeError, RecursionError) as e:
+                raise ValueError(f"Archivo .lsx inválido o corrupto en sección '{name}': {e}") from None
+        self._cache[name] = value
+        return value
+    
+    def _resolve(self, section_id: int, index: int) -> ASTNode:
+        return self.section(ASTSerializer.SECTIONS[section_id])[index]
+    
+    def program(self) -> Program:
+        ast = self.section('program')
+        if not isinstance(ast, Program):
+            raise ValueError("Archivo .lsx inválido o corrupto: la raíz no es un Program")
+        return ast
+    
+    @property
+    def meta(self) -> List[MetaBlock]:
+        return self.section('meta')
+    
+    @property
+    def requires(self) -> List[RequiresBlock]:
+        return self.section('requires')
+    
+    @property
+    def pages(self) -> List[PagesBlock]:
+        return self.section('pages')
+    
+    @property
+    def hooks(self) -> List[HookDecl]:
+        return self.section('hooks')
+    
+    @property
+    def functions(self) -> List[FunctionDecl]:
+        return self.section('functions')
 
 
 # ============================================================
 # PYTHON CODE GENERATOR
 # ============================================================
 class PythonGenerator:
-    """Genera código Python a partir del AST"""
+    """Genera código Python a partir del AST
+    
+    Los visit_* emiten líneas de sentencia en un búfer io.StringIO y los
+    expr_* devuelven el texto de una expresión. El visitante de cada tipo de
+    nodo se resuelve una sola vez por clase de generador y queda en caché.
+    """
+    
+    INDENT = '    '
+    OP_MAP = {'&&': 'and', '||': 'or', '!': 'not'}
+    _indents = ['    ' * level for level in range(16)]
     
     def __init__(self):
         self.indent = 0
-        self.output = []
+        self.output = io.StringIO()
         self.imports = set()
+        self._stmt_dispatch, self._expr_dispatch = self._dispatch_tables()
         
+    @classmethod
+    def _dispatch_tables(cls):
+        """Tablas tipo de nodo -> visitante, propias de cada subclase"""
+        tables = cls.__dict__.get('_tables')
+        if tables is None:
+            tables = ({}, {})
+            cls._tables = tables
+        return tables
+    
     def generate(self, ast: Program) -> str:
         """Genera código Python completo"""
         # Add standard imports
@@ -1005,21 +1441,50 @@ class PythonGenerator:
             self.visit(node)
         
         # Combine imports and body
-        result = '\n'.join(sorted(self.imports)) + '\n\n'
-        result += '\n'.join(self.output)
-        return result
+        return '\n'.join(sorted(self.imports)) + '\n\n' + self.output.getvalue()[:-1]
     
     def emit(self, code: str):
-        self.output.append('    ' * self.indent + code)
+        indent = self.indent
+        if indent >= len(self._indents):
+            PythonGenerator._indents = [self.INDENT * level for level in range(indent * 2)]
+        self.output.write(self._indents[indent] + code + '\n')
+    
+    def emit_block(self, body: List[ASTNode]):
+        """Emite un bloque indentado; si queda vacío escribe 'pass'"""
+        self.indent += 1
+        start = self.output.tell()
+        for stmt in body:
+            self.visit(stmt)
+        if self.output.tell() == start:
+            self.emit('pass')
+        self.indent -= 1
     
     def visit(self, node: ASTNode):
-        method = f'visit_{type(node).__name__}'
-        visitor = getattr(self, method, self.generic_visit)
-        return visitor(node)
+        visitor = self._stmt_dispatch.get(type(node))
+        if visitor is None:
+            visitor = getattr(type(self), f'visit_{type(node).__name__}', None)
+            if visitor is None:
+                # Cualquier expresión puede usarse como sentencia
+                if getattr(type(self), f'expr_{type(node).__name__}', None) is None:
+                    return self.generic_visit(node)
+                visitor = type(self).visit_expression
+            self._stmt_dispatch[type(node)] = visitor
+        return visitor(self, node)
     
     def generic_visit(self, node: ASTNode):
         raise NotImplementedError(f"No hay visitor para {type(node).__name__}")
     
+    def expr_to_python(self, expr: ASTNode) -> str:
+        visitor = self._expr_dispatch.get(type(expr))
+        if visitor is None:
+            visitor = getattr(type(self), f'expr_{type(expr).__name__}', None)
+            if visitor is None:
+                raise NotImplementedError(f"No hay expresión Python para {type(expr).__name__}")
+            self._expr_dispatch[type(expr)] = visitor
+        return visitor(self, expr)
+    
+    # ---------------- Sentencias ----------------
+    
     def visit_Program(self, node: Program):
         for stmt in node.body:
             self.visit(stmt)
@@ -1049,6 +1514,10 @@ class PythonGenerator:
         deps = [f'"{dep}"' for dep in node.deps]
         self.emit(f'self.requires = [{', '.join(deps)}]')
     
+    def visit_ImportStmt(self, node: ImportStmt):
+        module = node.source.replace('/', '.').strip('.')
+        self.imports.add(f'from {module} import {', '.join(node.items)}')
+    
     def visit_PagesBlock(self, node: PagesBlock):
         self.emit('self.pages = []')
         for page in node.pages:
@@ -1060,64 +1529,1124 @@ class PythonGenerator:
     
     def visit_HookDecl(self, node: HookDecl):
         self.emit(f'def {node.hook_type}(self):')
-        self.indent += 1
-        for stmt in node.body:
-            self.visit(stmt)
-        self.indent -= 1
+        self.emit_block(node.body)
     
     def visit_VarDecl(self, node: VarDecl):
         value = self.expr_to_python(node.value)
         self.emit(f'self.{node.name} = {value}')
     
     def visit_FunctionDecl(self, node: FunctionDecl):
-        params = ', '.join(node.params)
-        self.emit(f'def {node.name}(self, {params}):')
-        self.indent += 1
-        for stmt in node.body:
-            self.visit(stmt)
-        self.indent -= 1
+        params = ', '.join(['self', *node.params])
+        self.emit(f'def {node.name}({params}):')
+        self.emit_block(node.body)
+    
+    def visit_IfStmt(self, node: IfStmt, keyword: str = 'if'):
+        self.emit(f'{keyword} {self.expr_to_python(node.condition)}:')
+        self.emit_block(node.then_body)
+        else_body = node.else_body
+        if else_body is None:
+            return
+        if len(else_body) == 1 and type(else_body[0]) is IfStmt:
+            self.visit_IfStmt(else_body[0], 'elif')
+        else:
+            self.emit('else:')
+            self.emit_block(else_body)
     
-    def visit_CallExpr(self, node: CallExpr):
-        func_name = self.expr_to_python(node.func)
-        args = ', '.join([self.expr_to_python(arg) for arg in node.args])
-        self.emit(f'{func_name}({args})')
+    def visit_ForStmt(self, node: ForStmt):
+        self.emit(f'for {node.var} in {self.expr_to_python(node.iterable)}:')
+        self.emit_block(node.body)
     
-    def visit_Identifier(self, node: Identifier):
-        return node.name
+    def visit_WhileStmt(self, node: WhileStmt):
+        self.emit(f'while {self.expr_to_python(node.condition)}:')
+        self.emit_block(node.body)
+    
+    def visit_ReturnStmt(self, node: ReturnStmt):
+        if node.value is None:
+            self.emit('return')
+        else:
+            self.emit(f'return {self.expr_to_python(node.value)}')
     
-    def visit_Literal(self, node: Literal):
-        if node.literal_type == 'string':
-            return repr(node.value)
-        elif node.literal_type == 'bool':
-            return 'True' if node.value else 'False'
-        elif node.literal_type == 'null':
+    def visit_expression(self, node: ASTNode):
+        self.emit(self.expr_to_python(node))
+    
+    # ---------------- Expresiones ----------------
+    
+    def expr_NoneType(self, expr: None) -> str:
+        return 'None'
+    
+    def expr_Literal(self, expr: Literal) -> str:
+        if expr.literal_type == 'string':
+            return repr(expr.value)
+        elif expr.literal_type == 'bool':
+            return 'True' if expr.value else 'False'
+        elif expr.literal_type == 'null':
             return 'None'
-        return str(node.value)
+        if expr.value < 0:
+            # Sólo aparecen tras el plegado de constantes: -1.real no es -(1).real
+            return f'({expr.value})'
+        return str(expr.value)
+    
+    def expr_Identifier(self, expr: Identifier) -> str:
+        return expr.name
+    
+    def expr_ArrayLiteral(self, expr: ArrayLiteral) -> str:
+        elements = [self.expr_to_python(e) for e in expr.elements]
+        return f'[{', '.join(elements)}]'
+    
+    def expr_ObjectLiteral(self, expr: ObjectLiteral) -> str:
+        pairs = [f'{repr(k)}: {self.expr_to_python(v)}' for k, v in expr.pairs.items()]
+        return f'{{{', '.join(pairs)}}}'
+    
+    def expr_BinaryOp(self, expr: BinaryOp) -> str:
+        left = self.expr_to_python(expr.left)
+        right = self.expr_to_python(expr.right)
+        py_op = self.OP_MAP.get(expr.op, expr.op)
+        return f'({left} {py_op} {right})'
+    
+    def expr_UnaryOp(self, expr: UnaryOp) -> str:
+        operand = self.expr_to_python(expr.operand)
+        if expr.op == '!':
+            return f'(not {operand})'
+        return f'({expr.op}{operand})'
+    
+    def expr_MemberAccess(self, expr: MemberAccess) -> str:
+        return f'{self.expr_to_python(expr.obj)}.{expr.member}'
+    
+    def expr_CallExpr(self, expr: CallExpr) -> str:
+        args = ', '.join([self.expr_to_python(arg) for arg in expr.args])
+        return f'{self.expr_to_python(expr.func)}({args})'
+    
+    def expr_TemplateExpr(self, expr: TemplateExpr) -> str:
+        parts = [repr(part) if isinstance(part, str) else f'str({self.expr_to_python(part)})'
+                 for part in expr.parts]
+        if not parts:
+            return "''"
+        return f'({' + '.join(parts)})'
+
+
+# ============================================================
+# PYTHON AST GENERATOR (BYTECODE)
+# ============================================================
+# ClassDef/FunctionDef exigen type_params a partir de Python 3.12
+_TYPE_PARAMS = {'type_params': []} if sys.version_info >= (3, 12) else {}
+# El AST de LeviScript no guarda posiciones: todo el módulo cuelga de la línea 1.
+# Fijarla al construir evita el recorrido completo de ast.fix_missing_locations
+_LOC = {'lineno': 1, 'col_offset': 0, 'end_lineno': 1, 'end_col_offset': 0}
+
+
+class PythonASTGenerator(PythonGenerator):
+    """Genera un módulo del paquete ast de Python directamente desde el AST
     
-    def expr_to_python(self, expr: ASTNode) -> str:
-        if isinstance(expr, Literal):
-            if expr.literal_type == 'string':
-                return repr(expr.value)
-            elif expr.literal_type == 'bool':
-                return 'True' if expr.value else 'False'
-            elif expr.literal_type == 'null':
-                return 'None'
-            return str(expr.value)
-        elif isinstance(expr, Identifier):
-            return expr.name
-        elif isinstance(expr, ArrayLiteral):
-            elements = [self.expr_to_python(e) for e in expr.elements]
-            return f'[{', '.join(elements)}]'
-        elif isinstance(expr, ObjectLiteral):
-            pairs = [f'{repr(k)}: {self.expr_to_python(v)}' for k, v in expr.pairs.items()]
-            return f'{{{', '.join(pairs)}}}'
-        elif isinstance(expr, BinaryOp):
-            left = self.expr_to_python(expr.left)
-            right = self.expr_to_python(expr.right)
-            op_map = {'&&': 'and', '||': 'or', '!': 'not'}
-            py_op = op_map.get(expr.op, expr.op)
-            return f'({left} {py_op} {right})'
-        return str(expr)
+    Produce el mismo programa que PythonGenerator pero sin pasar por texto:
+    el resultado va directo a compile() y de ahí a un objeto de código. Los
+    visit_* devuelven listas de sentencias y los expr_* nodos de expresión.
+    """
+    
+    BIN_OPS = {'+': py_ast.Add, '-': py_ast.Sub, '*': py_ast.Mult, '/': py_ast.Div, '%': py_ast.Mod}
+    BOOL_OPS = {'&&': py_ast.And, '||': py_ast.Or}
+    CMP_OPS = {'==': py_ast.Eq, '!=': py_ast.NotEq, '<': py_ast.Lt, '>': py_ast.Gt,
+               '<=': py_ast.LtE, '>=': py_ast.GtE}
+    
+    def generate(self, ast: Program, entry_point: Optional[str] = None) -> py_ast.Module:
+        """Genera el módulo completo; entry_point añade el bloque __main__"""
+        self.imports.add('import sys')
+        self.imports.add('from pathlib import Path')
+        self.imports.add('from PyQt6.QtWidgets import *')
+        self.imports.add('from PyQt6.QtCore import *')
+        self.imports.add('from PyQt6.QtGui import *')
+        self.imports.add('from leviathan_ui import *')
+    
+        body = []
+        for node in ast.body:
+            body.extend(self.visit(node))
+    
+        if entry_point:
+            # if __name__ == '__main__': installer = <entry_point>(); installer.run()
+            is_main = py_ast.Compare(self._load('__name__'), [py_ast.Eq()],
+                                     [py_ast.Constant('__main__', **_LOC)], **_LOC)
+            create = py_ast.Call(self._load(entry_point), [], [], **_LOC)
+            run = py_ast.Call(self._attr(self._load('installer'), 'run'), [], [], **_LOC)
+            body.append(py_ast.If(is_main, [py_ast.Assign([self._store('installer')], create, **_LOC),
+                                            py_ast.Expr(run, **_LOC)], [], **_LOC))
+    
+        imports = [self._import_node(line) for line in sorted(self.imports)]
+        return py_ast.Module(body=imports + body, type_ignores=[])
+    
+    @staticmethod
+    def _import_node(line: str) -> py_ast.stmt:
+        """'import x' / 'from x import a, b' -> nodo Import / ImportFrom"""
+        if line.startswith('import '):
+            return py_ast.Import([py_ast.alias(line[7:], **_LOC)], **_LOC)
+        module, names = line[5:].split(' import ', 1)
+        return py_ast.ImportFrom(module, [py_ast.alias(name.strip(), **_LOC) for name in names.split(',')], 0, **_LOC)
+    
+    @staticmethod
+    def _load(name: str) -> py_ast.Name:
+        return py_ast.Name(name, py_ast.Load(), **_LOC)
+    
+    @staticmethod
+    def _store(name: str) -> py_ast.Name:
+        return py_ast.Name(name, py_ast.Store(), **_LOC)
+    
+    @staticmethod
+    def _attr(value: py_ast.expr, attr: str, ctx=None) -> py_ast.Attribute:
+        return py_ast.Attribute(value, attr, ctx or py_ast.Load(), **_LOC)
+    
+    def _self_assign(self, attr: str, value: py_ast.expr) -> py_ast.Assign:
+        return py_ast.Assign([self._attr(self._load('self'), attr, py_ast.Store())], value, **_LOC)
+    
+    def _method(self, name: str, params: List[str], body: List[py_ast.stmt]) -> py_ast.FunctionDef:
+        args = py_ast.arguments(posonlyargs=[], args=[py_ast.arg(p, **_LOC) for p in ['self', *params]],
+                                kwonlyargs=[], kw_defaults=[], defaults=[])
+        return py_ast.FunctionDef(name=name, args=args, body=body, decorator_list=[], **_TYPE_PARAMS, **_LOC)
+    
+    def emit_block(self, body: List[ASTNode]) -> List[py_ast.stmt]:
+        """Sentencias de un bloque; si queda vacío devuelve [Pass]"""
+        stmts = []
+        for stmt in body:
+            stmts.extend(self.visit(stmt))
+        return stmts or [py_ast.Pass(**_LOC)]
+    
+    # ---------------- Sentencias ----------------
+    
+    def visit_Program(self, node: Program):
+        return self.emit_block(node.body)
+    
+    def visit_SetupDecl(self, node: SetupDecl):
+        init = self._method('__init__', [], [
+            self._self_assign('app', py_ast.Call(self._load('QApplication'),
+                                                 [self._attr(self._load('sys'), 'argv')], [], **_LOC)),
+            self._self_assign('window', py_ast.Constant(None, **_LOC)),
+        ])
+        body = [init]
+        for stmt in node.body:
+            body.extend(self.visit(stmt))
+        return [py_ast.ClassDef(name=f'{node.name}Installer', bases=[], keywords=[], body=body,
+                                decorator_list=[], **_TYPE_PARAMS, **_LOC)]
+    
+    def visit_MetaBlock(self, node: MetaBlock):
+        return [self._self_assign(f'meta_{key}', self.expr_to_python(value))
+                for key, value in node.fields.items()]
+    
+    def visit_RequiresBlock(self, node: RequiresBlock):
+        deps = [py_ast.Constant(dep, **_LOC) for dep in node.deps]
+        return [self._self_assign('requires', py_ast.List(deps, py_ast.Load(), **_LOC))]
+    
+    def visit_ImportStmt(self, node: ImportStmt):
+        super().visit_ImportStmt(node)
+        return []
+    
+    def visit_PagesBlock(self, node: PagesBlock):
+        stmts = [self._self_assign('pages', py_ast.List([], py_ast.Load(), **_LOC))]
+        for page in node.pages:
+            stmts.extend(self.visit(page))
+        return stmts
+    
+    def visit_PageDecl(self, node: PageDecl):
+        config = [py_ast.keyword(k, self.expr_to_python(v), **_LOC) for k, v in node.config.items()]
+        page = py_ast.Call(self._load(node.page_type), [], config, **_LOC)
+        append = self._attr(self._attr(self._load('self'), 'pages'), 'append')
+        return [py_ast.Expr(py_ast.Call(append, [page], [], **_LOC), **_LOC)]
+    
+    def visit_HookDecl(self, node: HookDecl):
+        return [self._method(node.hook_type, [], self.emit_block(node.body))]
+    
+    def visit_VarDecl(self, node: VarDecl):
+        return [self._self_assign(node.name, self.expr_to_python(node.value))]
+    
+    def visit_FunctionDecl(self, node: FunctionDecl):
+        return [self._method(node.name, list(node.params), self.emit_block(node.body))]
+    
+    def visit_IfStmt(self, node: IfStmt, keyword: str = 'if'):
+        else_body = node.else_body
+        if else_body is None:
+            orelse = []
+        elif len(else_body) == 1 and type(else_body[0]) is IfStmt:
+            orelse = self.visit_IfStmt(else_body[0], 'elif')
+        else:
+            orelse = self.emit_block(else_body)
+        return [py_ast.If(self.expr_to_python(node.condition), self.emit_block(node.then_body), orelse, **_LOC)]
+    
+    def visit_ForStmt(self, node: ForStmt):
+        return [py_ast.For(self._store(node.var), self.expr_to_python(node.iterable),
+                           self.emit_block(node.body), [], **_LOC)]
+    
+    def visit_WhileStmt(self, node: WhileStmt):
+        return [py_ast.While(self.expr_to_python(node.condition), self.emit_block(node.body), [], **_LOC)]
+    
+    def visit_ReturnStmt(self, node: ReturnStmt):
+        value = None if node.value is None else self.expr_to_python(node.value)
+        return [py_ast.Return(value, **_LOC)]
+    
+    def visit_expression(self, node: ASTNode):
+        return [py_ast.Expr(self.expr_to_python(node), **_LOC)]
+    
+    # ---------------- Expresiones ----------------
+    
+    def expr_NoneType(self, expr: None):
+        return py_ast.Constant(None, **_LOC)
+    
+    def expr_Literal(self, expr: Literal):
+        return py_ast.Constant(expr.value, **_LOC)
+    
+    def expr_Identifier(self, expr: Identifier):
+        return self._load(expr.name)
+    
+    def expr_ArrayLiteral(self, expr: ArrayLiteral):
+        return py_ast.List([self.expr_to_python(e) for e in expr.elements], py_ast.Load(), **_LOC)
+    
+    def expr_ObjectLiteral(self, expr: ObjectLiteral):
+        keys = [py_ast.Constant(k, **_LOC) for k in expr.pairs]
+        return py_ast.Dict(keys, [self.expr_to_python(v) for v in expr.pairs.values()], **_LOC)
+    
+    def expr_BinaryOp(self, expr: BinaryOp):
+        left = self.expr_to_python(expr.left)
+        right = self.expr_to_python(expr.right)
+        op = expr.op
+        if op in self.BIN_OPS:
+            return py_ast.BinOp(left, self.BIN_OPS[op](), right, **_LOC)
+        if op in self.CMP_OPS:
+            return py_ast.Compare(left, [self.CMP_OPS[op]()], [right], **_LOC)
+        if op in self.BOOL_OPS:
+            return py_ast.BoolOp(self.BOOL_OPS[op](), [left, right], **_LOC)
+        raise NotImplementedError(f"Operador sin equivalente Python: {op}")
+    
+    def expr_UnaryOp(self, expr: UnaryOp):
+        operand = self.expr_to_python(expr.operand)
+        return py_ast.UnaryOp(py_ast.Not() if expr.op == '!' else py_ast.USub(), operand, **_LOC)
+    
+    def expr_MemberAccess(self, expr: MemberAccess):
+        return self._attr(self.expr_to_python(expr.obj), expr.member)
+    
+    def expr_CallExpr(self, expr: CallExpr):
+        args = [self.expr_to_python(arg) for arg in expr.args]
+        return py_ast.Call(self.expr_to_python(expr.func), args, [], **_LOC)
+    
+    def expr_TemplateExpr(self, expr: TemplateExpr):
+        parts = [py_ast.Constant(part, **_LOC) if isinstance(part, str)
+                 else py_ast.Call(self._load('str'), [self.expr_to_python(part)], [], **_LOC)
+                 for part in expr.parts]
+        if not parts:
+            return py_ast.Constant('', **_LOC)
+        result = parts[0]
+        for part in parts[1:]:
+            result = py_ast.BinOp(result, py_ast.Add(), part, **_LOC)
+        return result
+
+
+# ============================================================
+# INTERPRETER
+# ============================================================
+class LeviRuntimeError(RuntimeError):
+    """Error al ejecutar LeviScript en LeviInterpreter"""
+
+
+class _ReturnSignal(Exception):
+    """Desenrolla los bloques hasta la función que ejecuta el return"""
+    
+    __slots__ = ('value',)
+    
+    def __init__(self, value):
+        self.value = value
+
+
+class _Recorder:
+    """Objeto simulado: cada llamada queda registrada en el contexto"""
+    
+    __slots__ = ('_context', '_name')
+    
+    def __init__(self, context: 'MockInstaller', name: str):
+        self._context = context
+        self._name = name
+    
+    def __getattr__(self, attr: str) -> '_Recorder':
+        return _Recorder(self._context, f'{self._name}.{attr}')
+    
+    def __call__(self, *args):
+        self._context.calls.append((self._name, args))
+        return None
+    
+    def __repr__(self):
+        return f'<mock {self._name}>'
+
+
+class MockInstaller:
+    """Contexto de instalador simulado para 'run test'
+    
+    Los nombres libres de los hooks (funciones de leviathan_ui, Qt, ...) se
+    resuelven aquí: los builtins seguros se usan tal cual, log/print van a
+    self.logs y cualquier otro nombre devuelve un objeto que registra sus
+    llamadas en self.calls. names permite sustituir cualquiera de ellos.
+    """
+    
+    BUILTINS = {
+        'str': str, 'int': int, 'float': float, 'bool': bool, 'len': len,
+        'range': range, 'min': min, 'max': max, 'abs': abs, 'round': round,
+        'list': list, 'dict': dict, 'sorted': sorted,
+    }
+    
+    def __init__(self, **names):
+        self.names = names
+        self.meta: Dict[str, Any] = {}
+        self.requires: List[str] = []
+        self.pages: List[tuple] = []
+        self.logs: List[str] = []
+        self.calls: List[tuple] = []
+        self.hooks_run: List[str] = []
+    
+    def log(self, *args):
+        self.logs.append(' '.join(str(arg) for arg in args))
+    
+    def lookup(self, name: str):
+        if name in self.names:
+            return self.names[name]
+        if name in self.BUILTINS:
+            return self.BUILTINS[name]
+        if name in ('log', 'print'):
+            return self.log
+        return _Recorder(self, name)
+
+
+class LeviFunction:
+    """Función o hook compilado: cuerpo de closures sobre un marco de slots
+    
+    El último elemento del marco es el marco de la función que la contiene
+    (parent), por el que se leen las variables capturadas; None en las
+    funciones globales y los hooks.
+    """
+    
+    __slots__ = ('name', 'nparams', 'nslots', 'body', 'tail', 'parent')
+    
+    def __init__(self, name: str, nparams: int):
+        self.name = name
+        self.nparams = nparams
+        self.nslots = nparams
+        self.body = ()
+        self.tail = None
+        self.parent = None
+    
+    def bind(self, parent: list) -> 'LeviFunction':
+        """Copia de la función anidada ligada al marco de la llamada que la declara"""
+        bound = LeviFunction(self.name, self.nparams)
+        bound.nslots, bound.body, bound.tail = self.nslots, self.body, self.tail
+        bound.parent = parent
+        return bound
+    
+    def __call__(self, *args):
+        frame = list(args[:self.nparams])
+        frame.extend([None] * (self.nslots - len(frame)))
+        frame.append(self.parent)
+        try:
+            for stmt in self.body:
+                stmt(frame)
+        except _ReturnSignal as signal:
+            return signal.value
+        # Un return final se evalúa sin lanzar _ReturnSignal
+        return None if self.tail is None else self.tail(frame)
+    
+    def __repr__(self):
+        return f'<LeviFunction {self.name}/{self.nparams}>'
+
+
+class LeviInterpreter:
+    """Evaluador en proceso del AST de LeviScript
+    
+    Cada nodo se traduce una sola vez a una closure Python(frame) -> valor,
+    con los nombres ya resueltos a un slot: local (índice en el marco de la
+    función), global (índice en self.globals) o libre (valor del contexto).
+    La ejecución no vuelve a mirar tipos de nodo ni diccionarios de nombres.
+    Los operadores siguen la semántica del Python generado por PythonGenerator,
+    así que un hook que falla aquí también fallaría en el instalador real.
+    Las funciones anidadas leen las variables de las que las contienen a
+    través de la cadena de marcos; max_steps limita las iteraciones de bucle
+    de toda la ejecución para que un while sin salida no cuelgue 'run test'.
+    """
+    
+    MAX_STEPS = 1_000_000
+    HOOK_ORDER = ('beforeDisplay', 'afterDisplay', 'beforeInstall', 'onInstall', 'afterInstall')
+    BIN_OPS = {
+        '+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv,
+        '%': operator.mod, '==': operator.eq, '!=': operator.ne, '<': operator.lt,
+        '>': operator.gt, '<=': operator.le, '>=': operator.ge,
+    }
+    
+    def __init__(self, ast: Program, context: Optional[MockInstaller] = None, max_steps: int = MAX_STEPS):
+        self.ast = ast
+        self.context = context or MockInstaller()
+        self.max_steps = max_steps
+        self.globals: List[Any] = []
+        self.hooks: Dict[str, LeviFunction] = {}
+        self._global_slots: Dict[str, int] = {}
+        self._locals: Optional[Dict[str, int]] = None
+        # Ámbitos locales de las funciones que contienen a la actual, de fuera a dentro
+        self._enclosing: List[Dict[str, int]] = []
+        # Iteraciones restantes; una lista para que las closures la compartan
+        self._budget = [max_steps]
+        self._stmt_dispatch, self._expr_dispatch = self._dispatch_tables()
+        # Primero los nombres globales, para que funciones y hooks puedan
+        # referirse a declaraciones posteriores
+        self._declare_globals(ast.body)
+        self._setup = self.compile_block(ast.body)
+    
+    @classmethod
+    def _dispatch_tables(cls):
+        """Tablas tipo de nodo -> compilador, propias de cada subclase"""
+        tables = cls.__dict__.get('_tables')
+        if tables is None:
+            tables = ({}, {})
+            cls._tables = tables
+        return tables
+    
+    def _declare_globals(self, body: List[ASTNode]):
+        for node in body:
+            if type(node) is SetupDecl:
+                self._declare_globals(node.body)
+            elif type(node) in (VarDecl, FunctionDecl):
+                self._global_slot(node.name)
+    
+    def _global_slot(self, name: str) -> int:
+        slot = self._global_slots.get(name)
+        if slot is None:
+            slot = self._global_slots[name] = len(self.globals)
+            self.globals.append(None)
+        return slot
+    
+    # ---------------- API ----------------
+    
+    def run(self, hooks: Iterable[str] = HOOK_ORDER) -> MockInstaller:
+        """Ejecuta el cuerpo del setup y después los hooks indicados, en orden"""
+        self._budget[0] = self.max_steps
+        try:
+            for stmt in self._setup:
+                stmt(None)
+        except LeviRuntimeError:
+            raise
+        except Exception as e:
+            raise LeviRuntimeError(f"setup: {type(e).__name__}: {e}") from e
+        for name in hooks:
+            if name in self.hooks:
+                self.run_hook(name)
+        return self.context
+    
+    def run_hook(self, name: str):
+        """Ejecuta un hook; si falla se lanza onError (si existe) y LeviRuntimeError"""
+        try:
+            result = self.hooks[name]()
+        except Exception as e:
+            if name != 'onError' and 'onError' in self.hooks:
+                self.run_hook('onError')
+            if isinstance(e, LeviRuntimeError):
+                raise
+            raise LeviRuntimeError(f"{name}: {type(e).__name__}: {e}") from e
+        self.context.hooks_run.append(name)
+        return result
+    
+    def function(self, name: str) -> LeviFunction:
+        """Función global declarada con 'function name(...)'"""
+        value = self.globals[self._global_slots[name]]
+        if not isinstance(value, LeviFunction):
+            raise LeviRuntimeError(f"'{name}' no es una función")
+        return value
+    
+    # ---------------- Compilación a closures ----------------
+    
+    def compile_block(self, body: List[ASTNode]) -> tuple:
+        stmts = (self.compile_stmt(node) for node in body)
+        return tuple(stmt for stmt in stmts if stmt is not None)
+    
+    def compile_stmt(self, node: ASTNode):
+        compiler = self._stmt_dispatch.get(type(node))
+        if compiler is None:
+            compiler = getattr(type(self), f'stmt_{type(node).__name__}', None)
+            if compiler is None:
+                # Cualquier expresión puede usarse como sentencia
+                compiler = type(self).compile_expr
+            self._stmt_dispatch[type(node)] = compiler
+        return compiler(self, node)
+    
+    def compile_expr(self, expr: ASTNode):
+        compiler = self._expr_dispatch.get(type(expr))
+        if compiler is None:
+            compiler = getattr(type(self), f'expr_{type(expr).__name__}', None)
+            if compiler is None:
+                raise NotImplementedError(f"El intérprete no soporta {type(expr).__name__}")
+            self._expr_dispatch[type(expr)] = compiler
+        return compiler(self, expr)
+    
+    def _run_block(self, body: List[ASTNode]):
+        stmts = self.compile_block(body)
+        
+        def run_block(frame):
+            for stmt in stmts:
+                stmt(frame)
+        return run_block
+    
+    def _store(self, name: str):
+        """Closure (frame, value) que asigna name en el ámbito actual"""
+        if self._locals is None:
+            slot = self._global_slot(name)
+            values = self.globals
+        else:
+            slot = self._locals.setdefault(name, len(self._locals))
+            values = None
+        
+        if values is None:
+            def store(frame, value):
+                frame[slot] = value
+        else:
+            def store(frame, value):
+                values[slot] = value
+        return store
+    
+    def _declare_locals(self, body: List[ASTNode]):
+        """Reserva los slots de las declaraciones del cuerpo (sin entrar en funciones
+        anidadas), para que una función anidada vea las que aparecen después de ella"""
+        for node in body:
+            kind = type(node)
+            if kind in (VarDecl, FunctionDecl):
+                self._locals.setdefault(node.name, len(self._locals))
+            elif kind is ForStmt:
+                self._locals.setdefault(node.var, len(self._locals))
+                self._declare_locals(node.body)
+            elif kind is WhileStmt:
+                self._declare_locals(node.body)
+            elif kind is IfStmt:
+                self._declare_locals(node.then_body)
+                self._declare_locals(node.else_body or [])
+    
+    def _step_check(self):
+        """Closure que gasta una iteración del presupuesto y falla al agotarlo"""
+        budget = self._budget
+        max_steps = self.max_steps
+        
+        def step():
+            budget[0] -= 1
+            if budget[0] < 0:
+                raise LeviRuntimeError(f"se superó el límite de {max_steps:,} iteraciones "
+                                       f"(¿bucle infinito?)")
+        return step
+    
+    def _compile_function(self, name: str, params: List[str], body: List[ASTNode]) -> LeviFunction:
+        function = LeviFunction(name, len(params))
+        outer = self._locals
+        if outer is not None:
+            self._enclosing.append(outer)
+        self._locals = {param: index for index, param in enumerate(params)}
+        self._declare_locals(body)
+        try:
+            if body and type(body[-1]) is ReturnStmt:
+                function.body = self.compile_block(body[:-1])
+                value = body[-1].value
+                function.tail = self.compile_expr(value) if value is not None else None
+            else:
+                function.body = self.compile_block(body)
+            function.nslots = len(self._locals)
+        finally:
+            self._locals = outer
+            if outer is not None:
+                self._enclosing.pop()
+        return function
+    
+    # ---------------- Sentencias ----------------
+    
+    def stmt_SetupDecl(self, node: SetupDecl):
+        return self._run_block(node.body)
+    
+    def stmt_MetaBlock(self, node: MetaBlock):
+        meta = self.context.meta
+        values = [(key, self.compile_expr(value)) for key, value in node.fields.items()]
+        
+        def run_meta(frame):
+            for key, value in values:
+                meta[key] = value(frame)
+        return run_meta
+    
+    def stmt_RequiresBlock(self, node: RequiresBlock):
+        requires = self.context.requires
+        deps = list(node.deps)
+        return lambda frame: requires.extend(deps)
+    
+    def stmt_ImportStmt(self, node: ImportStmt):
+        # Los nombres importados son libres: los resuelve el contexto
+        return None
+    
+    def stmt_PagesBlock(self, node: PagesBlock):
+        pages = self.context.pages
+        compiled = [(page.page_type, [(key, self.compile_expr(value)) for key, value in page.config.items()])
+                    for page in node.pages]
+        
+        def run_pages(frame):
+            for page_type, config in compiled:
+                pages.append((page_type, {key: value(frame) for key, value in config}))
+        return run_pages
+    
+    def stmt_HookDecl(self, node: HookDecl):
+        self.hooks[node.hook_type] = self._compile_function(node.hook_type, [], node.body)
+        return None
+    
+    def stmt_FunctionDecl(self, node: FunctionDecl):
+        function = self._compile_function(node.name, node.params, node.body)
+        if self._locals is None:
+            # Global: disponible desde la compilación, antes incluso de run()
+            self.globals[self._global_slot(node.name)] = function
+            return None
+        store = self._store(node.name)
+        # Anidada: cada llamada de la función que la contiene liga su propio marco
+        return lambda frame: store(frame, function.bind(frame))
+    
+    def stmt_VarDecl(self, node: VarDecl):
+        value = self.compile_expr(node.value)
+        store = self._store(node.name)
+        return lambda frame: store(frame, value(frame))
+    
+    def stmt_IfStmt(self, node: IfStmt):
+        condition = self.compile_expr(node.condition)
+        then_body = self._run_block(node.then_body)
+        if node.else_body is None:
+            def run_if(frame):
+                if condition(frame):
+                    then_body(frame)
+        else:
+            else_body = self._run_block(node.else_body)
+            
+            def run_if(frame):
+                if condition(frame):
+                    then_body(frame)
+                else:
+                    else_body(frame)
+        return run_if
+    
+    def stmt_ForStmt(self, node: ForStmt):
+        iterable = self.compile_expr(node.iterable)
+        store = self._store(node.var)
+        body = self._run_block(node.body)
+        step = self._step_check()
+        
+        def run_for(frame):
+            for item in iterable(frame):
+                step()
+                store(frame, item)
+                body(frame)
+        return run_for
+    
+    def stmt_WhileStmt(self, node: WhileStmt):
+        condition = self.compile_expr(node.condition)
+        body = self._run_block(node.body)
+        step = self._step_check()
+        
+        def run_while(frame):
+            while condition(frame):
+                step()
+                body(frame)
+        return run_while
+    
+    def stmt_ReturnStmt(self, node: ReturnStmt):
+        value = self.compile_expr(node.value) if node.value is not None else None
+        
+        def run_return(frame):
+            raise _ReturnSignal(None if value is None else value(frame))
+        return run_return
+    
+    # ---------------- Expresiones ----------------
+    
+    def expr_NoneType(self, expr: None):
+        return lambda frame: None
+    
+    def expr_Literal(self, expr: Literal):
+        value = expr.value
+        return lambda frame: value
+    
+    def expr_Identifier(self, expr: Identifier):
+        name = expr.name
+        if self._locals is not None and name in self._locals:
+            slot = self._locals[name]
+            return lambda frame: frame[slot]
+        for depth, scope in enumerate(reversed(self._enclosing), 1):
+            if name in scope:
+                return self._captured(scope[name], depth)
+        if name in self._global_slots:
+            slot = self._global_slots[name]
+            values = self.globals
+            return lambda frame: values[slot]
+        value = self.context.lookup(name)
+        return lambda frame: value
+    
+    @staticmethod
+    def _captured(slot: int, depth: int):
+        """Lectura de una variable de la función que contiene a esta, depth niveles más arriba"""
+        if depth == 1:
+            return lambda frame: frame[-1][slot]
+        
+        def load(frame):
+            for _ in range(depth):
+                frame = frame[-1]
+            return frame[slot]
+        return load
+    
+    def expr_ArrayLiteral(self, expr: ArrayLiteral):
+        elements = [self.compile_expr(e) for e in expr.elements]
+        return lambda frame: [element(frame) for element in elements]
+    
+    def expr_ObjectLiteral(self, expr: ObjectLiteral):
+        pairs = [(key, self.compile_expr(value)) for key, value in expr.pairs.items()]
+        return lambda frame: {key: value(frame) for key, value in pairs}
+    
+    def expr_BinaryOp(self, expr: BinaryOp):
+        left = self.compile_expr(expr.left)
+        right = self.compile_expr(expr.right)
+        if expr.op == '&&':
+            return lambda frame: left(frame) and right(frame)
+        if expr.op == '||':
+            return lambda frame: left(frame) or right(frame)
+        op = self.BIN_OPS.get(expr.op)
+        if op is None:
+            raise NotImplementedError(f"Operador no soportado: {expr.op}")
+        if type(expr.right) is Literal:
+            # Operando constante: se evita una llamada por evaluación
+            constant = expr.right.value
+            return lambda frame: op(left(frame), constant)
+        return lambda frame: op(left(frame), right(frame))
+    
+    def expr_UnaryOp(self, expr: UnaryOp):
+        operand = self.compile_expr(expr.operand)
+        if expr.op == '!':
+            return lambda frame: not operand(frame)
+        return lambda frame: -operand(frame)
+    
+    def expr_MemberAccess(self, expr: MemberAccess):
+        obj = self.compile_expr(expr.obj)
+        member = expr.member
+        return lambda frame: getattr(obj(frame), member)
+    
+    def expr_CallExpr(self, expr: CallExpr):
+        func = self.compile_expr(expr.func)
+        args = [self.compile_expr(arg) for arg in expr.args]
+        if not args:
+            return lambda frame: func(frame)()
+        if len(args) == 1:
+            arg, = args
+            return lambda frame: func(frame)(arg(frame))
+        if len(args) == 2:
+            first, second = args
+            return lambda frame: func(frame)(first(frame), second(frame))
+        return lambda frame: func(frame)(*[arg(frame) for arg in args])
+    
+    def expr_TemplateExpr(self, expr: TemplateExpr):
+        parts = [(part, None) if isinstance(part, str) else (None, self.compile_expr(part))
+                 for part in expr.parts]
+        return lambda frame: ''.join([text if value is None else str(value(frame)) for text, value in parts])
+
+
+# ============================================================
+# AST OPTIMIZER
+# ============================================================
+class ASTOptimizer:
+    """Pasadas de optimización sobre el AST antes de serializar a .lsx
+    
+    fold   - BinaryOp/UnaryOp con operandos literales -> Literal
+    inline - referencias a `const` globales de valor literal -> Literal
+    prune  - if/while con condición constante -> sólo la rama viva
+    hooks  - HookDecl con cuerpo vacío eliminados
+    
+    Todas conservan la semántica del Python generado: una operación que
+    fallaría al ejecutarse (p.ej. "a" + 1 o 1 / 0) no se pliega. self.stats
+    cuenta las transformaciones de cada pasada en la última llamada.
+    """
+    
+    VERSION = 1
+    PASSES = ('fold', 'inline', 'prune', 'hooks')
+    MAX_INT = 1 << 63
+    MAX_STRING_GROWTH = 64
+    
+    def __init__(self, passes: Iterable[str] = PASSES):
+        self.passes = frozenset(passes)
+        self.stats = dict.fromkeys(self.PASSES, 0)
+        self._consts: Dict[str, Literal] = {}
+        self._visible: Dict[str, Literal] = {}
+        self._shadowed = frozenset()
+        self._global = True
+        self._early_refs = set()
+        self._stmt_dispatch, self._expr_dispatch = self._dispatch_tables()
+    
+    @classmethod
+    def _dispatch_tables(cls):
+        """Tablas tipo de nodo -> pasada, propias de cada subclase"""
+        tables = cls.__dict__.get('_tables')
+        if tables is None:
+            tables = ({}, {})
+            cls._tables = tables
+        return tables
+    
+    def optimize(self, ast: Program) -> Program:
+        """Devuelve un Program optimizado; el original no se modifica"""
+        self.stats = dict.fromkeys(self.PASSES, 0)
+        self._consts, self._visible, self._early_refs = {}, {}, set()
+        self._shadowed, self._global = frozenset(), True
+        if 'inline' in self.passes:
+            self._collect_consts(ast.body)
+            self.stats = dict.fromkeys(self.PASSES, 0)
+        return Program(self.optimize_block(ast.body, top=True))
+    
+    # ---------------- Constantes ----------------
+    
+    def _collect_consts(self, body: List[ASTNode]):
+        """Valores de los const globales, en orden de declaración
+        
+        Sólo cuentan los declarados directamente en el programa o en el setup,
+        una única vez y sin otra ligadura global con el mismo nombre.
+        """
+        bindings: Dict[str, int] = {}
+        for node in self._global_stmts(body):
+            if type(node) in (VarDecl, FunctionDecl, ForStmt):
+                name = node.var if type(node) is ForStmt else node.name
+                bindings[name] = bindings.get(name, 0) + 1
+        for node in self._top_stmts(body):
+            if type(node) is VarDecl and node.kind == 'const' and bindings[node.name] == 1:
+                value = self.optimize_expr(node.value)
+                if type(value) is Literal:
+                    self._consts[node.name] = value
+                    self._visible[node.name] = value
+        self._visible = {}
+    
+    def _top_stmts(self, body: List[ASTNode]) -> Iterator[ASTNode]:
+        for node in body:
+            if type(node) is SetupDecl:
+                yield from self._top_stmts(node.body)
+            else:
+                yield node
+    
+    def _global_stmts(self, body: List[ASTNode]) -> Iterator[ASTNode]:
+        """Sentencias en ámbito global, incluidas las de if/for/while globales"""
+        for node in body:
+            yield node
+            if type(node) is SetupDecl:
+                yield from self._global_stmts(node.body)
+            elif type(node) is IfStmt:
+                yield from self._global_stmts(node.then_body)
+                yield from self._global_stmts(node.else_body or [])
+            elif type(node) in (ForStmt, WhileStmt):
+                yield from self._global_stmts(node.body)
+    
+    @staticmethod
+    def _bound_names(params: List[str], body: List[ASTNode]) -> set:
+        """Nombres locales de una función: parámetros, let/const, for y funciones anidadas"""
+        names = set(params)
+        stack = list(body)
+        while stack:
+            node = stack.pop()
+            if type(node) in (VarDecl, FunctionDecl):
+                names.add(node.name)
+            elif type(node) is ForStmt:
+                names.add(node.var)
+            # Las funciones anidadas tienen su propio ámbito
+            if type(node) is IfStmt:
+                stack.extend(node.then_body)
+                stack.extend(node.else_body or [])
+            elif type(node) in (ForStmt, WhileStmt):
+                stack.extend(node.body)
+        return names
+    
+    @classmethod
+    def _literal(cls, value) -> Optional[Literal]:
+        """Literal para un valor plegado, o None si no es representable"""
+        if value is None:
+            return Literal(None, 'null')
+        if isinstance(value, bool):
+            return Literal(value, 'bool')
+        if isinstance(value, str):
+            return Literal(value, 'string')
+        if isinstance(value, int):
+            return Literal(value, 'number') if -cls.MAX_INT < value < cls.MAX_INT else None
+        if isinstance(value, float):
+            return Literal(value, 'number') if math.isfinite(value) else None
+        return None
+    
+    # ---------------- Recorrido ----------------
+    
+    def optimize_block(self, body: List[ASTNode], top: bool = False) -> List[ASTNode]:
+        result = []
+        for node in body:
+            result.extend(self.optimize_stmt(node, top))
+        return result
+    
+    def optimize_stmt(self, node: ASTNode, top: bool = False) -> List[ASTNode]:
+        """Devuelve las sentencias que sustituyen a node (0, 1 o varias)"""
+        handler = self._stmt_dispatch.get(type(node))
+        if handler is None:
+            handler = getattr(type(self), f'stmt_{type(node).__name__}', None)
+            if handler is None:
+                # Cualquier expresión puede usarse como sentencia
+                handler = type(self).stmt_expression
+            self._stmt_dispatch[type(node)] = handler
+        return handler(self, node, top)
+    
+    def optimize_expr(self, expr: ASTNode) -> ASTNode:
+        handler = self._expr_dispatch.get(type(expr))
+        if handler is None:
+            handler = getattr(type(self), f'expr_{type(expr).__name__}', None)
+            if handler is None:
+                return expr
+            self._expr_dispatch[type(expr)] = handler
+        return handler(self, expr)
+    
+    def _function_body(self, params: List[str], body: List[ASTNode]) -> List[ASTNode]:
+        saved = self._shadowed, self._global, self._visible
+        # Los nombres ligados por las funciones que la contienen siguen ocultando los const
+        self._shadowed = self._shadowed | frozenset(self._bound_names(params, body))
+        # Las funciones se ejecutan después del setup: ven todos los const
+        self._global, self._visible = False, self._consts
+        try:
+            return self.optimize_block(body)
+        finally:
+            self._shadowed, self._global, self._visible = saved
+    
+    # ---------------- Sentencias ----------------
+    
+    def stmt_expression(self, node: ASTNode, top: bool):
+        return [self.optimize_expr(node)]
+    
+    def stmt_SetupDecl(self, node: SetupDecl, top: bool):
+        return [SetupDecl(node.name, self.optimize_block(node.body, top))]
+    
+    def stmt_MetaBlock(self, node: MetaBlock, top: bool):
+        return [MetaBlock({key: self.optimize_expr(value) for key, value in node.fields.items()})]
+    
+    def stmt_RequiresBlock(self, node: RequiresBlock, top: bool):
+        return [node]
+    
+    def stmt_ImportStmt(self, node: ImportStmt, top: bool):
+        return [node]
+    
+    def stmt_PagesBlock(self, node: PagesBlock, top: bool):
+        pages = [PageDecl(page.page_type, {key: self.optimize_expr(value) for key, value in page.config.items()})
+                 for page in node.pages]
+        return [PagesBlock(pages)]
+    
+    def stmt_VarDecl(self, node: VarDecl, top: bool):
+        value = self.optimize_expr(node.value)
+        if top and node.name in self._consts:
+            # A partir de aquí las referencias globales ya ven el valor
+            self._visible = {**self._visible, node.name: self._consts[node.name]}
+            if node.name not in self._early_refs:
+                return []
+        return [VarDecl(node.kind, node.name, value)]
+    
+    def stmt_FunctionDecl(self, node: FunctionDecl, top: bool):
+        return [FunctionDecl(node.name, node.params, self._function_body(node.params, node.body))]
+    
+    def stmt_HookDecl(self, node: HookDecl, top: bool):
+        body = self._function_body([], node.body)
+        if not body and 'hooks' in self.passes:
+            self.stats['hooks'] += 1
+            return []
+        return [HookDecl(node.hook_type, body)]
+    
+    def stmt_IfStmt(self, node: IfStmt, top: bool):
+        condition = self.optimize_expr(node.condition)
+        then_body = self.optimize_block(node.then_body)
+        else_body = self.optimize_block(node.else_body) if node.else_body is not None else None
+        if type(condition) is Literal and 'prune' in self.passes:
+            self.stats['prune'] += 1
+            return then_body if condition.value else (else_body or [])
+        return [IfStmt(condition, then_body, else_body)]
+    
+    def stmt_ForStmt(self, node: ForStmt, top: bool):
+        return [ForStmt(node.var, self.optimize_expr(node.iterable), self.optimize_block(node.body))]
+    
+    def stmt_WhileStmt(self, node: WhileStmt, top: bool):
+        condition = self.optimize_expr(node.condition)
+        if type(condition) is Literal and not condition.value and 'prune' in self.passes:
+            self.stats['prune'] += 1
+            return []
+        return [WhileStmt(condition, self.optimize_block(node.body))]
+    
+    def stmt_ReturnStmt(self, node: ReturnStmt, top: bool):
+        return [ReturnStmt(self.optimize_expr(node.value) if node.value is not None else None)]
+    
+    # ---------------- Expresiones ----------------
+    
+    def expr_Identifier(self, expr: Identifier):
+        name = expr.name
+        if name in self._consts and name not in self._shadowed and 'inline' in self.passes:
+            value = self._visible.get(name)
+            if value is not None:
+                self.stats['inline'] += 1
+                return value
+            if self._global:
+                # Uso antes de la declaración: el const no se puede eliminar
+                self._early_refs.add(name)
+        return expr
+    
+    def expr_ArrayLiteral(self, expr: ArrayLiteral):
+        return ArrayLiteral([self.optimize_expr(e) for e in expr.elements])
+    
+    def expr_ObjectLiteral(self, expr: ObjectLiteral):
+        return ObjectLiteral({key: self.optimize_expr(value) for key, value in expr.pairs.items()})
+    
+    def expr_BinaryOp(self, expr: BinaryOp):
+        left = self.optimize_expr(expr.left)
+        right = self.optimize_expr(expr.right)
+        if type(left) is Literal and 'fold' in self.passes:
+            op = expr.op
+            if op in ('&&', '||'):
+                # Como and/or de Python: el valor de la izquierda decide
+                self.stats['fold'] += 1
+                if bool(left.value) == (op == '||'):
+                    return left
+                return right
+            if type(right) is Literal and op in LeviInterpreter.BIN_OPS:
+                folded = self._fold(LeviInterpreter.BIN_OPS[op], left.value, right.value)
+                if folded is not None:
+                    self.stats['fold'] += 1
+                    return folded
+        return BinaryOp(left, expr.op, right)
+    
+    def _fold(self, op, *operands) -> Optional[Literal]:
+        try:
+            value = op(*operands)
+        except Exception:
+            return None
+        # "ab" * 10**6 no debe convertirse en un literal gigante dentro del .lsx
+        if isinstance(value, str):
+            budget = sum(len(v) for v in operands if isinstance(v, str))
+            if len(value) > max(budget, self.MAX_STRING_GROWTH):
+                return None
+        return self._literal(value)
+    
+    def expr_UnaryOp(self, expr: UnaryOp):
+        operand = self.optimize_expr(expr.operand)
+        if type(operand) is Literal and 'fold' in self.passes:
+            if expr.op == '!':
+                folded = self._literal(not operand.value)
+            else:
+                folded = self._fold(operator.neg, operand.value)
+            if folded is not None:
+                self.stats['fold'] += 1
+                return folded
+        return UnaryOp(expr.op, operand)
+    
+    def expr_MemberAccess(self, expr: MemberAccess):
+        return MemberAccess(self.optimize_expr(expr.obj), expr.member)
+    
+    def expr_CallExpr(self, expr: CallExpr):
+        return CallExpr(self.optimize_expr(expr.func), [self.optimize_expr(arg) for arg in expr.args])
+    
+    def expr_TemplateExpr(self, expr: TemplateExpr):
+        parts = []
+        for part in expr.parts:
+            if not isinstance(part, str):
+                part = self.optimize_expr(part)
+                if type(part) is Literal:
+                    # str(valor), igual que el Python generado
+                    part = str(part.value)
+            if isinstance(part, str) and parts and isinstance(parts[-1], str):
+                parts[-1] += part
+            else:
+                parts.append(part)
+        if len(parts) == 1 and isinstance(parts[0], str) and 'fold' in self.passes:
+            self.stats['fold'] += 1
+            return Literal(parts[0], 'string')
+        return TemplateExpr(parts)
 
 
 # ============================================================
@@ -1126,20 +2655,77 @@ class PythonGenerator:
 class LeviScript:
     """API principal para compilar LeviScript"""
     
+    VERSION = "1.0.5"
+    
     @staticmethod
     def compile(source: str) -> Program:
         """Compila código fuente a AST"""
         lexer = LeviLexer(source)
-        tokens = lexer.tokenize()
-        parser = LeviParser(tokens)
+        parser = LeviParser(lexer.iter_tokens())
         return parser.parse()
     
+    @staticmethod
+    def check(source: str) -> Tuple[Program, List[Diagnostic]]:
+        """Analiza todo el fuente sin parar en el primer error
+        
+        Devuelve el AST de las sentencias válidas y todos los errores de
+        lexer y parser ordenados por posición (lista vacía si no hay).
+        """
+        lexer = LeviLexer(source, recover=True)
+        parser = LeviParser(lexer.iter_tokens(), recover=True)
+        ast = parser.parse()
+        diagnostics = sorted(lexer.diagnostics + parser.diagnostics, key=lambda d: (d.line, d.column))
+        return ast, diagnostics
+    
+    @staticmethod
+    def optimize(ast: Program) -> Program:
+        """Aplica todas las pasadas de ASTOptimizer"""
+        return ASTOptimizer().optimize(ast)
+    
     @staticmethod
     def to_python(ast: Program) -> str:
         """Convierte AST a código Python"""
         generator = PythonGenerator()
         return generator.generate(ast)
     
+    @staticmethod
+    def to_code(ast: Program, filename: str = '<leviscript>', entry_point: Optional[str] = None) -> CodeType:
+        """Compila el AST a un objeto de código sin generar texto Python"""
+        # El árbol generado no tiene ciclos: las pasadas del GC durante la
+        # construcción de cientos de miles de nodos son puro coste
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            module = PythonASTGenerator().generate(ast, entry_point)
+            return compile(module, filename, 'exec')
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+    
+    @staticmethod
+    def dump_code(code: CodeType, source: bytes = b'') -> bytes:
+        """Serializa un objeto de código en formato .pyc (hash, sin verificar)
+    
+        El resultado se puede ejecutar directamente con `python archivo.pyc`
+        desde el mismo intérprete; source sólo alimenta el hash de cabecera.
+        """
+        flags = 0b01  # basado en hash, sin comprobar la fuente
+        header = importlib.util.MAGIC_NUMBER + struct.pack('<I', flags) + importlib.util.source_hash(source)
+        return header + marshal.dumps(code)
+    
+    @staticmethod
+    def load_code(data: bytes) -> CodeType:
+        """Carga un objeto de código de dump_code; ValueError si es de otro intérprete"""
+        if data[:4] != importlib.util.MAGIC_NUMBER:
+            raise ValueError("Bytecode generado por otra versión de Python")
+        try:
+            code = marshal.loads(data[16:])
+        except (EOFError, ValueError, TypeError) as e:
+            raise ValueError(f"Bytecode corrupto: {e}") from None
+        if not isinstance(code, CodeType):
+            raise ValueError("El bytecode no contiene un objeto de código")
+        return code
+    
     @staticmethod
     def save_lsx(ast: Program, path: str):
         """Guarda AST como archivo .lsx binario"""
@@ -1149,8 +2735,13 @@ class LeviScript:
     @staticmethod
     def load_lsx(path: str) -> Program:
         """Carga AST desde archivo .lsx"""
-        data = Path(path).read_bytes()
-        return ASTSerializer.deserialize(data)
+        with LSXReader.open(path) as reader:
+            return reader.program()
+    
+    @staticmethod
+    def open_lsx(path: str) -> LSXReader:
+        """Abre un .lsx para leer secciones (meta, requires, ...) bajo demanda"""
+        return LSXReader.open(path)
 
 
 # ============================================================
@@ -1159,13 +2750,17 @@ class LeviScript:
 def main():
     import argparse
     
-    parser = argparse.ArgumentParser(description='LeviScript Compiler v1.0.5')
+    parser = argparse.ArgumentParser(description=f'LeviScript Compiler v{LeviScript.VERSION}')
     subparsers = parser.add_subparsers(dest='command')
     
     # Parse command
     parse_parser = subparsers.add_parser('parse', help='Parse .ls file and show AST')
     parse_parser.add_argument('file', help='Source .ls file')
     
+    # Check command
+    check_parser = subparsers.add_parser('check', help='Report every syntax error in .ls files')
+    check_parser.add_argument('files', nargs='+', help='Source .ls files')
+    
     # Precompile command
     precompile_parser = subparsers.add_parser('precompile', help='Compile .ls to .lsx')
     precompile_parser.add_argument('file', help='Source .ls file')
@@ -1175,13 +2770,24 @@ def main():
     gen_parser = subparsers.add_parser('generate', help='Generate Python from .ls')
     gen_parser.add_argument('file', help='Source .ls or .lsx file')
     gen_parser.add_argument('-o', '--output', help='Output .py file')
-    
+    gen_parser.add_argument('--pyc', action='store_true', help='Write bytecode (.pyc) instead of source')
+
     args = parser.parse_args()
     
     if args.command == 'parse':
         source = Path(args.file).read_text(encoding='utf-8')
         ast = LeviScript.compile(source)
-        print(json.dumps(ast, indent=2, default=lambda o: o.__dict__))
+        print(json.dumps(asdict(ast), indent=2))
+    
+    elif args.command == 'check':
+        errors = 0
+        for file in args.files:
+            _, diagnostics = LeviScript.check(Path(file).read_text(encoding='utf-8'))
+            for diag in diagnostics:
+                print(f'{file}:{diag.line}:{diag.column}: {diag.message}')
+            errors += len(diagnostics)
+        print(f'{errors} error(s) in {len(args.files)} file(s)')
+        sys.exit(1 if errors else 0)
     
     elif args.command == 'precompile':
         source = Path(args.file).read_text(encoding='utf-8')
@@ -1197,9 +2803,14 @@ def main():
             source = Path(args.file).read_text(encoding='utf-8')
             ast = LeviScript.compile(source)
         
-        python_code = LeviScript.to_python(ast)
-        output = args.output or args.file.replace('.ls', '.py')
-        Path(output).write_text(python_code, encoding='utf-8')
+        if args.pyc:
+            output = args.output or args.file.replace('.lsx', '.ls').replace('.ls', '.pyc')
+            code = LeviScript.to_code(ast, Path(output).name)
+            Path(output).write_bytes(LeviScript.dump_code(code, Path(args.file).read_bytes()))
+        else:
+            python_code = LeviScript.to_python(ast)
+            output = args.output or args.file.replace('.ls', '.py')
+            Path(output).write_text(python_code, encoding='utf-8')
         print(f'✓ Generated: {output}')
     
     else:
@@ -14,17 +14,30 @@ Módulos disponibles:
 - TouchScreen: Soporte para pantallas táctiles
 """
 
-from .splash import InmersiveSplash
-from .title_bar import CustomTitleBar, get_accent_color, is_icon_file
-from .inmojiTrx import InmojiTrx, start_icon, set_app_emoji
-from .wipeWindow import WipeWindow
-from .lightsOff import LightsOff, illuminate_item
-from .dialogs import LeviathanDialog
-from .progress_bar import LeviathanProgressBar
-from .Script import LeviScript, LeviLexer, LeviParser
-from .debug import LeviathanDebugger, install_debugger
-from .touchscreen import TouchScreen
-from .fixLights import FixLights
+# Los submódulos se importan la primera vez que se pide uno de sus nombres
+# (PEP 562): `from leviathan_ui import CustomTitleBar` no carga Pillow ni el
+# resto de widgets, y la CLI no paga por Qt.
+_LAZY_IMPORTS = {
+    'InmersiveSplash': 'splash',
+    'CustomTitleBar': 'title_bar',
+    'get_accent_color': 'title_bar',
+    'is_icon_file': 'title_bar',
+    'InmojiTrx': 'inmojiTrx',
+    'start_icon': 'inmojiTrx',
+    'set_app_emoji': 'inmojiTrx',
+    'WipeWindow': 'wipeWindow',
+    'LightsOff': 'lightsOff',
+    'illuminate_item': 'lightsOff',
+    'LeviathanDialog': 'dialogs',
+    'LeviathanProgressBar': 'progress_bar',
+    'LeviScript': 'Script',
+    'LeviLexer': 'Script',
+    'LeviParser': 'Script',
+    'LeviathanDebugger': 'debug',
+    'install_debugger': 'debug',
+    'TouchScreen': 'touchscreen',
+    'FixLights': 'fixLights',
+}
 
 __version__ = "1.0.5"
 __author__ = "Jesus Quijada"
@@ -51,3 +64,18 @@ __all__ = [
     'TouchScreen',
     'FixLights',
 ]
+
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # __import__ relativo (level=1), como `from .modulo import nombre`; a
+    # diferencia de importlib.import_module queda registrado en -X importtime
+    value = getattr(__import__(module, globals(), None, [name], 1), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
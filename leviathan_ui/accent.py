@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+accent.py - Caché del color de acento del sistema
+El color se lee una vez (registro DWM en Windows) y se reutiliza en cada
+paintEvent. refresh() lo vuelve a leer y avisa a los suscriptores sólo si ha
+cambiado; lo llaman el evento ThemeChange de Qt y el sondeo de baja
+frecuencia de title_bar.watch_accent_color, que se arranca solo con el primer
+suscriptor (set_watcher). No depende de Qt: el proveedor se puede sustituir
+(set_provider) para usarlo fuera de Windows o en pruebas.
+"""
+
+import sys
+import threading
+from typing import Callable, List, Optional
+
+try:
+    import winreg
+except ImportError:
+    winreg = None
+
+
+DEFAULT_ACCENT = "#0078d4"
+
+AccentProvider = Callable[[], Optional[str]]
+
+
+def registry_accent() -> Optional[str]:
+    """Color de acento de Windows 10/11 (DWM ColorizationColor) o None"""
+    if sys.platform != "win32" or winreg is None:
+        return None
+    try:
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Microsoft\Windows\DWM") as key:
+            value, _ = winreg.QueryValueEx(key, "ColorizationColor")
+    except OSError:
+        return None
+    return "#" + "{:08x}".format(value)[2:8]
+
+
+class AccentCache:
+    """Color de acento cacheado para todo el proceso
+
+    Uso:
+        color = accent_cache.get()
+        unsubscribe = accent_cache.subscribe(lambda color: widget.update())
+        accent_cache.refresh()    # relee el proveedor; avisa sólo si cambia
+    """
+
+    def __init__(self, provider: AccentProvider = registry_accent, default: str = DEFAULT_ACCENT):
+        self.default = default
+        self._provider = provider
+        self._color: Optional[str] = None
+        # Último color que han visto los suscriptores (por get() o por aviso);
+        # refresh() compara con éste, no con la caché que invalidate() vacía
+        self._notified: Optional[str] = None
+        self._subscribers: List[Callable[[str], None]] = []
+        self._watcher: Optional[Callable[[], object]] = None
+        self._lock = threading.Lock()
+
+    def _read(self) -> str:
+        try:
+            color = self._provider()
+        except Exception:
+            color = None
+        return color or self.default
+
+    def get(self) -> str:
+        """Color actual; sólo consulta al proveedor la primera vez o tras invalidate()"""
+        color = self._color
+        if color is None:
+            with self._lock:
+                if self._color is None:
+                    self._color = self._read()
+                    if self._notified is None:
+                        self._notified = self._color
+                color = self._color
+        return color
+
+    def invalidate(self):
+        """Descarta el valor cacheado; el siguiente get() relee el proveedor sin avisar"""
+        with self._lock:
+            self._color = None
+
+    def refresh(self) -> bool:
+        """Relee el proveedor; avisa a los suscriptores y devuelve True si el color cambió"""
+        with self._lock:
+            previous = self._notified
+            self._color = self._notified = color = self._read()
+            subscribers = list(self._subscribers)
+        if previous is None or color == previous:
+            return False
+        for callback in subscribers:
+            callback(color)
+        return True
+
+    def set_provider(self, provider: AccentProvider) -> bool:
+        """Sustituye el origen del color (pruebas, Linux, temas propios) y refresca"""
+        with self._lock:
+            self._provider = provider
+        return self.refresh()
+
+    def set_watcher(self, start: Optional[Callable[[], object]]):
+        """start() pone en marcha la vigilancia de cambios (sondeo, eventos del sistema)
+
+        Se llama al registrarse el primer suscriptor, o ya mismo si hay alguno.
+        """
+        with self._lock:
+            self._watcher = start
+            pending = bool(self._subscribers)
+        if start is not None and pending:
+            start()
+
+    def subscribe(self, callback: Callable[[str], None]) -> Callable[[], None]:
+        """Registra callback(color) para los cambios; devuelve la función que lo da de baja"""
+        with self._lock:
+            first = not self._subscribers
+            self._subscribers.append(callback)
+            watcher = self._watcher
+        if first and watcher is not None:
+            watcher()
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+
+accent_cache = AccentCache()
@@ -14,14 +14,22 @@ import subprocess
 import tempfile
 import argparse
 import time
+import glob
+import dis
+import marshal
+import contextlib
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional, Callable
+from typing import List, Dict, Optional, Callable, Iterable, Iterator, Tuple
 
 # Añadir leviathan_ui al path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from leviathan_ui.Script import LeviScript
-from leviathan_ui.progress_bar import LeviathanProgressBar
+from leviathan_ui.Script import (LeviScript, LeviLexer, LeviParser, ASTSerializer, ASTOptimizer,
+                                 LeviInterpreter, LeviRuntimeError, Program)
+from leviathan_ui.compile_cache import CompileCache, CACHE_DIR
+from leviathan_ui.profiling import CompileProfile, count_nodes
 
 
 # ============================================================
@@ -208,6 +216,109 @@ except ImportError:
     HAS_PYINSTALLER = False
 
 
+def precompile_file(source: str, output: str, cache_dir: Optional[str] = None,
+                    profile: bool = False) -> Dict:
+    """Precompila un .ls a .lsx; se ejecuta también en procesos del modo lote
+    
+    Con profile=True el resultado incluye el perfil de la compilación
+    (CompileProfile.as_dict) en 'profile'.
+    """
+    result = {'source': source, 'output': output, 'size': None, 'cached': False, 'error': None}
+    stats = CompileProfile('precompile', source, trace_memory=profile)
+    with stats:
+        try:
+            with stats.phase('read'):
+                source_bytes = Path(source).read_bytes()
+            cache = CompileCache(Path(cache_dir)) if cache_dir else None
+            data = cache.get('lsx', source_bytes) if cache else None
+            result['cached'] = data is not None
+            if data is None:
+                # Mismos saltos de línea que read_text (modo texto universal)
+                text = source_bytes.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+                data = _compile_lsx(text, stats, count=profile)
+                if cache:
+                    cache.put('lsx', source_bytes, data)
+            with stats.phase('write'):
+                Path(output).parent.mkdir(parents=True, exist_ok=True)
+                Path(output).write_bytes(data)
+            result['size'] = len(data)
+            stats.count('source_bytes', len(source_bytes))
+            stats.count('bytes_written', len(data))
+            stats.count('cached', result['cached'])
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = stats.total
+    if profile:
+        result['profile'] = {**stats.as_dict(), 'error': result['error']}
+    return result
+
+
+def _counting(tokens: Iterable, counter: List[int]) -> Iterator:
+    """Deja pasar los tokens sumando cada uno en counter[0]"""
+    for token in tokens:
+        counter[0] += 1
+        yield token
+
+
+def _lex_parse(lexer: LeviLexer, profile: CompileProfile, separate: bool = False,
+               recover: bool = False) -> Tuple[Program, LeviParser]:
+    """Tokens -> AST; anota 'tokens' en profile
+    
+    Por defecto el parser consume lexer.iter_tokens() en streaming (memoria
+    acotada aunque el script sea enorme) y ambas fases se miden juntas como
+    'lex+parse'. Con separate=True (--profile) se materializa la lista de
+    tokens para medir 'lex' y 'parse' por separado.
+    """
+    if separate:
+        with profile.phase('lex'):
+            tokens = lexer.tokenize()
+        with profile.phase('parse'):
+            parser = LeviParser(tokens, recover=recover)
+            ast = parser.parse()
+        profile.count('tokens', len(tokens))
+        return ast, parser
+    counter = [0]
+    with profile.phase('lex+parse'):
+        parser = LeviParser(_counting(lexer.iter_tokens(), counter), recover=recover)
+        ast = parser.parse()
+    profile.count('tokens', counter[0])
+    return ast, parser
+
+
+def _compile_lsx(text: str, profile: CompileProfile, count: bool = False,
+                 optimizer: Optional[ASTOptimizer] = None) -> bytes:
+    """lex -> parse -> optimize -> serialize, cada fase medida en profile
+    
+    count=True (--profile) mide lexer y parser por separado y cuenta nodos;
+    si no, el lexer alimenta al parser en streaming.
+    """
+    ast, _ = _lex_parse(LeviLexer(text), profile, separate=count)
+    if count:
+        profile.count('nodes', count_nodes(ast))
+    optimizer = optimizer or ASTOptimizer()
+    with profile.phase('optimize'):
+        ast = optimizer.optimize(ast)
+    if count:
+        profile.count('nodes_optimized', count_nodes(ast))
+        for name, value in optimizer.stats.items():
+            profile.count(f'optimizer.{name}', value)
+    with profile.phase('serialize'):
+        return ASTSerializer.serialize(ast)
+
+
+def bytecode_launcher(code) -> tuple:
+    """Script de entrada para PyInstaller que ejecuta un objeto de código
+
+    El bytecode va incrustado tal cual; como PyInstaller no puede analizar sus
+    imports, se devuelven también los módulos a declarar como hidden imports.
+    """
+    modules = sorted({ins.argval for ins in dis.get_instructions(code) if ins.opname == 'IMPORT_NAME'})
+    script = ('# Generado por leviathan-ui: ejecuta el instalador precompilado\n'
+              'import marshal\n'
+              f'exec(marshal.loads({marshal.dumps(code)!r}), {{"__name__": "__main__"}})\n')
+    return script, modules
+
+
 class LeviathanCLI:
     """CLI principal de SetupDialogs"""
     
@@ -267,17 +378,28 @@ class LeviathanCLI:
                               help='Script a ejecutar')
         run_parser.add_argument('--file', type=str, default='setup.ls',
                                help='Archivo LeviScript a testear')
+        run_parser.add_argument('--profile', nargs='?', const='-', metavar='ARCHIVO',
+                               help='Perfil JSON del compilador (a stdout si no se da ARCHIVO)')
         
         # Alias: start = run test
         start_parser = subparsers.add_parser('start', help='[Alias de run test] Testear sintaxis')
         start_parser.add_argument('--file', type=str, default='setup.ls',
                                  help='Archivo LeviScript a testear')
+        start_parser.add_argument('--profile', nargs='?', const='-', metavar='ARCHIVO',
+                                 help='Perfil JSON del compilador (a stdout si no se da ARCHIVO)')
         
         # precompile (mantener)
         precompile_parser = subparsers.add_parser('precompile', help='Precompilar .ls a .lsx')
         precompile_parser.add_argument('file', type=str, nargs='?', default='setup.ls',
-                                      help='Archivo .ls a precompilar')
-        precompile_parser.add_argument('-o', '--output', type=str, help='Archivo .lsx de salida')
+                                      help='Archivo .ls, directorio o patrón glob a precompilar')
+        precompile_parser.add_argument('-o', '--output', type=str,
+                                      help='Archivo .lsx de salida (directorio en modo lote)')
+        precompile_parser.add_argument('-j', '--jobs', type=int, default=None,
+                                      help='Procesos para el modo lote (por defecto: núcleos de CPU)')
+        precompile_parser.add_argument('--no-cache', action='store_true',
+                                      help='Ignorar la caché de compilación')
+        precompile_parser.add_argument('--profile', nargs='?', const='-', metavar='ARCHIVO',
+                                      help='Perfil JSON del compilador (a stdout si no se da ARCHIVO)')
         
         # build = compile (tipo npm run build)
         build_parser = subparsers.add_parser('build', help='Compilar proyecto a .exe (npm-style)')
@@ -287,6 +409,8 @@ class LeviathanCLI:
         build_parser.add_argument('--onefile', action='store_true', help='Crear ejecutable único')
         build_parser.add_argument('--windowed', action='store_true', default=True,
                                help='Modo ventana (sin consola)')
+        build_parser.add_argument('--no-cache', action='store_true',
+                                 help='Ignorar la caché de compilación')
         
         # Alias: compile = build
         compile_parser = subparsers.add_parser('compile', help='[Alias de build] Compilar a .exe')
@@ -296,6 +420,8 @@ class LeviathanCLI:
         compile_parser.add_argument('--onefile', action='store_true', help='Crear ejecutable único')
         compile_parser.add_argument('--windowed', action='store_true', default=True,
                                    help='Modo ventana (sin consola)')
+        compile_parser.add_argument('--no-cache', action='store_true',
+                                   help='Ignorar la caché de compilación')
         
         # pack = packageStart (tipo npm pack)
         pack_parser = subparsers.add_parser('pack', help='Empaquetar proyecto (npm-style)')
@@ -315,6 +441,9 @@ class LeviathanCLI:
                                 choices=['all', 'init', 'build', 'pack', 'syntax'],
                                 help='Tema específico de ayuda')
         
+        # lsp = servidor de lenguaje para editores
+        subparsers.add_parser('lsp', help='Servidor de lenguaje LeviScript (diagnósticos por stdio)')
+        
         command_map = {
             'configure': self.cmd_configure,
             'activepath': self.cmd_activepath,
@@ -335,21 +464,22 @@ class LeviathanCLI:
             return 1
             
         command_map = {
-            'init': self.cmd_init,
-            'install': self.cmd_install,
-            'status': self.cmd_status,
-            'run': self.cmd_run,
-            'build': self.cmd_build,
-            'pack': self.cmd_pack,
+            'init': self.cmd_configure,
+            'install': self.cmd_activepath,
+            'status': self.cmd_show_status,
+            'run': self.cmd_start,
+            'build': self.cmd_compile,
+            'pack': self.cmd_package_start,
             'help': self.cmd_help,
+            'lsp': self.cmd_lsp,
             # Comandos legacy/alias
-            'configure': self.cmd_init,  # alias de init
-            'activepath': self.cmd_install,  # alias de install
-            'showStatus': self.cmd_status,  # alias de status
+            'configure': self.cmd_configure,  # alias de init
+            'activepath': self.cmd_activepath,  # alias de install
+            'showStatus': self.cmd_show_status,  # alias de status
             'start': self.cmd_start,  # alias de run test
             'precompile': self.cmd_precompile,
-            'compile': self.cmd_build,  # alias de build
-            'packageStart': self.cmd_pack,  # alias de pack
+            'compile': self.cmd_compile,  # alias de build
+            'packageStart': self.cmd_package_start,  # alias de pack
         }
         
         return command_map[args.command](args)
@@ -590,6 +720,7 @@ export default {{
         
         # Crear .gitignore
         gitignore = '''# Leviathan-UI Project
+.leviathan/
 *.lsx
 *.exe
 *.spec
@@ -766,8 +897,24 @@ python "{script_path.absolute()}" %*
         print(f"📦 Proyecto: {config.get('name', 'N/A')}")
         print(f"🔖 Versión: {config.get('version', 'N/A')}")
         print(f"🔧 Template: {config.get('template', 'N/A')}")
+
+        # Sólo se decodifica la sección requires del .lsx, no el árbol completo
+        lsx_file = Path('src/index.lsx')
+        if lsx_file.exists():
+            try:
+                with LeviScript.open_lsx(str(lsx_file)) as lsx:
+                    deps = [dep for block in lsx.requires for dep in block.deps]
+                print(f"🧩 Precompilado: {len(deps)} dependencia(s) declarada(s)")
+            except ValueError as e:
+                print(f"⚠️  {lsx_file}: {e}")
+        
+        cache_stats = CompileCache(CACHE_DIR).stats()
+        lookups = cache_stats['hits'] + cache_stats['misses']
+        if lookups:
+            print(f"⚡ Caché: {cache_stats['hits']}/{lookups} aciertos, "
+                  f"{cache_stats['entries']} entrada(s), {cache_stats['bytes']:,} bytes")
         print()
-        
+
         # Checklist de progreso del proyecto
         print("📋 Checklist de Desarrollo:")
         
@@ -817,16 +964,15 @@ python "{script_path.absolute()}" %*
         # Dependencias
         print("📦 Dependencias del Sistema:")
         deps = []
-        try:
-            import PyQt6
+        # find_spec sólo localiza el paquete: status no carga Qt ni Pillow
+        if importlib.util.find_spec('PyQt6') is not None:
             deps.append("  ✓ PyQt6")
-        except ImportError:
+        else:
             deps.append("  ✗ PyQt6 (pip install PyQt6)")
             
-        try:
-            import PIL
+        if importlib.util.find_spec('PIL') is not None:
             deps.append("  ✓ Pillow")
-        except ImportError:
+        else:
             deps.append("  ✗ Pillow (pip install Pillow)")
         
         if HAS_TQDM:
@@ -846,8 +992,24 @@ python "{script_path.absolute()}" %*
         print(f"💡 Tip: Usa 'leviathan-ui help' para ver la guía completa")
         return 0
     
+    @contextlib.contextmanager
+    def _profiled(self, args, command: str, file: str):
+        """CompileProfile del comando; con --profile sin archivo, stdout queda para el JSON"""
+        target = getattr(args, 'profile', None)
+        profile = CompileProfile(command, file, trace_memory=bool(target))
+        output = contextlib.redirect_stdout(sys.stderr) if target == '-' else contextlib.nullcontext()
+        with output:
+            yield profile
+    
     def cmd_start(self, args) -> int:
-        """Testear sintaxis del proyecto"""
+        """Testear sintaxis del proyecto y ejecutar sus hooks en el intérprete"""
+        with self._profiled(args, 'start', args.file) as profile:
+            code = self._start(args, profile)
+        if getattr(args, 'profile', None):
+            profile.emit(args.profile, {'exit_code': code})
+        return code
+    
+    def _start(self, args, profile: CompileProfile) -> int:
         print("🐉 Leviathan-UI - Test de Sintaxis")
         print()
         
@@ -859,26 +1021,49 @@ python "{script_path.absolute()}" %*
         print(f"📄 Analizando: {args.file}")
         print()
         
+        counting = profile.trace_memory
         try:
-            source = ls_file.read_text(encoding='utf-8')
-            
-            # Lexer
-            print("  → Lexer: Tokenizando...")
-            from leviathan_ui.Script import LeviLexer
-            lexer = LeviLexer(source)
-            tokens = lexer.tokenize()
-            print(f"  ✓ Lexer: {len(tokens)} tokens generados")
-            
-            # Parser
-            print("  → Parser: Construyendo AST...")
-            from leviathan_ui.Script import LeviParser
-            parser = LeviParser(tokens)
-            ast = parser.parse()
-            print(f"  ✓ Parser: AST construido")
-            
-            # Análisis semántico básico
-            print("  → Semántico: Verificando...")
-            print(f"  ✓ Semántico: Sin errores detectados")
+            with profile:
+                with profile.phase('read'):
+                    source = ls_file.read_text(encoding='utf-8')
+                profile.count('source_bytes', ls_file.stat().st_size)
+                
+                # Lexer y parser en modo recuperación: una sola pasada reporta
+                # todos los errores de sintaxis
+                lexer = LeviLexer(source, recover=True)
+                ast, parser = _lex_parse(lexer, profile, separate=counting, recover=True)
+                tokens = profile.counters['tokens']
+                if counting:
+                    print(f"  ✓ Lexer: {tokens} tokens generados ({profile.elapsed_ms('lex'):.1f} ms)")
+                diagnostics = sorted(lexer.diagnostics + parser.diagnostics, key=lambda d: (d.line, d.column))
+                profile.count('diagnostics', len(diagnostics))
+                if counting:
+                    profile.count('nodes', count_nodes(ast))
+                if diagnostics:
+                    print(f"❌ {len(diagnostics)} errores de sintaxis:")
+                    for diag in diagnostics:
+                        print(f"   {args.file}:{diag.line}:{diag.column}: {diag.message}")
+                    return 1
+                if counting:
+                    print(f"  ✓ Parser: AST construido ({profile.elapsed_ms('parse'):.1f} ms)")
+                else:
+                    print(f"  ✓ Lexer + parser: {tokens} tokens, AST construido "
+                          f"({profile.elapsed_ms('lex+parse'):.1f} ms)")
+                
+                # Ejecución de los hooks contra un instalador simulado
+                with profile.phase('interpret'):
+                    interpreter = LeviInterpreter(ast)
+                    context = interpreter.run()
+                profile.count('hooks_run', len(context.hooks_run))
+                profile.count('installer_calls', len(context.calls))
+                hooks = ', '.join(context.hooks_run) or 'ninguno'
+                print(f"  ✓ Intérprete: {len(context.hooks_run)} hooks en "
+                      f"{profile.elapsed_ms('interpret'):.2f} ms ({hooks})")
+                for line in context.logs[:10]:
+                    print(f"     log: {line}")
+                if len(context.logs) > 10:
+                    print(f"     ... {len(context.logs) - 10} líneas de log más")
+                print(f"     {len(context.calls)} llamadas al instalador registradas")
             
             print()
             print("✅ Sintaxis válida - Proyecto listo para compilar")
@@ -887,6 +1072,9 @@ python "{script_path.absolute()}" %*
         except SyntaxError as e:
             print(f"❌ Error de sintaxis: {e}")
             return 1
+        except LeviRuntimeError as e:
+            print(f"❌ Error de ejecución: {e}")
+            return 1
         except Exception as e:
             print(f"❌ Error inesperado: {e}")
             import traceback
@@ -895,13 +1083,24 @@ python "{script_path.absolute()}" %*
     
     def cmd_precompile(self, args) -> int:
         """Precompilar .ls a .lsx"""
+        with self._profiled(args, 'precompile', args.file) as profile:
+            code, extra = self._precompile(args, profile)
+        if args.profile:
+            profile.emit(args.profile, {'exit_code': code, **extra})
+        return code
+    
+    def _precompile(self, args, profile: CompileProfile) -> tuple:
+        """Devuelve (código de salida, campos extra del perfil JSON)"""
         print("🐉 Leviathan-UI - Precompilación")
         print()
         
+        if Path(args.file).is_dir() or any(ch in args.file for ch in '*?['):
+            return self._precompile_batch(args, profile)
+        
         ls_file = Path(args.file)
         if not ls_file.exists():
             print(f"❌ Archivo no encontrado: {args.file}")
-            return 1
+            return 1, {}
         
         output_file = Path(args.output) if args.output else ls_file.with_suffix('.lsx')
         
@@ -910,36 +1109,111 @@ python "{script_path.absolute()}" %*
         print()
         
         try:
-            # Leer y compilar
-            source = ls_file.read_text(encoding='utf-8')
-            
-            steps = ["Analizando sintaxis...", 
-                    "Generando AST...", 
-                    "Optimizando...", 
-                    "Serializando a binario..."]
-            
-            for i, step in enumerate(self._debug_progress("Precompilando", len(steps))):
-                print(f"  {step}")
+            with profile:
+                with profile.phase('read'):
+                    source_bytes = ls_file.read_bytes()
+                cache = None if args.no_cache else CompileCache(CACHE_DIR)
+                data = cache.get('lsx', source_bytes) if cache else None
+                profile.count('source_bytes', len(source_bytes))
+                profile.count('cached', data is not None)
                 
-                if i == 0:
-                    ast = LeviScript.compile(source)
-                elif i == 2:
-                    # Optimizaciones opcionales
-                    pass
-                elif i == 3:
-                    LeviScript.save_lsx(ast, str(output_file))
+                if data is not None:
+                    print("  ⚡ Caché: fuente sin cambios, se reutiliza el .lsx")
+                else:
+                    # Mismos saltos de línea que read_text (modo texto universal)
+                    source = source_bytes.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+                    optimizer = ASTOptimizer()
+                    data = _compile_lsx(source, profile, count=profile.trace_memory, optimizer=optimizer)
+                    stats = optimizer.stats
+                    if 'lex+parse' in profile.phases:
+                        print(f"  ✓ Lexer + parser: {profile.counters['tokens']} tokens "
+                              f"({profile.elapsed_ms('lex+parse'):.1f} ms)")
+                    else:
+                        print(f"  ✓ Lexer: {profile.elapsed_ms('lex'):.1f} ms")
+                        print(f"  ✓ Parser: {profile.elapsed_ms('parse'):.1f} ms")
+                    print(f"  ✓ Optimizador: {profile.elapsed_ms('optimize'):.1f} ms")
+                    print(f"     plegadas: {stats['fold']} · const sustituidas: {stats['inline']} · "
+                          f"ramas podadas: {stats['prune']} · hooks vacíos: {stats['hooks']}")
+                    print(f"  ✓ Serialización: {profile.elapsed_ms('serialize'):.1f} ms")
+                    if cache:
+                        cache.put('lsx', source_bytes, data)
+                
+                with profile.phase('write'):
+                    output_file.write_bytes(data)
+                profile.count('bytes_written', len(data))
             
-            size = output_file.stat().st_size
             print()
             print(f"✅ Precompilación exitosa")
-            print(f"   Tamaño: {size} bytes")
-            return 0
+            print(f"   Tamaño: {len(data)} bytes · {profile.total * 1000:.1f} ms")
+            return 0, {}
             
         except Exception as e:
             print(f"❌ Error en precompilación: {e}")
             import traceback
             traceback.print_exc()
-            return 1
+            return 1, {}
+    
+    def _precompile_batch(self, args, profile: CompileProfile) -> tuple:
+        """Precompilar muchos .ls en paralelo (directorio o patrón glob)"""
+        if Path(args.file).is_dir():
+            sources = sorted(Path(args.file).rglob('*.ls'))
+            base = Path(args.file)
+        else:
+            sources = sorted(Path(p) for p in glob.glob(args.file, recursive=True) if p.endswith('.ls'))
+            base = Path(os.path.commonpath([str(p.parent) for p in sources])) if sources else Path('.')
+        
+        if not sources:
+            print(f"❌ No se encontraron archivos .ls en: {args.file}")
+            return 1, {}
+        
+        jobs = max(1, min(args.jobs or os.cpu_count() or 1, len(sources)))
+        cache_dir = None if args.no_cache else str(CACHE_DIR)
+        tasks = []
+        for src in sources:
+            if args.output:
+                out = Path(args.output) / src.relative_to(base).with_suffix('.lsx')
+            else:
+                out = src.with_suffix('.lsx')
+            tasks.append((str(src), str(out), cache_dir, bool(args.profile)))
+        
+        print(f"📂 {len(sources)} archivo(s) .ls  ·  {jobs} proceso(s)")
+        print()
+        
+        # Cada archivo lleva su propio perfil (medido en su proceso)
+        profile.trace_memory = False
+        with profile:
+            with profile.phase('batch'):
+                if jobs == 1:
+                    results = [precompile_file(*task) for task in tasks]
+                else:
+                    with ProcessPoolExecutor(max_workers=jobs) as pool:
+                        results = list(pool.map(precompile_file, *zip(*tasks)))
+        wall = profile.total
+        
+        # Tabla resumen
+        width = max(len(r['source']) for r in results)
+        print(f"  {'Archivo'.ljust(width)}  {'Tiempo':>9}  {'Tamaño':>10}  Estado")
+        print(f"  {'─' * width}  {'─' * 9}  {'─' * 10}  {'─' * 20}")
+        for r in results:
+            if r['error']:
+                status = f"✗ {r['error']}"
+            else:
+                status = "⚡ caché" if r['cached'] else "✓"
+            size = f"{r['size']:,}" if r['size'] is not None else '-'
+            print(f"  {r['source'].ljust(width)}  {r['seconds'] * 1000:>7.1f}ms  {size:>10}  {status}")
+        
+        failed = [r for r in results if r['error']]
+        cpu = sum(r['seconds'] for r in results)
+        print()
+        print(f"{'❌' if failed else '✅'} {len(results) - len(failed)}/{len(results)} precompilados, "
+              f"{len(failed)} con error")
+        print(f"   Tiempo total: {wall:.2f}s (suma por archivo: {cpu:.2f}s)")
+        profile.count('files', len(results))
+        profile.count('failed', len(failed))
+        profile.count('cached', sum(1 for r in results if r['cached']))
+        profile.count('bytes_written', sum(r['size'] or 0 for r in results))
+        extra = {'jobs': jobs, 'files': [r.get('profile') for r in results]} if args.profile else {}
+        return (1 if failed else 0), extra
     
     def cmd_compile(self, args) -> int:
         """Compilar .lsx a ejecutable .exe"""
@@ -964,27 +1238,39 @@ python "{script_path.absolute()}" %*
         
         try:
             steps = ["Cargando AST desde .lsx...",
-                    "Generando código Python...",
-                    "Escribiendo archivo temporal...",
+                    "Compilando a bytecode...",
+                    "Escribiendo lanzador temporal...",
                     "Ejecutando PyInstaller...",
                     "Limpiando archivos temporales..."]
             
+            lsx_bytes = lsx_file.read_bytes()
+            cache = None if args.no_cache else CompileCache(CACHE_DIR)
+            cached = cache.get('pyc', lsx_bytes) if cache else None
+            code = None
+            if cached is not None:
+                try:
+                    code = LeviScript.load_code(cached)
+                except ValueError:
+                    # Caché de otra versión de Python: se recompila
+                    code = None
+            
             for i, step in enumerate(self._debug_progress("Compilando", len(steps))):
                 print(f"  {step}")
                 
                 if i == 0:
-                    ast = LeviScript.load_lsx(str(lsx_file))
+                    if code is not None:
+                        print("   ⚡ Caché: .lsx sin cambios, se reutiliza el bytecode")
+                    else:
+                        ast = ASTSerializer.deserialize(lsx_bytes)
                 elif i == 1:
-                    python_code = LeviScript.to_python(ast)
-                    # Añadir entry point
-                    python_code += '''
-
-if __name__ == '__main__':
-    installer = Installer()
-    installer.run()
-'''
+                    if code is None:
+                        # AST -> nodos ast de Python -> compile(), sin texto intermedio
+                        code = LeviScript.to_code(ast, 'installer.py', entry_point='Installer')
+                        if cache:
+                            cache.put('pyc', lsx_bytes, LeviScript.dump_code(code, lsx_bytes))
                 elif i == 2:
-                    py_file.write_text(python_code, encoding='utf-8')
+                    launcher, hidden_imports = bytecode_launcher(code)
+                    py_file.write_text(launcher, encoding='utf-8')
                 elif i == 3:
                     # Construir comando PyInstaller
                     cmd = ['pyinstaller']
@@ -995,6 +1281,8 @@ if __name__ == '__main__':
                     if args.icon:
                         cmd.extend(['--icon', args.icon])
                     cmd.extend(['--name', lsx_file.stem])
+                    for module in hidden_imports:
+                        cmd.extend(['--hidden-import', module])
                     cmd.append(str(py_file))
                     
                     subprocess.run(cmd, check=True, capture_output=True)
@@ -1080,6 +1368,11 @@ if __name__ == '__main__':
         
         return 0
 
+    def cmd_lsp(self, args) -> int:
+        """Servidor LSP por stdio: re-parseo incremental y diagnósticos en vivo"""
+        from leviathan_ui.language_server import LanguageServer
+        return LanguageServer().serve()
+    
     def cmd_help(self, args) -> int:
         """Guía interactiva paso a paso"""
         from pathlib import Path
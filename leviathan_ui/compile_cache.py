@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+compile_cache.py - Caché incremental de compilación de LeviScript
+Guarda artefactos (.lsx, código Python generado) indexados por el hash del
+contenido de entrada + versión del compilador, con expulsión LRU por tamaño.
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Dict
+
+from leviathan_ui.Script import LeviScript, ASTSerializer, ASTOptimizer
+
+
+# Relativo al directorio del proyecto (donde vive leviathan.json)
+CACHE_DIR = Path('.leviathan') / 'cache'
+
+
+class CompileCache:
+    """Caché de compilación en disco con tope de tamaño y expulsión LRU"""
+
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+    STATS_FILE = 'stats.json'
+    STATS_LOCK = 'stats.lock'
+    LOCK_TIMEOUT = 2.0      # segundos esperando el lock antes de renunciar a contar
+    LOCK_STALE = 10.0       # un lock más viejo que esto es de un proceso muerto
+
+    def __init__(self, root: Path = CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(kind: str, data: bytes) -> str:
+        """Hash del contenido; cambia si cambia el compilador, el optimizador o el formato .lsx"""
+        digest = hashlib.sha256()
+        versions = f'{LeviScript.VERSION}:{ASTSerializer.VERSION}:{ASTOptimizer.VERSION}'
+        digest.update(f'{kind}:{versions}:'.encode('utf-8'))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _path(self, kind: str, data: bytes) -> Path:
+        return self.root / f'{self.key(kind, data)}.{kind}'
+
+    def get(self, kind: str, data: bytes) -> Optional[bytes]:
+        """Devuelve el artefacto cacheado para data, o None si no existe"""
+        path = self._path(kind, data)
+        try:
+            payload = path.read_bytes()
+        except OSError:
+            self._count('misses')
+            return None
+        # La fecha de modificación hace de marca de uso para la expulsión LRU
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count('hits')
+        return payload
+
+    def put(self, kind: str, data: bytes, payload: bytes):
+        """Guarda payload como resultado de compilar data"""
+        if len(payload) > self.max_bytes:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(kind, data)
+        # Escritura atómica: nunca se deja un artefacto a medias en la caché
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                handle.write(payload)
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        self.evict()
+
+    def _entries(self):
+        if not self.root.is_dir():
+            return []
+        entries = []
+        for path in self.root.iterdir():
+            if path.name in (self.STATS_FILE, self.STATS_LOCK) or path.suffix == '.tmp':
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self):
+        """Elimina las entradas menos usadas hasta quedar bajo max_bytes"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        for _, _, path in self._entries():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        stats = self.root / self.STATS_FILE
+        if stats.exists():
+            stats.unlink()
+
+    def _load_counters(self) -> Dict[str, int]:
+        try:
+            counters = json.loads((self.root / self.STATS_FILE).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            counters = {}
+        return {'hits': int(counters.get('hits', 0)), 'misses': int(counters.get('misses', 0))}
+
+    @contextmanager
+    def _stats_lock(self):
+        """Lock entre procesos (los workers de `batch`) con un fichero creado con O_EXCL
+
+        Produce True si se obtuvo; si no llega a tiempo produce False y el
+        llamante pierde ese conteo en lugar de bloquear la compilación.
+        """
+        lock = self.root / self.STATS_LOCK
+        deadline = time.monotonic() + self.LOCK_TIMEOUT
+        acquired = False
+        while True:
+            try:
+                os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                acquired = True
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - lock.stat().st_mtime > self.LOCK_STALE:
+                        lock.unlink()
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(0.005)
+            except OSError:
+                break
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                try:
+                    lock.unlink()
+                except OSError:
+                    pass
+
+    def _count(self, field: str):
+        """Suma uno a field en stats.json: leer-modificar-escribir bajo lock y con os.replace"""
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return
+        with self._stats_lock() as acquired:
+            if not acquired:
+                return
+            counters = self._load_counters()
+            counters[field] += 1
+            tmp = None
+            try:
+                fd, tmp = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                    json.dump(counters, handle)
+                os.replace(tmp, self.root / self.STATS_FILE)
+            except OSError:
+                if tmp and os.path.exists(tmp):
+                    os.unlink(tmp)
+
+    def stats(self) -> Dict[str, int]:
+        """Entradas, bytes ocupados y aciertos/fallos acumulados"""
+        entries = self._entries()
+        counters = self._load_counters()
+        return {
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'hits': counters['hits'],
+            'misses': counters['misses'],
+        }
@@ -0,0 +1,572 @@
+# -*- coding: utf-8 -*-
+"""
+language_server.py - Re-parseo incremental y servidor de lenguaje de LeviScript
+IncrementalDocument mantiene el AST y los diagnósticos de un .ls abierto en
+un editor y, ante cada edición, sólo vuelve a analizar las sentencias de
+primer nivel (o del cuerpo de un setup) que toca el rango editado; el resto
+de subárboles (SetupDecl, PagesBlock, HookDecl, FunctionDecl...) se reutiliza.
+LanguageServer expone los diagnósticos por stdio con el protocolo LSP.
+
+Uso:
+    leviathan-ui lsp
+    python -m leviathan_ui.language_server
+"""
+
+import re
+import sys
+import json
+import traceback
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Union, Tuple, BinaryIO
+
+from leviathan_ui.Script import (
+    LeviLexer, LeviParser, Token, TokenType, Diagnostic,
+    ASTNode, Program, SetupDecl,
+)
+
+
+# Diagnóstico guardado relativo a la línea de su segmento: (Δlínea, columna, mensaje)
+_RelDiagnostic = Tuple[int, int, str]
+
+# Los paréntesis no cuentan: el parser nunca salta saltos de línea dentro de
+# ellos, así que uno sin cerrar da error en el mismo NEWLINE en ambos análisis
+_OPENERS = {
+    TokenType.LBRACE: TokenType.RBRACE,
+    TokenType.TEMPLATE_START: TokenType.RBRACE,
+    TokenType.LBRACKET: TokenType.RBRACKET,
+}
+
+
+# ============================================================
+# SEGMENTOS
+# ============================================================
+@dataclass(slots=True)
+class Segment:
+    """Sentencias desde una línea donde empieza una hasta la siguiente
+
+    Las sentencias que no empiezan línea (`a = 1; b = 2`) se agrupan con la
+    anterior, de modo que los límites entre segmentos son siempre inicios de
+    línea y una edición sólo desplaza en líneas a los segmentos posteriores.
+    """
+    line: int
+    nodes: List[ASTNode] = field(default_factory=list)
+    diagnostics: List[_RelDiagnostic] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class SetupBlock:
+    """`setup Nombre { ... }` de primer nivel con su cuerpo segmentado
+
+    end_line es la línea del '}' de cierre, o None si no empieza línea (en ese
+    caso las ediciones del cuerpo reanalizan el documento entero).
+    """
+    line: int
+    name: str = ''
+    body: List[Segment] = field(default_factory=list)
+    end_line: Optional[int] = None
+    head: List[_RelDiagnostic] = field(default_factory=list)
+    tail: List[_RelDiagnostic] = field(default_factory=list)
+    node: Optional[SetupDecl] = None
+
+
+def _line(item: Union[Segment, SetupBlock]) -> int:
+    return item.line
+
+
+def _shift(item: Union[Segment, SetupBlock], delta: int):
+    item.line += delta
+    if type(item) is SetupBlock:
+        if item.end_line is not None:
+            item.end_line += delta
+        for segment in item.body:
+            segment.line += delta
+
+
+def _balanced(tokens: List[Token]) -> bool:
+    """Llaves (incluido `${`) y corchetes cerrados y bien anidados
+
+    Un ']' suelto sólo es un error de expresión y no altera el análisis.
+    """
+    stack = []
+    for token in tokens:
+        token_type = token.type
+        closer = _OPENERS.get(token_type)
+        if closer is not None:
+            stack.append(closer)
+        elif token_type == TokenType.RBRACE:
+            if not stack or stack.pop() != TokenType.RBRACE:
+                return False
+        elif token_type == TokenType.RBRACKET and stack and stack[-1] == TokenType.RBRACKET:
+            stack.pop()
+    return not stack
+
+
+def _attach(items: List[Union[Segment, SetupBlock]], diagnostics: List[Diagnostic], first_line: int):
+    """Reparte los diagnósticos entre los segmentos que cubren su línea"""
+    if not diagnostics:
+        return
+    if not items or min(d.line for d in diagnostics) < items[0].line:
+        # Errores antes de la primera sentencia (p. ej. en un comentario)
+        items.insert(0, Segment(first_line))
+    lines, targets = [], []
+    for item in items:
+        if type(item) is SetupBlock:
+            lines.append(item.line)
+            targets.append(item.head)
+            for segment in item.body:
+                lines.append(segment.line)
+                targets.append(segment.diagnostics)
+            if item.end_line is not None:
+                lines.append(item.end_line)
+                targets.append(item.tail)
+        else:
+            lines.append(item.line)
+            targets.append(item.diagnostics)
+    for d in diagnostics:
+        k = bisect_right(lines, d.line) - 1
+        targets[k].append((d.line - lines[k], d.column, d.message))
+
+
+# ============================================================
+# PARSER SEGMENTADOR
+# ============================================================
+class _SegmentParser(LeviParser):
+    """LeviParser en modo recuperación que además anota los segmentos
+
+    Se segmentan las sentencias del nivel analizado y, si es el programa, los
+    cuerpos de sus setup. degraded indica una forma que no admite límites en
+    inicio de línea (p. ej. una sentencia pegada a `setup X {`).
+    """
+
+    def __init__(self, tokens, source: str, line_starts: List[int], program_level: bool = True):
+        super().__init__(tokens, recover=True)
+        self.source = source
+        self.line_starts = line_starts
+        self.program_level = program_level
+        self.items: List[Union[Segment, SetupBlock]] = []
+        self.degraded = False
+        # Destino de los segmentos del nivel actual; None = bloque sin segmentar
+        self._levels: List[Optional[list]] = [self.items]
+        self._pending: Optional[SetupBlock] = None
+        self._prev: Optional[Token] = None
+
+    def _advance_counting(self) -> Token:
+        token = super()._advance_counting()
+        self._prev = token
+        return token
+
+    def _starts_line(self, token: Token) -> bool:
+        """True si sólo hay espacios entre el inicio de la línea y token"""
+        if token.type == TokenType.STRING:
+            # Un literal multilínea lleva la línea donde termina
+            return False
+        start = self.line_starts[token.line - 1]
+        return not self.source[start:start + token.column - 1].strip()
+
+    def parse_statement_recovering(self) -> Optional[ASTNode]:
+        target = self._levels[-1]
+        if target is None:
+            return super().parse_statement_recovering()
+
+        token = self.current()
+        if self._starts_line(token):
+            if token.type == TokenType.SETUP and target is self.items and self.program_level:
+                holder = self._pending = SetupBlock(token.line)
+            else:
+                holder = Segment(token.line)
+            target.append(holder)
+        elif target and type(target[-1]) is Segment:
+            holder = target[-1]
+        else:
+            self.degraded = True
+            holder = Segment(token.line)
+            target.append(holder)
+
+        node = super().parse_statement_recovering()
+        if type(holder) is SetupBlock:
+            if type(node) is SetupDecl:
+                holder.name, holder.node = node.name, node
+            else:
+                # Setup roto: se descarta entero, igual que en LeviScript.check
+                target[-1] = Segment(holder.line)
+        elif node is not None:
+            holder.nodes.append(node)
+        return node
+
+    def parse_setup(self) -> SetupDecl:
+        block, self._pending = self._pending, None
+        self._levels.append(block.body if block is not None else None)
+        try:
+            node = super().parse_setup()
+        finally:
+            self._levels.pop()
+        if block is not None and self._starts_line(self._prev):
+            block.end_line = self._prev.line
+        return node
+
+    def parse_block(self) -> List[ASTNode]:
+        self._levels.append(None)
+        try:
+            return super().parse_block()
+        finally:
+            self._levels.pop()
+
+
+# ============================================================
+# INCREMENTAL DOCUMENT
+# ============================================================
+class IncrementalDocument:
+    """Fuente LeviScript editable con AST y diagnósticos siempre al día
+
+    Cada edición reanaliza sólo la región de segmentos que toca. La región se
+    acepta si sus delimitadores están equilibrados, no deja strings ni
+    comentarios abiertos y termina en salto de línea: entonces el resultado es
+    idéntico al de LeviScript.check sobre el texto completo. Si no, se
+    reanaliza todo el documento.
+    """
+
+    def __init__(self, text: str = ''):
+        self.text = text
+        self.line_starts = [0] + [m.end() for m in re.finditer('\n', text)]
+        self.items: List[Union[Segment, SetupBlock]] = []
+        self.names: Dict[str, Tuple[TokenType, str]] = {}
+        self.incremental = True
+        self.stats = {'incremental': 0, 'full': 0}
+        self._parse_full()
+
+    # ---------------- Resultado ----------------
+
+    @property
+    def program(self) -> Program:
+        """AST del documento; los nodos de segmentos no editados se reutilizan"""
+        body = []
+        for item in self.items:
+            if type(item) is SetupBlock:
+                if item.node is None:
+                    item.node = SetupDecl(item.name, [node for segment in item.body for node in segment.nodes])
+                body.append(item.node)
+            else:
+                body.extend(item.nodes)
+        return Program(body)
+
+    @property
+    def diagnostics(self) -> List[Diagnostic]:
+        """Errores de lexer y parser ordenados por posición, como LeviScript.check"""
+        result = []
+
+        def collect(line: int, diagnostics: List[_RelDiagnostic]):
+            for delta, column, message in diagnostics:
+                result.append(Diagnostic(line + delta, column, message))
+
+        for item in self.items:
+            if type(item) is SetupBlock:
+                collect(item.line, item.head)
+                for segment in item.body:
+                    collect(segment.line, segment.diagnostics)
+                if item.end_line is not None:
+                    collect(item.end_line, item.tail)
+            else:
+                collect(item.line, item.diagnostics)
+        result.sort(key=lambda d: (d.line, d.column))
+        return result
+
+    def offset(self, line: int, column: int) -> int:
+        """Offset de (línea, columna), ambas desde 1; se acota al documento"""
+        line = min(max(line, 1), len(self.line_starts))
+        start = self.line_starts[line - 1]
+        end = self.line_starts[line] - 1 if line < len(self.line_starts) else len(self.text)
+        return min(start + max(column, 1) - 1, end)
+
+    def line_text(self, line: int) -> str:
+        start = self.line_starts[line - 1]
+        end = self.line_starts[line] - 1 if line < len(self.line_starts) else len(self.text)
+        return self.text[start:end]
+
+    # ---------------- Edición ----------------
+
+    def replace(self, text: str):
+        """Sustituye todo el contenido y lo reanaliza"""
+        self.text = text
+        self.line_starts = [0] + [m.end() for m in re.finditer('\n', text)]
+        self._parse_full()
+
+    def edit(self, start: int, end: int, text: str) -> bool:
+        """Sustituye text[start:end]; devuelve True si bastó un análisis parcial"""
+        starts = self.line_starts
+        first_line = bisect_right(starts, start)
+        last_line = bisect_right(starts, end)
+
+        self.text = self.text[:start] + text + self.text[end:]
+        delta = len(text) - (end - start)
+        inserted = [start + m.end() for m in re.finditer('\n', text)]
+        starts[first_line:] = inserted + [s + delta for s in starts[last_line:]]
+        line_delta = len(inserted) - (last_line - first_line)
+
+        if self.incremental and self._reparse(first_line, last_line, line_delta):
+            self.stats['incremental'] += 1
+            return True
+        self._parse_full()
+        return False
+
+    def _parse_full(self):
+        lexer = LeviLexer(self.text, recover=True)
+        # Los re-análisis parciales comparten el pool: los nodos nuevos usan
+        # los mismos str que los reutilizados
+        self.names = lexer.names
+        parser = _SegmentParser(lexer.iter_tokens(), self.text, self.line_starts)
+        parser.parse()
+        _attach(parser.items, lexer.diagnostics + parser.diagnostics, 1)
+        self.items = parser.items
+        self.incremental = not parser.degraded
+        self.stats['full'] += 1
+
+    def _reparse(self, first_line: int, last_line: int, line_delta: int) -> bool:
+        """Reanaliza los segmentos entre first_line y last_line (líneas previas a la edición)"""
+        items = self.items
+        k = bisect_right(items, first_line, key=_line) - 1
+        if k < 0:
+            return False
+        block = items[k]
+        if type(block) is SetupBlock:
+            body = block.body
+            if (block.end_line is None or not body
+                    or first_line < body[0].line or last_line >= block.end_line):
+                # Cabecera o cierre del setup
+                return False
+            container, limit = body, block.end_line
+            i = bisect_right(body, first_line, key=_line) - 1
+        else:
+            block = None
+            container, limit, i = items, None, k
+
+        # Los segmentos tocados van de i a j; boundary es la línea del siguiente
+        j = i
+        while True:
+            boundary = container[j + 1].line if j + 1 < len(container) else limit
+            if boundary is None or last_line < boundary:
+                break
+            j += 1
+
+        start_line = container[i].line
+        region_start = self.line_starts[start_line - 1]
+        if boundary is None:
+            region_end = len(self.text)
+        else:
+            region_end = self.line_starts[boundary + line_delta - 1]
+
+        lexer = LeviLexer(self.text[:region_end], recover=True, names=self.names)
+        lexer.pos, lexer.line = region_start, start_line
+        tokens = lexer.tokenize()
+        if lexer.unterminated or not _balanced(tokens):
+            return False
+        if boundary is not None and (len(tokens) < 2 or tokens[-2].type != TokenType.NEWLINE):
+            return False
+        parser = _SegmentParser(tokens, self.text, self.line_starts, program_level=block is None)
+        parser.parse()
+        if parser.degraded:
+            return False
+        _attach(parser.items, lexer.diagnostics + parser.diagnostics, start_line)
+
+        container[i:j + 1] = parser.items
+        if line_delta:
+            for item in container[i + len(parser.items):]:
+                _shift(item, line_delta)
+        if block is not None:
+            block.node = None
+            if line_delta:
+                block.end_line += line_delta
+                for item in items[k + 1:]:
+                    _shift(item, line_delta)
+        return True
+
+
+# ============================================================
+# LANGUAGE SERVER
+# ============================================================
+def _utf16_len(text: str) -> int:
+    if text.isascii():
+        return len(text)
+    return len(text.encode('utf-16-le')) // 2
+
+
+def _from_utf16(text: str, character: int) -> int:
+    """Índice en text de la posición LSP character (unidades UTF-16)"""
+    if text.isascii():
+        return min(character, len(text))
+    units = 0
+    for index, char in enumerate(text):
+        if units >= character:
+            return index
+        units += 2 if ord(char) > 0xFFFF else 1
+    return len(text)
+
+
+class LanguageServer:
+    """Servidor LSP mínimo sobre stdio: sincronización incremental y diagnósticos
+
+    Mensajes JSON-RPC con cabecera Content-Length. Atiende initialize,
+    shutdown/exit y textDocument/didOpen, didChange, didSave y didClose;
+    tras cada cambio publica textDocument/publishDiagnostics.
+    """
+
+    METHODS = {
+        'initialize': 'on_initialize',
+        'initialized': None,
+        'shutdown': 'on_shutdown',
+        'exit': 'on_exit',
+        'textDocument/didOpen': 'on_did_open',
+        'textDocument/didChange': 'on_did_change',
+        'textDocument/didSave': 'on_did_save',
+        'textDocument/didClose': 'on_did_close',
+    }
+
+    def __init__(self, reader: BinaryIO = None, writer: BinaryIO = None):
+        self.reader = reader or sys.stdin.buffer
+        self.writer = writer or sys.stdout.buffer
+        self.documents: Dict[str, IncrementalDocument] = {}
+        self.running = True
+        self.exit_code = 0
+        self._shutdown = False
+
+    # ---------------- Transporte ----------------
+
+    def read_message(self) -> Optional[Dict[str, Any]]:
+        length = None
+        while True:
+            header = self.reader.readline()
+            if not header:
+                return None
+            header = header.strip()
+            if not header:
+                break
+            name, _, value = header.decode('ascii').partition(':')
+            if name.lower() == 'content-length':
+                length = int(value)
+        if length is None:
+            return None
+        return json.loads(self.reader.read(length).decode('utf-8'))
+
+    def send(self, message: Dict[str, Any]):
+        body = json.dumps(message, ensure_ascii=False).encode('utf-8')
+        self.writer.write(f'Content-Length: {len(body)}\r\n\r\n'.encode('ascii') + body)
+        self.writer.flush()
+
+    def notify(self, method: str, params: Dict[str, Any]):
+        self.send({'jsonrpc': '2.0', 'method': method, 'params': params})
+
+    def serve(self) -> int:
+        while self.running:
+            message = self.read_message()
+            if message is None:
+                return 1
+            self.handle(message)
+        return self.exit_code
+
+    def handle(self, message: Dict[str, Any]):
+        method = message.get('method')
+        msg_id = message.get('id')
+        if method is None:
+            return  # respuesta a una petición nuestra: no se usan
+
+        handler = self.METHODS.get(method)
+        if handler is None:
+            if msg_id is not None and method not in self.METHODS:
+                self.send({'jsonrpc': '2.0', 'id': msg_id,
+                           'error': {'code': -32601, 'message': f'Método no soportado: {method}'}})
+            return
+        try:
+            result = getattr(self, handler)(message.get('params') or {})
+        except Exception as e:
+            if msg_id is None:
+                # Una notificación mala no debe tumbar el servidor: se registra y se sigue
+                print(f'leviscript-lsp: error en {method}', file=sys.stderr)
+                traceback.print_exc(file=sys.stderr)
+                return
+            self.send({'jsonrpc': '2.0', 'id': msg_id, 'error': {'code': -32603, 'message': str(e)}})
+            return
+        if msg_id is not None:
+            self.send({'jsonrpc': '2.0', 'id': msg_id, 'result': result})
+
+    # ---------------- Métodos ----------------
+
+    def on_initialize(self, params):
+        return {
+            'capabilities': {
+                'textDocumentSync': {'openClose': True, 'change': 2, 'save': {'includeText': True}},
+            },
+            'serverInfo': {'name': 'leviscript', 'version': '1.0'},
+        }
+
+    def on_shutdown(self, params):
+        self._shutdown = True
+        return None
+
+    def on_exit(self, params):
+        self.running = False
+        self.exit_code = 0 if self._shutdown else 1
+
+    def on_did_open(self, params):
+        document = params['textDocument']
+        self.documents[document['uri']] = IncrementalDocument(document['text'])
+        self.publish(document['uri'])
+
+    def on_did_change(self, params):
+        uri = params['textDocument']['uri']
+        document = self.documents.get(uri)
+        if document is None:
+            return  # didChange de un documento que no se abrió: se ignora
+        for change in params['contentChanges']:
+            change_range = change.get('range')
+            if change_range is None:
+                document.replace(change['text'])
+            else:
+                start = self._offset(document, change_range['start'])
+                end = self._offset(document, change_range['end'])
+                document.edit(start, end, change['text'])
+        self.publish(uri)
+
+    def on_did_save(self, params):
+        uri = params['textDocument']['uri']
+        if 'text' in params and uri in self.documents:
+            self.documents[uri].replace(params['text'])
+            self.publish(uri)
+
+    def on_did_close(self, params):
+        uri = params['textDocument']['uri']
+        self.documents.pop(uri, None)
+        self.notify('textDocument/publishDiagnostics', {'uri': uri, 'diagnostics': []})
+
+    # ---------------- Diagnósticos ----------------
+
+    @staticmethod
+    def _offset(document: IncrementalDocument, position: Dict[str, int]) -> int:
+        line = position['line'] + 1
+        if line > len(document.line_starts):
+            return len(document.text)
+        column = _from_utf16(document.line_text(line), position['character']) + 1
+        return document.offset(line, column)
+
+    def publish(self, uri: str):
+        document = self.documents[uri]
+        diagnostics = []
+        for d in document.diagnostics:
+            line = min(d.line, len(document.line_starts))
+            text = document.line_text(line)
+            character = _utf16_len(text[:d.column - 1])
+            diagnostics.append({
+                'range': {'start': {'line': line - 1, 'character': character},
+                          'end': {'line': line - 1, 'character': character + 1}},
+                'severity': 1,
+                'source': 'leviscript',
+                'message': d.message,
+            })
+        self.notify('textDocument/publishDiagnostics', {'uri': uri, 'diagnostics': diagnostics})
+
+
+def main() -> int:
+    return LanguageServer().serve()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
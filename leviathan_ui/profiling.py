@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+profiling.py - Instrumentación del compilador LeviScript
+CompileProfile mide el tiempo de pared de cada fase (lex, parse, optimize,
+serialize, generate...), guarda contadores (tokens, nodos, bytes escritos) y
+el pico de memoria según tracemalloc. `leviathan-ui start/precompile --profile`
+lo vuelca como JSON para seguir el rendimiento del compilador entre versiones.
+"""
+
+import sys
+import json
+import time
+import platform
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import fields
+from typing import Dict, Any, Optional
+
+from leviathan_ui.Script import LeviScript, ASTNode
+
+
+def count_nodes(root) -> int:
+    """Número de nodos del AST (Program incluido)"""
+    count = 0
+    stack = [root]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, ASTNode):
+            count += 1
+            stack.extend(getattr(value, f.name) for f in fields(value))
+        elif isinstance(value, list):
+            stack.extend(value)
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+    return count
+
+
+class CompileProfile:
+    """Tiempos por fase, contadores y pico de memoria de una compilación
+
+    Uso:
+        with CompileProfile('precompile', 'setup.ls') as profile:
+            with profile.phase('lex'):
+                tokens = LeviLexer(source).tokenize()
+            profile.count('tokens', len(tokens))
+        print(profile.to_json())
+
+    Con trace_memory=True tracemalloc está activo durante todo el bloque, lo
+    que ralentiza las fases por igual; los tiempos son comparables entre
+    ejecuciones con la misma opción.
+    """
+
+    SCHEMA = 1
+
+    def __init__(self, command: str, file: Optional[str] = None, trace_memory: bool = True):
+        self.command = command
+        self.file = file
+        self.trace_memory = trace_memory
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, Any] = {}
+        self.total = 0.0
+        self.peak_memory: Optional[int] = None
+        self._start = 0.0
+        self._owns_tracing = False
+
+    def __enter__(self) -> 'CompileProfile':
+        if self.trace_memory:
+            self._owns_tracing = not tracemalloc.is_tracing()
+            if self._owns_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.total = time.perf_counter() - self._start
+        if self.trace_memory:
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            if self._owns_tracing:
+                tracemalloc.stop()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Suma el tiempo de pared del bloque a la fase name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def elapsed_ms(self, name: str) -> float:
+        return self.phases.get(name, 0.0) * 1000
+
+    def count(self, name: str, value):
+        self.counters[name] = value
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'schema': self.SCHEMA,
+            'command': self.command,
+            'file': self.file,
+            'compiler_version': LeviScript.VERSION,
+            'python': platform.python_version(),
+            'phases_ms': {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()},
+            'total_ms': round(self.total * 1000, 3),
+            'counters': self.counters,
+            'peak_memory_bytes': self.peak_memory,
+        }
+
+    def to_json(self, extra: Optional[Dict[str, Any]] = None) -> str:
+        data = self.as_dict()
+        if extra:
+            data.update(extra)
+        return json.dumps(data, indent=2, ensure_ascii=False)
+
+    def emit(self, target: str = '-', extra: Optional[Dict[str, Any]] = None):
+        """Escribe el JSON en target ('-' = stdout)"""
+        text = self.to_json(extra) + '\n'
+        if target == '-':
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        else:
+            with open(target, 'w', encoding='utf-8') as f:
+                f.write(text)
@@ -1,9 +1,71 @@
 import sys
+import threading
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
-from PyQt6.QtCore import Qt, QTimer, QRect, QRectF, QPropertyAnimation, pyqtProperty
-from PyQt6.QtGui import QColor, QPainter, QBrush, QPen, QLinearGradient
+from PyQt6.QtCore import (Qt, QRect, QRectF, QObject, QElapsedTimer, QVariantAnimation,
+                          QPropertyAnimation, QMetaObject, pyqtProperty, pyqtSlot)
+from PyQt6.QtGui import QColor, QPainter, QBrush, QPen, QLinearGradient, QPainterPath
 
 from .title_bar import get_accent_color
+from .accent import accent_cache
+
+MARQUEE_WIDTH = 100
+RADIUS = 4
+MARQUEE_SPEED = 0.25  # px por ms (los 5 px cada 20 ms de antes)
+
+class _MarqueeClock(QObject):
+    """
+    Reloj compartido por todas las barras en modo marquee.
+    Un único QVariantAnimation en bucle avanza con el temporizador de animaciones
+    de Qt (sincronizado con el refresco de pantalla) y reparte el tiempo
+    transcurrido a las barras registradas. Sólo se registran barras que se ven
+    (ni ocultas, ni tapadas, ni con la ventana minimizada): sin ninguna, la
+    animación se detiene y no hay wakeups.
+    """
+    def __init__(self):
+        super().__init__()
+        self._bars = []
+        self._elapsed = QElapsedTimer()
+        self._elapsed.start()
+        self._animation = QVariantAnimation(self)
+        self._animation.setStartValue(0.0)
+        self._animation.setEndValue(1.0)
+        self._animation.setDuration(1000)
+        self._animation.setLoopCount(-1)
+        self._animation.valueChanged.connect(self._tick)
+        
+    def now(self):
+        return self._elapsed.elapsed()
+        
+    def add(self, bar):
+        if bar not in self._bars:
+            self._bars.append(bar)
+        if self._animation.state() != QVariantAnimation.State.Running:
+            self._animation.start()
+            
+    def remove(self, bar):
+        if bar in self._bars:
+            self._bars.remove(bar)
+        if not self._bars:
+            try:
+                self._animation.stop()
+            except RuntimeError:  # al cerrar la aplicación la animación puede estar ya destruida
+                pass
+            
+    def _tick(self, _value):
+        now = self.now()
+        for bar in list(self._bars):
+            try:
+                bar._advance_marquee(now)
+            except RuntimeError:  # widget destruido sin hideEvent
+                self.remove(bar)
+
+_clock = None
+
+def _marquee_clock():
+    global _clock
+    if _clock is None:
+        _clock = _MarqueeClock()
+    return _clock
 
 class LeviathanProgressBar(QWidget):
     """
@@ -16,11 +78,18 @@ class LeviathanProgressBar(QWidget):
         self._min = 0
         self._max = 100
         self._is_marquee = False
-        self._marquee_pos = -100
+        self._marquee_pos = -MARQUEE_WIDTH
+        self._marquee_start = 0
+        self._ticking = False  # registrada en el reloj compartido
         self._accent = get_accent_color()
-        
-        self._timer = QTimer(self)
-        self._timer.timeout.connect(self._update_marquee)
+        self._brushes = None   # (fondo, relleno, marquee): cambian con el acento
+        self._shapes = None    # (fondo, marquee): cambian con el tamaño
+        # setValue desde cualquier hilo: el valor y si ya hay una llamada encolada, bajo lock
+        self._pending_lock = threading.Lock()
+        self._pending_value = None
+        self._pending_scheduled = False
+        unsubscribe = accent_cache.subscribe(self._on_accent_changed)
+        self.destroyed.connect(unsubscribe)
         
     @pyqtProperty(int)
     def value(self):
@@ -28,51 +97,154 @@ class LeviathanProgressBar(QWidget):
         
     @value.setter
     def value(self, val):
-        self._value = max(self._min, min(self._max, val))
-        self.update()
+        val = max(self._min, min(self._max, val))
+        if val == self._value:
+            return
+        old_width = self._fill_width()
+        self._value = val
+        if not self._is_marquee:
+            self._update_span(old_width, self._fill_width())
+        
+    def setValue(self, val):
+        """
+        Como `value = val`, pensado para workers que informan miles de veces por
+        segundo (también desde otro hilo): guarda el último valor y lo aplica una
+        sola vez en el hilo de la GUI, en la siguiente vuelta del bucle de eventos.
+        """
+        with self._pending_lock:
+            self._pending_value = val
+            scheduled, self._pending_scheduled = self._pending_scheduled, True
+        if not scheduled:
+            QMetaObject.invokeMethod(self, "_apply_pending_value", Qt.ConnectionType.QueuedConnection)
+            
+    @pyqtSlot()
+    def _apply_pending_value(self):
+        # Se baja la marca antes de leer: un setValue posterior encola otra llamada
+        with self._pending_lock:
+            self._pending_scheduled = False
+            val, self._pending_value = self._pending_value, None
+        if val is not None:
+            self.value = val
         
     def setRange(self, min_val, max_val):
         self._min = min_val
         self._max = max_val
         self.update()
         
+    def _fill_width(self):
+        if self._max <= self._min:
+            return 0
+        return int((self._value - self._min) / (self._max - self._min) * self.width())
+        
+    def _update_span(self, old_width, new_width):
+        """Repinta sólo la franja entre los dos anchos, con el extremo redondeado y el antialiasing"""
+        if old_width == new_width:
+            return
+        low, high = sorted((old_width, new_width))
+        # Por debajo de 2 * RADIUS Qt reduce el radio y cambia toda la forma
+        left = 0 if low < 2 * RADIUS else low - RADIUS - 1
+        self.update(QRect(left, 0, high + 1 - left + 1, self.height()))
+        
     def setMarquee(self, enabled):
         self._is_marquee = enabled
-        if enabled:
-            self._timer.start(20)
-        else:
-            self._timer.stop()
+        self._marquee_start = _marquee_clock().now()
+        self._marquee_pos = -MARQUEE_WIDTH
+        self._sync_marquee()
         self.update()
         
-    def _update_marquee(self):
-        self._marquee_pos += 5
-        if self._marquee_pos > self.width():
-            self._marquee_pos = -100
+    def _on_screen(self):
+        """Algo de la barra puede verse: visible, no tapada del todo dentro de su
+        ventana (p. ej. por el splash) y con la ventana expuesta y sin minimizar"""
+        if not self.isVisible() or self.visibleRegion().isEmpty():
+            return False
+        window = self.window()
+        if window.isMinimized():
+            return False
+        handle = window.windowHandle()
+        return handle is None or handle.isExposed()
+        
+    def _sync_marquee(self):
+        """Registra la barra en el reloj compartido sólo mientras está en modo marquee y se ve
+        
+        Al dejar de verse se da de baja en el siguiente tick; el repintado que
+        Qt hace al destaparla, restaurar o exponer la ventana la vuelve a registrar.
+        """
+        self._ticking = self._is_marquee and self._on_screen()
+        if self._ticking:
+            _marquee_clock().add(self)
+        elif _clock is not None:
+            _clock.remove(self)
+            
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._sync_marquee()
+        
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._sync_marquee()
+        
+    def _on_accent_changed(self, color):
+        self._accent = color
+        self._brushes = None
         self.update()
         
+    def resizeEvent(self, event):
+        self._shapes = None
+        super().resizeEvent(event)
+        
+    def _cached_brushes(self):
+        if self._brushes is None:
+            accent = QColor(self._accent)
+            light = accent.lighter(150)
+            # En coordenadas del marquee: paintEvent traslada el painter a su posición
+            gradient = QLinearGradient(0, 0, MARQUEE_WIDTH, 0)
+            gradient.setColorAt(0, light)
+            gradient.setColorAt(0.5, accent)
+            gradient.setColorAt(1, light)
+            self._brushes = (QBrush(QColor(40, 40, 40)), QBrush(accent), QBrush(gradient))
+        return self._brushes
+        
+    def _cached_shapes(self):
+        if self._shapes is None:
+            background = QPainterPath()
+            background.addRoundedRect(QRectF(self.rect()), RADIUS, RADIUS)
+            marquee = QPainterPath()
+            marquee.addRoundedRect(QRectF(0, 0, MARQUEE_WIDTH, self.height()), RADIUS, RADIUS)
+            self._shapes = (background, marquee)
+        return self._shapes
+        
+    def _advance_marquee(self, now):
+        # La posición sale del tiempo transcurrido: bajo carga se saltan frames, no se ralentiza
+        if not self._on_screen():
+            self._sync_marquee()
+            return
+        travel = self.width() + MARQUEE_WIDTH
+        pos = int((now - self._marquee_start) * MARQUEE_SPEED) % travel - MARQUEE_WIDTH
+        if pos != self._marquee_pos:
+            left = min(pos, self._marquee_pos)
+            self.update(QRect(left - 1, 0, abs(pos - self._marquee_pos) + MARQUEE_WIDTH + 2, self.height()))
+            self._marquee_pos = pos
+        
     def paintEvent(self, event):
+        if self._is_marquee and not self._ticking:
+            self._sync_marquee()
+        background_brush, fill_brush, marquee_brush = self._cached_brushes()
+        background, marquee = self._cached_shapes()
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Fondo
         painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(QBrush(QColor(40, 40, 40)))
-        painter.drawRoundedRect(self.rect(), 4, 4)
+        
+        # Fondo (recortado por Qt a la región que se actualiza)
+        painter.fillPath(background, background_brush)
         
         if self._is_marquee:
             # Dibujar barra marquee
-            gradient = QLinearGradient(self._marquee_pos, 0, self._marquee_pos + 100, 0)
-            gradient.setColorAt(0, QColor(self._accent).lighter(150))
-            gradient.setColorAt(0.5, QColor(self._accent))
-            gradient.setColorAt(1, QColor(self._accent).lighter(150))
-            
-            painter.setBrush(QBrush(gradient))
-            painter.drawRoundedRect(QRect(self._marquee_pos, 0, 100, self.height()), 4, 4)
+            painter.translate(self._marquee_pos, 0)
+            painter.fillPath(marquee, marquee_brush)
         else:
             # Dibujar barra normal
-            if self._max > self._min:
-                width = int((self._value - self._min) / (self._max - self._min) * self.width())
-                if width > 0:
-                    painter.setBrush(QBrush(QColor(self._accent)))
-                    painter.drawRoundedRect(QRect(0, 0, width, self.height()), 4, 4)
+            width = self._fill_width()
+            if width > 0:
+                painter.setBrush(fill_brush)
+                painter.drawRoundedRect(QRect(0, 0, width, self.height()), RADIUS, RADIUS)
         painter.end()
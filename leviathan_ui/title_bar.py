@@ -1,14 +1,12 @@
 import os
-import platform
 
-from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton
-from PyQt6.QtCore import Qt, QSize, QPoint, QRectF
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton, QApplication
+from PyQt6.QtCore import Qt, QSize, QPoint, QRectF, QTimer
 from PyQt6.QtGui import QFont, QColor, QPainter, QPen, QBrush, QPainterPath, QPixmap
 
-try:
-    import winreg
-except ImportError:
-    winreg = None
+from .accent import accent_cache
+
+_accent_timer = None
 
 def is_icon_file(filepath):
     """Verifica si el string es una ruta a un archivo de imagen soportado."""
@@ -19,15 +17,27 @@ def is_icon_file(filepath):
 
 
 def get_accent_color():
-    """Obtiene el color de acento de Windows 10/11."""
-    if platform.system() == "Windows" and winreg:
-        try:
-            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Microsoft\Windows\DWM")
-            value, _ = winreg.QueryValueEx(key, "ColorizationColor")
-            color = "{:08x}".format(value)
-            return "#" + color[2:8]
-        except: pass
-    return "#0078d4"
+    """Obtiene el color de acento de Windows 10/11 (cacheado, ver accent.py)."""
+    return accent_cache.get()
+
+def watch_accent_color(interval_ms=5000):
+    """Refresca la caché del acento con un sondeo de baja frecuencia y al cambiar el esquema de color.
+    Los widgets suscritos (accent_cache.subscribe) sólo se repintan si el color cambia."""
+    global _accent_timer
+    app = QApplication.instance()
+    if app is None:
+        return None
+    if _accent_timer is None:
+        _accent_timer = QTimer(app)
+        _accent_timer.timeout.connect(accent_cache.refresh)
+        hints = app.styleHints()
+        if hasattr(hints, "colorSchemeChanged"):  # Qt >= 6.5
+            hints.colorSchemeChanged.connect(lambda _scheme: accent_cache.refresh())
+    _accent_timer.start(interval_ms)
+    return _accent_timer
+
+# Cualquier widget que se suscriba al acento (barra de progreso, ventana) arranca la vigilancia
+accent_cache.set_watcher(watch_accent_color)
 
 def darken_color(hex_color, factor=0.7):
     """Oscurece un color hex por un factor (0.0 = negro, 1.0 = sin cambio)."""
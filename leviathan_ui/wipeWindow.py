@@ -1,13 +1,96 @@
 import sys
 import os
+import math
 import ctypes
+from functools import lru_cache
 from PyQt6.QtWidgets import QWidget, QApplication, QVBoxLayout, QGraphicsBlurEffect
-from PyQt6.QtCore import Qt, QRect, QRectF, QObject, QEvent
+from PyQt6.QtCore import Qt, QRect, QRectF, QObject, QEvent, QCoreApplication
 from PyQt6.QtGui import QColor, QPainter, QBrush, QPen, QPixmap, QImage
 import difflib
 
 # Importamos el capturador de acento desde la librería base
 from .title_bar import get_accent_color
+from .accent import accent_cache
+
+SHADOW_COLOR = "#000000"
+
+
+def paint_shadow(painter, rect, radius, blur, color=SHADOW_COLOR):
+    """Strokes the shadow around rect: blur // 2 antialiased rounded rects, fading outwards."""
+    steps = blur // 2
+    base = QColor(color)
+    painter.setBrush(Qt.BrushStyle.NoBrush)
+    for i in range(steps):
+        shade = QColor(base)
+        shade.setAlpha(int((140 / steps) * (steps - i) * 0.3))
+        painter.setPen(QPen(shade, 1))
+        painter.drawRoundedRect(rect.adjusted(-i, -i, i, i), radius + i, radius + i)
+
+
+def _device_aligned(size, dpr):
+    """Smallest logical size >= size that is a whole number of device pixels (fractional scaling)."""
+    for candidate in range(size, size + 8):
+        if abs(candidate * dpr - round(candidate * dpr)) < 1e-6:
+            return candidate
+    return size
+
+
+def _clear_templates_on_quit():
+    """Drops the cached pixmaps when the application quits, while there is still a GUI
+    context to free them in (once per QCoreApplication instance)."""
+    app = QCoreApplication.instance()
+    if app is not None and not app.property("_leviathan_shadow_hook"):
+        app.aboutToQuit.connect(_shadow_template.cache_clear)
+        app.setProperty("_leviathan_shadow_hook", True)
+
+
+@lru_cache(maxsize=32)
+def _shadow_template(radius, blur, rgba, dpr):
+    """Shadow of the smallest rect whose edges are straight, rendered once for nine-slicing.
+    Returns (pixmap, margin, corner) in logical pixels, or None if there is no shadow."""
+    steps = blur // 2
+    if steps <= 0:
+        return None
+    _clear_templates_on_quit()
+    margin = _device_aligned(steps + 1, dpr)            # strokes reach steps px out, plus antialiasing
+    corner = _device_aligned(margin + radius + 1, dpr)  # every curved stroke ends inside the corner slice
+    side = 2 * corner + 1           # one straight row/column between corners gets stretched
+    pixmap = QPixmap(math.ceil(side * dpr), math.ceil(side * dpr))
+    pixmap.setDevicePixelRatio(dpr)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    paint_shadow(painter, QRect(margin, margin, side - 2 * margin, side - 2 * margin),
+                 radius, blur, QColor.fromRgba(rgba))
+    painter.end()
+    return pixmap, margin, corner
+
+
+def draw_shadow(painter, rect, radius, blur, color=SHADOW_COLOR, dpr=1.0):
+    """Same result as paint_shadow, blitted from a cached nine-slice pixmap
+    keyed by (radius, blur, color, device pixel ratio)."""
+    template = _shadow_template(radius, blur, QColor(color).rgba(), float(dpr))
+    if template is None:
+        return
+    pixmap, margin, corner = template
+    side = 2 * corner + 1
+    left, top = rect.x() - margin, rect.y() - margin
+    right, bottom = rect.x() + rect.width() + margin, rect.y() + rect.height() + margin
+    if right - left < side or bottom - top < side:
+        paint_shadow(painter, rect, radius, blur, color)
+        return
+
+    xs = ((left, 0), (left + corner, corner), (right - corner, side - corner), (right, side))
+    ys = ((top, 0), (top + corner, corner), (bottom - corner, side - corner), (bottom, side))
+    for row in range(3):
+        (ty0, sy0), (ty1, sy1) = ys[row], ys[row + 1]
+        for col in range(3):
+            if row == 1 and col == 1:
+                continue  # the shadow never reaches the inside of the rect
+            (tx0, sx0), (tx1, sx1) = xs[col], xs[col + 1]
+            painter.drawPixmap(QRectF(tx0, ty0, tx1 - tx0, ty1 - ty0), pixmap,
+                               QRectF(sx0 * dpr, sy0 * dpr, (sx1 - sx0) * dpr, (sy1 - sy0) * dpr))
+
 
 class WipeWindow(QObject):
     """
@@ -35,6 +118,8 @@ class WipeWindow(QObject):
         self._mode = "polished" # "polished", "ghost", or "ghostBlur"
         self._target = None
         self._blur_radius = 30  # For ghostBlur mode
+        self._shadow_color = SHADOW_COLOR
+        self._accent_unsubscribe = None
 
     def set_mode(self, mode):
         """'polished', 'ghost', or 'ghostBlur'."""
@@ -56,6 +141,14 @@ class WipeWindow(QObject):
         self._blur_radius = blur_radius
         return self
 
+    def set_shadow(self, blur=None, color=None):
+        """Shadow size and color for polished mode (call before apply)."""
+        if blur is not None:
+            self._shadow_blur = blur
+        if color is not None:
+            self._shadow_color = color
+        return self
+
     def apply(self, widget):
         """Applies high-fidelity polishing with GC safety."""
         self._target = widget
@@ -69,6 +162,11 @@ class WipeWindow(QObject):
         # 2. Install event filter for custom painting
         widget.installEventFilter(self)
         
+        # Repaint only when the cached accent actually changes ('auto' background)
+        if self._accent_unsubscribe is None:
+            self._accent_unsubscribe = accent_cache.subscribe(self._on_accent_changed)
+            widget.destroyed.connect(self._accent_unsubscribe)
+        
         # 3. Adjust margins for shadow - shadows render OUTSIDE the content area
         # Top margin is 0 to allow title bar to sit at the edge
         if self._mode == "polished" and widget.layout():
@@ -136,8 +234,14 @@ class WipeWindow(QObject):
         if obj == self._target and event.type() == QEvent.Type.Paint:
             self._paint_logic(obj)
             return False # Let children paint on top
+        if obj == self._target and event.type() == QEvent.Type.ThemeChange:
+            accent_cache.refresh()
         return super().eventFilter(obj, event)
 
+    def _on_accent_changed(self, color):
+        if self._bg_source == "auto" and self._target is not None:
+            self._target.update()
+
     def _paint_logic(self, widget):
         painter = QPainter(widget)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
@@ -167,14 +271,10 @@ class WipeWindow(QObject):
         # Polished Mode: Paint background to FULL widget size, shadows outside
         full_rect = widget.rect()
         
-        # Draw shadows AROUND the full rect (they extend into the transparent area)
-        shadow_offset = self._shadow_blur // 2
-        for i in range(shadow_offset):
-            opacity = int((140 / shadow_offset) * (shadow_offset - i) * 0.3)
-            painter.setPen(QPen(QColor(0, 0, 0, opacity), 1))
-            painter.setBrush(Qt.BrushStyle.NoBrush)
-            shadow_rect = full_rect.adjusted(-i, -i, i, i)
-            painter.drawRoundedRect(shadow_rect, self._radius + i, self._radius + i)
+        # Draw shadows AROUND the full rect (they extend into the transparent area),
+        # blitted from the cached nine-slice pixmap instead of stroking every ring
+        draw_shadow(painter, full_rect, self._radius, self._shadow_blur,
+                    self._shadow_color, widget.devicePixelRatioF())
 
         # Solid Background fills the ENTIRE widget rect
         bg_color = get_accent_color() if self._bg_source == "auto" else self._bg_source